@@ -1,21 +1,28 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.db.async_session import get_async_db
+from app.db import replicas
 from app.db.database import get_db
 from app.models.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+
+def _token_subject(token: str) -> str:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
@@ -23,15 +30,74 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    return username
 
+
+def _user_lookup(username: str):
     # Fetch the user via ORM (by email or first_name) - 3NF normalized
-    user = (
-        db.query(User)
-        .filter((User.email == username) | (User.first_name == username))
-        .first()
-    )
+    return (User.email == username) | (User.first_name == username)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    username = _token_subject(token)
+    # A write committed on this session pins the user's reads to the primary (app.db.replicas)
+    db.info[replicas.SUBJECT_KEY] = username
+    user = db.query(User).filter(_user_lookup(username)).first()
+
+    if not user:
+        raise credentials_exception
+
+    return user
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """get_current_user for routes on get_async_db, so the request holds a single async connection."""
+    username = _token_subject(token)
+    db.info[replicas.SUBJECT_KEY] = username
+    user = (await db.execute(select(User).where(_user_lookup(username)).limit(1))).scalars().first()
 
     if not user:
         raise credentials_exception
 
     return user
+
+
+def _request_subject(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return _token_subject(token)
+    except HTTPException:
+        return None
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Session for read-only routes: a healthy replica, or the primary session when
+    no replica is configured/healthy or the caller wrote within READ_YOUR_WRITES_SECONDS.
+    """
+    replica = None
+    # Token subject is only decoded when there is a replica to route to
+    if replicas.replica_set and not replicas.primary_pins.is_pinned(_request_subject(request)):
+        replica = replicas.replica_set.choose()
+    if replica is None:
+        yield db
+        return
+    replica_db = replicas.ReplicaSessionLocal(bind=replica.engine)
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+async def get_async_read_db(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """get_read_db for routes on AsyncSession."""
+    replica = None
+    if replicas.replica_set and not replicas.primary_pins.is_pinned(_request_subject(request)):
+        replica = await replicas.replica_set.choose_async()
+    if replica is None:
+        yield db
+        return
+    async with replicas.AsyncReplicaSessionLocal(bind=replicas.replica_set.async_engine(replica)) as replica_db:
+        yield replica_db
@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import os
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import List
-from app.db.database import get_db
+from app.db.async_session import async_pool_status
+from app.db.database import get_db, pool_status
 from app.models import models
 from app.schemas.auth import UserResponse, VendorApplicationResponse
 from app.api.deps import get_current_user
 from app.models.models import UserRole, UserStatus
+from app.core.booking_registry import booking_registry
+from app.core.config import settings
+from app.core.profiler import profiler
+from app.core.query_stats import query_stats
 
 router = APIRouter()
 
@@ -132,6 +141,8 @@ def delete_user(
     if user.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own admin account")
 
+    deleted_store_id = None
+
     # Handle Vendor-specific logic
     if user.role == UserRole.VENDOR:
         vendor_profile = db.query(models.Vendor).filter(models.Vendor.user_id == user.id).first()
@@ -187,6 +198,7 @@ def delete_user(
             
             # 7. Delete Store
             db.query(models.Store).filter(models.Store.store_id == store_id).delete()
+            deleted_store_id = store_id
         elif vendor_profile:
             # Vendor has profile but no store
             db.delete(vendor_profile)
@@ -198,6 +210,9 @@ def delete_user(
     db.delete(user)
 
     db.commit()
+    if deleted_store_id:
+        # Services and providers were removed with bulk deletes, which emit no session events
+        booking_registry.invalidate(deleted_store_id)
     return {"message": "User, Shop, and all related data deleted permanently"}
 
 @router.get("/system-logs/stats")
@@ -227,3 +242,45 @@ def get_system_log_stats(
         "failure_count": failure_count,
         "total_logs": len(logs)
     }
+
+@router.get("/db-pool")
+def get_db_pool_status(current_user: models.User = Depends(check_admin)):
+    """Connection pool occupancy, saturation and checkout wait times for this worker."""
+    return {**pool_status(), "async_pool": async_pool_status()}
+
+@router.get("/query-stats")
+def get_query_stats(current_user: models.User = Depends(check_admin)):
+    """Statements and database time per route for this worker, busiest first."""
+    return query_stats.snapshot()
+
+@router.delete("/query-stats", status_code=status.HTTP_204_NO_CONTENT)
+def reset_query_stats(current_user: models.User = Depends(check_admin)):
+    query_stats.reset()
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_profiler(
+    request: Request,
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    current_user: models.User = Depends(check_admin)
+):
+    """Sample this worker for `seconds`; stacks per route in collapsed (flamegraph) format."""
+    profile = profiler.begin(request.app.routes)
+    if profile is None:
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.end(profile)
+    file_name = f"profile-{os.getpid()}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"', "X-Profile-Samples": str(profile.samples)},
+    )
+
+@router.get("/profile/requests/{profile_id}", response_class=PlainTextResponse)
+def get_request_profile(profile_id: str, current_user: models.User = Depends(check_admin)):
+    """Stacks of a request sent with the X-Profile header (the last 20 are kept)."""
+    stacks = profiler.request_profiles.get(profile_id)
+    if stacks is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return stacks
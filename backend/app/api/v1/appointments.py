@@ -1,63 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.schemas.schemas import Appointment, AppointmentCreate
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from zoneinfo import ZoneInfo
+from typing import List, Optional
+from app.schemas.schemas import Appointment, AppointmentCreate, AppointmentPage, CalendarDay, ProviderAvailability, ProviderScheduleOut, ProviderScheduleUpdate
 from pydantic import BaseModel
 from app.models import models
 from app.db.database import get_db
 from app.api.deps import get_current_user
 from app.models.models import User
-from datetime import datetime, timedelta, timezone
+from app.core.booking_registry import booking_registry
+from app.core.availability import is_provider_free, is_within_working_hours, lock_provider, service_duration, store_availability, to_utc_naive
+from app.core.schedules import local_day_start, replace_schedule
+from app.core.config import settings
+from datetime import date, datetime, timedelta, timezone
 
 router = APIRouter()
 
 @router.post("/", response_model=Appointment)
 def create_appointment(appointment: AppointmentCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Check for existing appointment with the same barber at the same time
-    # Update for Normalized Schema: Join Provider and TimeSlot
-    existing_appointment = db.query(models.Appointment).join(models.Appointment.provider).join(models.Appointment.time_slot).filter(
-        models.Appointment.store_id == appointment.store_id,
-        models.ServiceProvider.name == appointment.barber_name,
-        models.TimeSlot.start_time == appointment.booking_date,
-        models.Appointment.status != "Cancelled"
-    ).first()
-
-    if existing_appointment:
-        raise HTTPException(status_code=400, detail="This time slot is already booked for this barber.")
+    if appointment.booking_date is None:
+        raise HTTPException(status_code=400, detail="booking_date is required")
+    start_time = to_utc_naive(appointment.booking_date)
 
     # --- NORMALIZATION LOGIC ---
+    # Providers and services are resolved from the store's cached registry, by id or by name
+    registry = booking_registry.for_store(db, appointment.store_id)
+
     # 1. Find or Create Service Provider
-    provider = db.query(models.ServiceProvider).filter(
-        models.ServiceProvider.name == appointment.barber_name,
-        models.ServiceProvider.store_id == appointment.store_id
-    ).first()
-    
-    if not provider:
+    provider_entry = registry.provider(appointment.provider_id, appointment.barber_name)
+    if provider_entry:
+        provider_id = provider_entry.provider_id
+    elif appointment.provider_id is not None:
+        raise HTTPException(status_code=400, detail=f"Service provider {appointment.provider_id} not found")
+    else:
         provider = models.ServiceProvider(
-            name=appointment.barber_name,
+            name=appointment.barber_name.strip(),
             store_id=appointment.store_id
         )
         db.add(provider)
         db.flush()
+        provider_id = provider.provider_id
 
     # 2. Find Service
-    service = db.query(models.Service).filter(
-        models.Service.service_name == appointment.service_name,
-        models.Service.store_id == appointment.store_id
-    ).first()
-    
+    service = registry.service(appointment.service_id, appointment.service_name)
+    if not service and appointment.service_id is None:
+        # Name-only bookings keep the legacy fallback to a same-named service in any store
+        service = db.query(models.Service)\
+            .filter(models.Service.service_name == appointment.service_name.strip())\
+            .first()
     if not service:
-        # Fallback search by name only
-        service = db.query(models.Service).filter(models.Service.service_name == appointment.service_name).first()
-        
-    if not service:
-        raise HTTPException(status_code=400, detail=f"Service '{appointment.service_name}' not found")
+        raise HTTPException(status_code=400, detail=f"Service '{appointment.service_id or appointment.service_name}' not found")
 
-    # 3. Create TimeSlot
-    # For now, we create a new slot for every confirmed booking. 
-    # In a real scheduling system, we might pick from available slots.
-    end_time = appointment.booking_date + timedelta(hours=1) # Default 1 hr duration
+    # 3. Reject any overlap with the provider's bookings (not just an identical start time).
+    # The provider row stays locked until commit, so two requests cannot both pass the check.
+    end_time = start_time + service_duration(service)
+    provider = lock_provider(db, provider_id)
+    if provider is None:
+        # The cached registry still listed a provider that has since been deleted
+        booking_registry.invalidate(appointment.store_id)
+        raise HTTPException(status_code=404, detail=f"Service provider {provider_id} not found")
+    if not is_within_working_hours(db, provider, start_time, end_time):
+        raise HTTPException(status_code=400, detail="The barber is not working at this time.")
+    if not is_provider_free(db, provider.provider_id, start_time, end_time):
+        raise HTTPException(status_code=400, detail="This time slot is already booked for this barber.")
+
+    # 4. Create TimeSlot
     new_slot = models.TimeSlot(
-        start_time=appointment.booking_date,
+        start_time=start_time,
         end_time=end_time,
         service_id=service.service_id
     )
@@ -84,7 +94,7 @@ def create_appointment(appointment: AppointmentCreate, current_user: User = Depe
         notif = models.Notification(
             user_id=vendor.user_id,
             title="New Appointment Booked",
-            message=f"New appointment with {appointment.barber_name} for {appointment.service_name} on {appointment.booking_date.strftime('%Y-%m-%d %H:%M')}.",
+            message=f"New appointment with {provider.name} for {service.service_name} on {appointment.booking_date.strftime('%Y-%m-%d %H:%M')}.",
             type="appointment",
             related_id=db_appointment.appointment_id,
         )
@@ -93,6 +103,93 @@ def create_appointment(appointment: AppointmentCreate, current_user: User = Depe
 
     return db_appointment
 
+@router.get("/availability", response_model=List[ProviderAvailability])
+def get_availability(
+    store_id: int,
+    date_from: date,
+    date_to: Optional[date] = Query(None, description="Inclusive; defaults to date_from"),
+    service_id: Optional[int] = None,
+    service_name: Optional[str] = None,
+    provider_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Free start times per provider of a store, sized to the service's duration.
+    """
+    date_to = date_to or date_from
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (date_to - date_from).days >= settings.APPOINTMENT_MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Availability can be requested for at most {settings.APPOINTMENT_MAX_AVAILABILITY_DAYS} days")
+
+    service = None
+    if service_id is not None or service_name:
+        service = booking_registry.for_store(db, store_id).service(service_id, service_name)
+        if not service:
+            raise HTTPException(status_code=404, detail="Service not found")
+
+    availability = store_availability(db, store_id, service_duration(service), date_from, date_to, provider_id)
+    return [
+        {
+            "provider_id": entry.provider_id,
+            "provider_name": entry.provider_name,
+            "slots": [
+                {"start": start.replace(tzinfo=timezone.utc), "end": end.replace(tzinfo=timezone.utc)}
+                for start, end in entry.slots
+            ],
+        }
+        for entry in availability
+    ]
+
+def _get_managed_provider(db: Session, provider_id: int, current_user: User) -> models.ServiceProvider:
+    provider = db.query(models.ServiceProvider).filter(models.ServiceProvider.provider_id == provider_id).first()
+    if not provider:
+        raise HTTPException(status_code=404, detail="Service provider not found")
+    if current_user.role != "admin":
+        vendor = db.query(models.Vendor).filter(models.Vendor.user_id == current_user.id).first()
+        if not vendor or vendor.store_id != provider.store_id:
+            raise HTTPException(status_code=403, detail="Not authorized to manage this provider")
+    return provider
+
+def _schedule_response(db: Session, provider: models.ServiceProvider):
+    weekly = db.query(models.ProviderSchedule)\
+        .filter(models.ProviderSchedule.provider_id == provider.provider_id)\
+        .order_by(models.ProviderSchedule.weekday, models.ProviderSchedule.start_time)\
+        .all()
+    exceptions = db.query(models.ProviderScheduleException)\
+        .filter(models.ProviderScheduleException.provider_id == provider.provider_id)\
+        .order_by(models.ProviderScheduleException.date)\
+        .all()
+    return {
+        "provider_id": provider.provider_id,
+        "weekly": weekly,
+        "exceptions": exceptions,
+        "slots_generated_until": provider.slots_generated_until,
+    }
+
+@router.get("/providers/{provider_id}/schedule", response_model=ProviderScheduleOut)
+def get_provider_schedule(provider_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    provider = _get_managed_provider(db, provider_id, current_user)
+    return _schedule_response(db, provider)
+
+@router.put("/providers/{provider_id}/schedule", response_model=ProviderScheduleOut)
+def update_provider_schedule(
+    provider_id: int,
+    schedule: ProviderScheduleUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Replace a provider's weekly hours and exceptions, and regenerate its working
+    slots from today through the horizon. Existing bookings are kept.
+    """
+    provider = _get_managed_provider(db, provider_id, current_user)
+    if len({e.date for e in schedule.exceptions}) != len(schedule.exceptions):
+        raise HTTPException(status_code=400, detail="Only one exception per date is allowed")
+    replace_schedule(db, provider, schedule.weekly, schedule.exceptions, schedule.horizon_days)
+    db.commit()
+    return _schedule_response(db, provider)
+
 class AppointmentStatusUpdate(BaseModel):
     status: str
 
@@ -158,10 +255,131 @@ def cancel_appointment(appointment_id: int, current_user: User = Depends(get_cur
     db.refresh(appointment)
     return appointment
 
-@router.get("/my-appointments", response_model=list[Appointment])
-def get_my_appointments(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return db.query(models.Appointment).filter(models.Appointment.customer_id == current_user.id).all()
+# Legacy rows predate TIME_SLOT and only have BOOKING_DATE
+booking_start = func.coalesce(models.TimeSlot.start_time, models.Appointment.legacy_booking_date)
+
+def _appointments_query(db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """
+    Appointments with their slot, service and provider loaded in the same query
+    (booking_date / barber_name / service_name would otherwise lazy-load per row),
+    optionally limited to local calendar days [date_from, date_to].
+    """
+    query = db.query(models.Appointment)\
+        .outerjoin(models.Appointment.time_slot)\
+        .options(
+            contains_eager(models.Appointment.time_slot).joinedload(models.TimeSlot.service),
+            joinedload(models.Appointment.provider),
+        )
+    if date_from is not None:
+        query = query.filter(booking_start >= local_day_start(date_from))
+    if date_to is not None:
+        query = query.filter(booking_start < local_day_start(date_to + timedelta(days=1)))
+    return query.order_by(booking_start, models.Appointment.appointment_id)
+
+def _appointment_page(query, limit: int, offset: int) -> dict:
+    """
+    One page of a listing, upcoming appointments first (soonest first) followed by
+    past ones (most recent first), with the total so callers can page through the rest.
+    """
+    now = to_utc_naive(datetime.now(timezone.utc))
+    upcoming = booking_start >= now
+    items = query.order_by(None).order_by(
+        case((upcoming, 0), else_=1),
+        case((upcoming, booking_start)),
+        booking_start.desc(),
+        models.Appointment.appointment_id,
+    ).offset(offset).limit(limit).all()
+    # A short page is the last one, so the count query is only needed for full pages
+    if len(items) < limit and (items or offset == 0):
+        total = offset + len(items)
+    else:
+        total = query.order_by(None).count()
+    has_more = offset + len(items) < total
+    return {
+        "items": items,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "has_more": has_more,
+        "next_offset": offset + len(items) if has_more else None,
+    }
+
+def _calendar(appointments) -> list:
+    zone = ZoneInfo(settings.APPOINTMENT_TIMEZONE)
+    days = {}
+    for appointment in appointments:
+        start = appointment.booking_date.replace(tzinfo=timezone.utc) if appointment.booking_date.tzinfo is None else appointment.booking_date
+        end = appointment.time_slot.end_time if appointment.time_slot else None
+        days.setdefault(start.astimezone(zone).date(), []).append({
+            "appointment_id": appointment.appointment_id,
+            "start": start,
+            "end": end.replace(tzinfo=timezone.utc) if end is not None and end.tzinfo is None else end,
+            "barber_name": appointment.barber_name,
+            "service_name": appointment.service_name,
+            "customer_name": appointment.customer_name,
+            "status": appointment.status,
+        })
+    return [{"date": day, "appointments": items} for day, items in days.items()]
+
+def _check_calendar_range(date_from: date, date_to: date):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (date_to - date_from).days >= settings.APPOINTMENT_MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"A calendar can cover at most {settings.APPOINTMENT_MAX_CALENDAR_DAYS} days")
+
+@router.get("/my-appointments", response_model=AppointmentPage)
+def get_my_appointments(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    query = _appointments_query(db, date_from, date_to)\
+        .filter(models.Appointment.customer_id == current_user.id)
+    return _appointment_page(query, limit, offset)
+
+@router.get("/my-appointments/calendar", response_model=List[CalendarDay])
+def get_my_calendar(
+    date_from: date,
+    date_to: date,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    _check_calendar_range(date_from, date_to)
+    appointments = _appointments_query(db, date_from, date_to)\
+        .filter(models.Appointment.customer_id == current_user.id)\
+        .all()
+    return _calendar(appointments)
 
-@router.get("/store/{store_id}", response_model=list[Appointment])
-def get_store_appointments(store_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return db.query(models.Appointment).filter(models.Appointment.store_id == store_id).all()
+@router.get("/store/{store_id}", response_model=AppointmentPage)
+def get_store_appointments(
+    store_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    query = _appointments_query(db, date_from, date_to)\
+        .filter(models.Appointment.store_id == store_id)
+    return _appointment_page(query, limit, offset)
+
+@router.get("/store/{store_id}/calendar", response_model=List[CalendarDay])
+def get_store_calendar(
+    store_id: int,
+    date_from: date,
+    date_to: date,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Appointments between two dates grouped by day (in APPOINTMENT_TIMEZONE), for calendar views.
+    """
+    _check_calendar_range(date_from, date_to)
+    appointments = _appointments_query(db, date_from, date_to)\
+        .filter(models.Appointment.store_id == store_id)\
+        .all()
+    return _calendar(appointments)
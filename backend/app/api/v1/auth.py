@@ -5,12 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile,
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import text
 from sqlalchemy.orm import Session
-import shutil
-import uuid
-from pathlib import Path
 
 from app.schemas.auth import Token, UserCreate, UserResponse, VendorRegister
-from app.core.config import settings
+from app.core.uploads import save_upload_sync
 from app.core.security import create_access_token, verify_password, get_password_hash
 from app.db.database import get_db
 from app.models import models
@@ -18,9 +15,6 @@ from app.models.models import User, UserRole, UserStatus, VendorApplication, Sto
 
 router = APIRouter()
 
-UPLOAD_DIR = Path(settings.effective_upload_dir)
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
 
 @router.post("/register", response_model=UserResponse)
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
@@ -75,16 +69,10 @@ def register_vendor(
     image_url = None
     if banner_image:
         try:
-            # Generate unique filename
-            file_extension = banner_image.filename.split(".")[-1] if "." in banner_image.filename else "jpg"
-            file_name = f"{uuid.uuid4()}.{file_extension}"
-            file_path = UPLOAD_DIR / file_name
-            
-            with file_path.open("wb") as buffer:
-                shutil.copyfileobj(banner_image.file, buffer)
-            
             # Store relative path or URL
-            image_url = f"/uploads/{file_name}"
+            image_url = save_upload_sync(banner_image, default_extension="jpg").url
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Failed to upload banner image: {e}")
             # Continue without image (will use default)
@@ -1,23 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Set, Tuple
+import asyncio
 import json
+import threading
 from datetime import datetime
 from jose import JWTError, jwt
-import shutil
-from pathlib import Path
-import uuid
 
-from app.db.database import get_db
+from app.db.async_session import get_async_db
+from app.db.database import SessionLocal, get_db
+from app.db.message_index import search_messages
 from app.models import models
 from app.schemas import schemas
 from app.schemas import auth as auth_schemas
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_async
 from app.core.config import settings
+from app.core.notification_retention import message_notification_text
+from app.core.realtime import manager
+from app.core.uploads import save_upload
 
 router = APIRouter()
-UPLOAD_DIR = Path(settings.effective_upload_dir) / "chat"
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # --- WebSocket Manager ---
 @router.post("/upload", response_model=Dict[str, str])
@@ -25,46 +30,157 @@ async def upload_attachment(
     file: UploadFile = File(...),
     current_user: models.User = Depends(get_current_user)
 ):
-    file_extension = file.filename.split(".")[-1]
-    file_name = f"{uuid.uuid4()}.{file_extension}"
-    file_path = UPLOAD_DIR / file_name
-    
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
+    stored = await save_upload(file)
+
     # Return the relative URL that the frontend can use
     # Assuming the static mount in main.py points to uploads/
-    return {"url": f"/uploads/chat/{file_name}", "filename": file.filename}
-
-class ConnectionManager:
-    def __init__(self):
-        # Map user_id to a list of active websockets (support multiple devices/tabs)
-        self.active_connections: Dict[int, List[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, user_id: int):
-        await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, user_id: int):
-        if user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
-
-    async def send_personal_message(self, message: dict, user_id: int):
-        if user_id in self.active_connections:
-            # Iterate over a copy of the list to handle disconnections safely during iteration
-            for connection in self.active_connections[user_id][:]:
-                try:
-                    await connection.send_text(json.dumps(message))
-                except RuntimeError:
-                    # Connection might be closed already
-                    pass
-
-manager = ConnectionManager()
+    return {"url": stored.url, "filename": file.filename}
+
+
+def upsert_message_notification(db: Session, receiver_id: int, sender: models.User) -> models.Notification:
+    """
+    Record a chat message in the receiver's single unread notification for this sender.
+
+    Consecutive messages bump `occurrences` and the timestamp of one row instead
+    of inserting a row each. The caller commits, so the notification lands in
+    the same transaction as the message. Once the receiver has read it, the next
+    message starts a new row.
+    """
+    notification = db.query(models.Notification)\
+        .filter(
+            models.Notification.user_id == receiver_id,
+            models.Notification.type == "message",
+            models.Notification.related_id == sender.id,
+            models.Notification.is_read == False,
+        )\
+        .order_by(models.Notification.id.desc())\
+        .with_for_update()\
+        .first()
+
+    sender_name = sender.full_name or sender.email
+    if notification is None:
+        notification = models.Notification(
+            user_id=receiver_id,
+            title="New Message",
+            message=message_notification_text(sender_name, 1),
+            type="message",
+            related_id=sender.id,
+            is_read=False,
+            occurrences=1,
+            created_at=datetime.now()
+        )
+        db.add(notification)
+    else:
+        notification.occurrences += 1
+        notification.message = message_notification_text(sender_name, notification.occurrences)
+        notification.created_at = datetime.now()
+    return notification
+
+
+class ReadReceiptBatcher:
+    """
+    Coalesces read receipts per (reader, sender) pair over a short window.
+
+    The first call in a window starts a flush task that waits for the window to
+    close, then applies every pending high-water mark in a single UPDATE and
+    pushes one frame per pair. Every caller in the window awaits that flush, so
+    it returns after the commit or sees its error. The task is not tied to any
+    request: a caller that disconnects does not cancel the batch. Database work
+    runs in the threadpool on sessions of its own, never a request's session.
+    """
+    def __init__(self, window_seconds: float, session_factory: Callable[[], Session] = SessionLocal):
+        self.window_seconds = window_seconds
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        # (reader_id, sender_id) -> highest message id read, and the flush every submitter awaits
+        self._pending: Dict[Tuple[int, int], int] = {}
+        self._flushed: Optional[asyncio.Future] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def latest_message_id(self, reader_id: int, sender_id: int) -> Optional[int]:
+        with self.session_factory() as db:
+            return db.query(func.max(models.Message.id)).filter(
+                models.Message.receiver_id == reader_id,
+                models.Message.sender_id == sender_id
+            ).scalar()
+
+    async def submit(self, reader_id: int, sender_id: int, up_to_id: Optional[int] = None) -> bool:
+        """Queue a receipt and wait until it is committed. Returns True if this call started the flush."""
+        if up_to_id is None:
+            # Pin "everything" now, so messages arriving before the flush stay unread
+            up_to_id = await run_in_threadpool(self.latest_message_id, reader_id, sender_id)
+            if up_to_id is None:
+                return False
+
+        key = (reader_id, sender_id)
+        with self._lock:
+            self._pending[key] = max(self._pending.get(key, up_to_id), up_to_id)
+            flushed = self._flushed
+            started = flushed is None
+            if started:
+                flushed = self._flushed = asyncio.get_running_loop().create_future()
+
+        if started:
+            task = asyncio.create_task(self._flush_after_window(flushed))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        # Shielded: cancelling this request must not cancel the flush other callers wait on
+        await asyncio.shield(flushed)
+        return started
+
+    async def _flush_after_window(self, flushed: asyncio.Future):
+        try:
+            await asyncio.sleep(self.window_seconds)
+        finally:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._flushed = None
+
+        try:
+            await run_in_threadpool(self._apply_batch, batch)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                flushed.cancel()
+            else:
+                flushed.set_exception(exc)
+                flushed.exception()  # Retrieved here too, in case every caller has gone away
+            raise
+        flushed.set_result(None)
+
+        timestamp = datetime.now().isoformat()
+        for (reader, sender), mark in batch.items():
+            await manager.send_personal_message({
+                "type": "read_receipt",
+                "reader_id": reader,
+                "up_to_id": mark,
+                "timestamp": timestamp
+            }, sender)
+
+    def _apply_batch(self, batch: Dict[Tuple[int, int], int]):
+        with self.session_factory() as db:
+            self.apply(db, batch)
+
+    @staticmethod
+    def apply(db: Session, batch: Dict[Tuple[int, int], int]):
+        """Mark every pair in the batch as read up to its mark with one UPDATE."""
+        if not batch:
+            return
+
+        db.query(models.Message).filter(
+            models.Message.is_read == False,
+            or_(*[
+                and_(
+                    models.Message.receiver_id == reader,
+                    models.Message.sender_id == sender,
+                    models.Message.id <= mark
+                )
+                for (reader, sender), mark in batch.items()
+            ])
+        ).update({"is_read": True}, synchronize_session=False)
+        db.commit()
+
+read_receipts = ReadReceiptBatcher(settings.READ_RECEIPT_WINDOW_MS / 1000)
 
 # --- Endpoints ---
 
@@ -95,8 +211,14 @@ async def websocket_endpoint(
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
+    # The socket stays open for minutes, so release the auth query's pooled
+    # connection now; each frame below checks one out only while it is handled
+    user_id = user.id
+    bind = db.get_bind()
+    db.close()
+
     # Connection Accepted
-    await manager.connect(websocket, user.id)
+    await manager.connect(websocket, user_id)
     
     try:
         while True:
@@ -112,67 +234,57 @@ async def websocket_endpoint(
                 reply_to_id = message_data.get("reply_to_id")
 
                 if receiver_id and (content or attachment_url):
-                    # 1. Save to Database
-                    new_message = models.Message(
-                        sender_id=user.id,
-                        receiver_id=receiver_id,
-                        content=content,
-                        attachment_url=attachment_url,
-                        message_type=message_type,
-                        reply_to_id=reply_to_id,
-                        # timestamp is auto-set by DB default, but good to set explicit for immediate return
-                        timestamp=datetime.now()
-                    )
-                    db.add(new_message)
-                    db.commit()
-                    db.refresh(new_message)
-                    
-                     # 1.5 Create Notification for Receiver
-                    try:
-                        notification = models.Notification(
-                            user_id=receiver_id,
-                            title="New Message",
-                            message=f"You received a message from {user.full_name or user.email}",
-                            type="message",
-                            related_id=user.id,
-                            is_read=False,
-                            created_at=datetime.now()
+                    # A short-lived session per frame, closed before the sends are awaited
+                    with Session(bind=bind, autoflush=False) as frame_db:
+                        sender = frame_db.get(models.User, user_id)
+
+                        # 1. Save to Database
+                        new_message = models.Message(
+                            sender_id=user_id,
+                            receiver_id=receiver_id,
+                            content=content,
+                            attachment_url=attachment_url,
+                            message_type=message_type,
+                            reply_to_id=reply_to_id,
+                            # timestamp is auto-set by DB default, but good to set explicit for immediate return
+                            timestamp=datetime.now()
                         )
-                        db.add(notification)
-                        db.commit()
-                    except Exception as notif_error:
-                        print(f"Failed to create notification: {notif_error}")
-                        # Don't fail the message send if notification fails
-
-                    # 2. Prepare Payload
-                    response_payload = {
-                        "attachment_url": attachment_url,
-                        "message_type": message_type,
-                        "reply_to_id": reply_to_id,
-                        "id": new_message.id,
-                        "sender_id": user.id,
-                        "receiver_id": receiver_id,
-                        "content": content,
-                        "timestamp": new_message.timestamp.isoformat(),
-                        "is_read": False
-                    }
+                        frame_db.add(new_message)
+                        
+                        # 1.5 Bump the receiver's notification for this conversation (same transaction)
+                        upsert_message_notification(frame_db, int(receiver_id), sender)
+                        frame_db.commit()
+                        frame_db.refresh(new_message)
+
+                        # 2. Prepare Payload
+                        response_payload = {
+                            "attachment_url": attachment_url,
+                            "message_type": message_type,
+                            "reply_to_id": reply_to_id,
+                            "id": new_message.id,
+                            "sender_id": user_id,
+                            "receiver_id": receiver_id,
+                            "content": content,
+                            "timestamp": new_message.timestamp.isoformat(),
+                            "is_read": False
+                        }
                     
                     # 3. Send to Receiver (if online)
                     await manager.send_personal_message(response_payload, int(receiver_id))
                     
                     # 4. Echo back to Sender (so they see their own message confirmed/synced)
-                    await manager.send_personal_message(response_payload, user.id)
+                    await manager.send_personal_message(response_payload, user_id)
                     
             except json.JSONDecodeError:
                 pass
             except Exception as e:
+                # The frame's session has already been rolled back and closed
                 print(f"Error processing message: {e}")
-                db.rollback()
                 
     except WebSocketDisconnect:
-        manager.disconnect(websocket, user.id)
+        manager.disconnect(websocket, user_id)
     except Exception as e:
-        manager.disconnect(websocket, user.id)
+        manager.disconnect(websocket, user_id)
 
 @router.get("/conversations", response_model=List[auth_schemas.UserResponse])
 def get_conversations(
@@ -195,7 +307,34 @@ def get_conversations(
     
     return partner_ids
 
-@router.get("/{user_id}", response_model=List[schemas.Message])
+@router.get("/search", response_model=schemas.MessageSearchPage)
+def search_chat_messages(
+    q: str = Query(..., min_length=1),
+    partner_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Full-text search over the current user's conversations, optionally scoped to one partner and a date range.
+    """
+    # Fetch one extra row to know whether another page exists
+    hits = search_messages(db, current_user.id, q, partner_id, since, until, limit + 1, offset)
+    items = [
+        schemas.MessageSearchHit.model_validate(message).model_copy(update={"snippet": snippet})
+        for message, snippet in hits[:limit]
+    ]
+    return {"items": items, "limit": limit, "offset": offset, "has_more": len(hits) > limit}
+
+def _chat_history_query(user_id: int, other_id: int):
+    return select(models.Message).where(
+        ((models.Message.sender_id == user_id) & (models.Message.receiver_id == other_id)) |
+        ((models.Message.sender_id == other_id) & (models.Message.receiver_id == user_id))
+    ).order_by(models.Message.timestamp.asc())
+
 def get_chat_history(
     user_id: int,
     db: Session = Depends(get_db),
@@ -204,35 +343,31 @@ def get_chat_history(
     """
     Get chat history between current user and specific user_id
     """
-    messages = db.query(models.Message).filter(
-        ((models.Message.sender_id == current_user.id) & (models.Message.receiver_id == user_id)) |
-        ((models.Message.sender_id == user_id) & (models.Message.receiver_id == current_user.id))
-    ).order_by(models.Message.timestamp.asc()).all()
-    
-    return messages
+    return db.execute(_chat_history_query(current_user.id, user_id)).scalars().all()
+
+async def get_chat_history_async(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    """
+    Get chat history between current user and specific user_id
+    """
+    return (await db.execute(_chat_history_query(current_user.id, user_id))).scalars().all()
+
+router.add_api_route(
+    "/{user_id}", get_chat_history_async if settings.ASYNC_READ_ROUTES else get_chat_history,
+    methods=["GET"], response_model=List[schemas.Message],
+)
 
 @router.put("/read/{sender_id}")
 async def mark_messages_read(
     sender_id: int,
-    db: Session = Depends(get_db),
+    up_to_id: Optional[int] = Query(None, description="Highest message id the reader has seen"),
     current_user: models.User = Depends(get_current_user)
 ):
-    # Mark all messages from sender_id to current_user as read
-    db.query(models.Message).filter(
-        models.Message.sender_id == sender_id,
-        models.Message.receiver_id == current_user.id,
-        models.Message.is_read == False
-    ).update({"is_read": True})
-    db.commit()
-
-    # Notify the sender (sender_id) that current_user has read their messages
-    notification = {
-        "type": "read_receipt",
-        "reader_id": current_user.id,
-        "timestamp": datetime.now().isoformat()
-    }
-    await manager.send_personal_message(notification, sender_id)
-    
+    # Receipts are coalesced per (reader, sender); the sender is notified once per window
+    await read_receipts.submit(current_user.id, sender_id, up_to_id)
     return {"status": "ok"}
 
 @router.post("/", response_model=schemas.Message)
@@ -252,6 +387,7 @@ async def send_message(
         content=message.content
     )
     db.add(new_message)
+    upsert_message_notification(db, message.receiver_id, current_user)
     db.commit()
     db.refresh(new_message)
 
@@ -0,0 +1,90 @@
+import secrets
+from typing import Optional
+
+from anyio import to_thread
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from app.core import metrics
+from app.core.booking_registry import booking_registry
+from app.core.config import settings
+from app.core.realtime import manager
+from app.db.async_session import async_pool_status
+from app.db.database import pool_status
+from app.db.pool_metrics import WAIT_BUCKETS
+from app.db.replicas import replica_set
+
+router = APIRouter()
+
+# Users holding 1, 2, 3 or more sockets (tabs / devices); a per-user label would grow with the user base
+_SOCKETS_PER_USER = ("1", "2", "3", "4+")
+
+
+def _pool(out: metrics.Exposition, name: str, snapshot: Optional[dict]):
+    if snapshot is None:
+        return  # Async engine not created yet
+    labels = (("pool", name),)
+    out.sample("pbl_db_pool_checked_out", "gauge", "Connections checked out of the pool.", snapshot["checked_out"], labels)
+    out.sample("pbl_db_pool_capacity", "gauge", "pool_size + max_overflow.", snapshot["capacity"], labels)
+    out.sample("pbl_db_pool_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.", snapshot["timeouts"], labels)
+    # wait_buckets are already cumulative; every checkout falls in +Inf
+    out.histogram(
+        "pbl_db_pool_checkout_wait_seconds", "Time spent waiting for a database connection.",
+        WAIT_BUCKETS, [*snapshot["wait_buckets"].values(), snapshot["checkouts"]],
+        snapshot["wait_seconds_total"], labels,
+    )
+
+
+def collect_pools(out: metrics.Exposition):
+    _pool(out, "primary", pool_status())
+    _pool(out, "async", async_pool_status())
+    for i, replica in enumerate(replica_set.replicas):
+        pool = replica.engine.pool
+        _pool(out, f"replica{i}", pool.metrics.snapshot(pool))
+
+
+def collect_threadpool(out: metrics.Exposition):
+    # Sync endpoints (and bcrypt in them) run on these threads; tasks_waiting is the queue in front of them
+    limiter = to_thread.current_default_thread_limiter().statistics()
+    out.sample("pbl_threadpool_size", "gauge", "Worker threads for sync endpoints.", limiter.total_tokens)
+    out.sample("pbl_threadpool_busy", "gauge", "Worker threads in use.", limiter.borrowed_tokens)
+    out.sample("pbl_threadpool_queued", "gauge", "Calls waiting for a worker thread.", limiter.tasks_waiting)
+
+
+def collect_websockets(out: metrics.Exposition):
+    sockets = [len(connections) for connections in list(manager.active_connections.values())]
+    out.sample("pbl_websocket_connections", "gauge", "Open /api/messages/ws sockets.", sum(sockets))
+    out.sample("pbl_websocket_users", "gauge", "Users with at least one open socket.", len(sockets))
+    out.sample("pbl_websocket_max_sockets_per_user", "gauge", "Most sockets held by one user.", max(sockets, default=0))
+    users = dict.fromkeys(_SOCKETS_PER_USER, 0)
+    for count in sockets:
+        users[_SOCKETS_PER_USER[min(count, len(_SOCKETS_PER_USER)) - 1]] += 1
+    for bucket, count in users.items():
+        out.sample(
+            "pbl_websocket_users_by_sockets", "gauge", "Users by number of open sockets.", count, (("sockets", bucket),)
+        )
+
+
+def collect_caches(out: metrics.Exposition):
+    hits, misses = booking_registry.hits, booking_registry.misses
+    labels = (("cache", "booking_registry"),)
+    out.sample("pbl_cache_requests_total", "counter", "Cache lookups by result.", hits, labels + (("result", "hit"),))
+    out.sample("pbl_cache_requests_total", "counter", "Cache lookups by result.", misses, labels + (("result", "miss"),))
+    out.sample(
+        "pbl_cache_hit_ratio", "gauge", "Hits / lookups since the worker started.",
+        round(hits / (hits + misses), 4) if hits + misses else None, labels,
+    )
+
+
+COLLECTORS = (collect_pools, collect_threadpool, collect_websockets, collect_caches)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint for this worker process."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(metrics.render(COLLECTORS), media_type=metrics.CONTENT_TYPE)
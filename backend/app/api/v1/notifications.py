@@ -1,30 +1,128 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
+from datetime import datetime
+from app.core.config import settings
+from app.db.async_session import get_async_db
 from app.db.database import get_db
 from app.models import models
 from app.schemas import schemas
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_async
+from app.core import realtime  # noqa: F401  (registers the notification push listeners)
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Notification])
+def _encode_cursor(notification: models.Notification) -> str:
+    raw = json.dumps([notification.created_at.isoformat(), notification.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, notification_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), int(notification_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _notification_page_query(user_id: int, before: Optional[str], limit: int):
+    """
+    The current user's notifications, newest first, one keyset page at a time.
+
+    Pages seek on (created_at, id) via ix_notification_user_created instead of
+    OFFSET, so deep pages cost the same as the first one. The cursor is an
+    opaque encoding of the last row's (created_at, id), so paging is unaffected
+    when that row is later deleted or bumped.
+    """
+    Notification = models.Notification
+    query = select(Notification).where(Notification.user_id == user_id)
+    if before is not None:
+        created_at, notification_id = _decode_cursor(before)
+        query = query.where(or_(
+            Notification.created_at < created_at,
+            and_(Notification.created_at == created_at, Notification.id < notification_id),
+        ))
+
+    # Fetch one extra row to know whether another page exists
+    return query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
+
+def _notification_page(rows, limit: int) -> dict:
+    items = rows[:limit]
+    next_cursor = _encode_cursor(items[-1]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
 def get_notifications(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 50
+    before: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=100)
 ):
     """
-    Get all notifications for the current user.
+    Get the current user's notifications, newest first, one keyset page at a time.
+    """
+    rows = db.execute(_notification_page_query(current_user.id, before, limit)).scalars().all()
+    return _notification_page(rows, limit)
+
+async def get_notifications_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+    before: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=100)
+):
     """
-    notifications = db.query(models.Notification)\
-        .filter(models.Notification.user_id == current_user.id)\
-        .order_by(models.Notification.created_at.desc())\
-        .offset(skip)\
+    Get the current user's notifications, newest first, one keyset page at a time.
+    """
+    rows = (await db.execute(_notification_page_query(current_user.id, before, limit))).scalars().all()
+    return _notification_page(rows, limit)
+
+router.add_api_route(
+    "/", get_notifications_async if settings.ASYNC_READ_ROUTES else get_notifications,
+    methods=["GET"], response_model=schemas.NotificationPage,
+)
+
+@router.get("/unread-count", response_model=schemas.NotificationUnreadCount)
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Number of unread notifications for the navbar badge (answered from ix_notification_user_unread).
+    """
+    unread = db.query(func.count(models.Notification.id))\
+        .filter(models.Notification.user_id == current_user.id, models.Notification.is_read == False)\
+        .scalar()
+    return {"unread_count": unread}
+
+@router.get("/delta", response_model=List[schemas.Notification])
+def get_notifications_since(
+    since: Optional[datetime] = Query(None, description="updated_at of the last notification the client has seen"),
+    since_id: int = Query(0, ge=0, description="id of that notification"),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Catch-up for the push channel: notifications created or changed after the
+    (since, since_id) cursor, in (updated_at, id) order. Rows updated in place
+    (a bumped chat notification, a read) come back too. Clients call this after
+    (re)connecting to /api/messages/ws and page by the last row's updated_at and id.
+    Without since, only rows with an id above since_id are returned, in id order.
+    """
+    Notification = models.Notification
+    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    if since is None:
+        return query.filter(Notification.id > since_id).order_by(Notification.id).limit(limit).all()
+    return query\
+        .filter(or_(
+            Notification.updated_at > since,
+            and_(Notification.updated_at == since, Notification.id > since_id),
+        ))\
+        .order_by(Notification.updated_at, Notification.id)\
         .limit(limit)\
         .all()
-    return notifications
 
 @router.put("/{notification_id}/read", response_model=schemas.Notification)
 def mark_notification_as_read(
@@ -47,23 +145,17 @@ def mark_notification_as_read(
     db.refresh(notification)
     return notification
 
-@router.put("/read-all", response_model=List[schemas.Notification])
+@router.put("/read-all", response_model=schemas.NotificationsMarkedRead)
 def mark_all_as_read(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
-    Mark all notifications as read for current user.
+    Mark all notifications as read for current user and return how many changed.
     """
-    db.query(models.Notification)\
+    updated = db.query(models.Notification)\
         .filter(models.Notification.user_id == current_user.id, models.Notification.is_read == False)\
-        .update({"is_read": True})
+        .update({"is_read": True}, synchronize_session=False)
     
     db.commit()
-    
-    # Return updated list
-    return db.query(models.Notification)\
-        .filter(models.Notification.user_id == current_user.id)\
-        .order_by(models.Notification.created_at.desc())\
-        .limit(50)\
-        .all()
+    return {"updated": updated}
@@ -1,26 +1,25 @@
 from typing import List
 from fastapi import APIRouter, HTTPException, status, Depends, File, UploadFile
-from sqlalchemy.orm import Session
-import shutil
-import os
-import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from app.schemas.schemas import (
     Product, ProductCreate, ProductUpdate, Category, CategoryCreate, AttributeCreate, VariantItemCreate, ProductImageBase
 )
 from app.core.config import settings
+from app.core.media_store import attach_image_variants, attach_image_variants_async
+from app.core.uploads import save_upload
 from app.db.database import get_db
 from app.models import models
-from app.api.deps import get_current_user # Import get_current_user
+from app.api.deps import get_async_read_db, get_current_user, get_read_db # Import get_current_user
 from app.models.models import User, UserRole # Import User models
 
 router = APIRouter()
-UPLOAD_DIR = settings.effective_upload_dir
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 # --- Category Operations ---
 
 @router.get("/categories", response_model=List[Category])
-def get_categories(store_id: int = None, db: Session = Depends(get_db)):
+def get_categories(store_id: int = None, db: Session = Depends(get_read_db)):
     query = db.query(models.Category)
     if store_id:
         query = query.filter(models.Category.store_id == store_id)
@@ -57,33 +56,60 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
 
 @router.post("/upload")
 async def upload_image(file: UploadFile = File(...)):
-    # Ensure uploads directory exists
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-    file_extension = file.filename.split(".")[-1]
-    file_name = f"{uuid.uuid4()}.{file_extension}"
-    file_path = f"{UPLOAD_DIR}/{file_name}"
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    stored = await save_upload(file, default_extension="jpg")
 
     public_base_url = settings.BACKEND_PUBLIC_URL.rstrip("/")
-    return {"url": f"{public_base_url}/uploads/{file_name}"}
+    return {"url": f"{public_base_url}{stored.url}"}
 
-@router.get("/", response_model=List[Product])
-def get_products(store_id: int = None, db: Session = Depends(get_db)):
+def get_products(store_id: int = None, db: Session = Depends(get_read_db)):
     query = db.query(models.Product).filter(models.Product.status != "deleted")
     if store_id:
         query = query.filter(models.Product.store_id == store_id)
-    return query.order_by(models.Product.product_id.desc()).all()
+    products = query.order_by(models.Product.product_id.desc()).all()
+    attach_image_variants(db, products=products)
+    return products
+
+# Everything the Product response model reads; AsyncSession cannot lazy-load
+PRODUCT_RESPONSE_LOADS = (
+    selectinload(models.Product.category),
+    selectinload(models.Product.store),
+    selectinload(models.Product.images_rel),
+)
+
+async def get_products_async(store_id: int = None, db: AsyncSession = Depends(get_async_read_db)):
+    query = select(models.Product).where(models.Product.status != "deleted")
+    if store_id:
+        query = query.where(models.Product.store_id == store_id)
+    query = query.options(*PRODUCT_RESPONSE_LOADS).order_by(models.Product.product_id.desc())
+    products = (await db.execute(query)).scalars().all()
+    await attach_image_variants_async(db, products=products)
+    return products
+
+router.add_api_route(
+    "/", get_products_async if settings.ASYNC_READ_ROUTES else get_products,
+    methods=["GET"], response_model=List[Product],
+)
 
-@router.get("/{product_id}", response_model=Product)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(product_id: int, db: Session = Depends(get_read_db)):
     product = db.query(models.Product).filter(models.Product.product_id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    attach_image_variants(db, products=[product])
     return product
 
+async def get_product_async(product_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    query = select(models.Product).where(models.Product.product_id == product_id).options(*PRODUCT_RESPONSE_LOADS)
+    product = (await db.execute(query)).scalars().first()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    await attach_image_variants_async(db, products=[product])
+    return product
+
+router.add_api_route(
+    "/{product_id}", get_product_async if settings.ASYNC_READ_ROUTES else get_product,
+    methods=["GET"], response_model=Product,
+)
+
 @router.post("/", response_model=Product)
 def create_product(
     product: ProductCreate, 
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from app.schemas.schemas import Review, ReviewCreate
 from app.models import models
 from app.db.database import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
 from app.models.models import User
 from typing import List, Optional
 
@@ -26,7 +26,7 @@ def create_review(review: ReviewCreate, current_user: User = Depends(get_current
     return db_review
 
 @router.get("/", response_model=List[Review])
-def get_reviews(store_id: Optional[int] = None, barber_name: Optional[str] = None, db: Session = Depends(get_db)):
+def get_reviews(store_id: Optional[int] = None, barber_name: Optional[str] = None, db: Session = Depends(get_read_db)):
     query = db.query(models.Review)
     
     if store_id:
@@ -1,10 +1,10 @@
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from app.db.database import get_db
 from app.models import models
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
 from app.models.models import User, UserRole
 
 router = APIRouter()
@@ -16,6 +16,7 @@ class ServiceCreate(BaseModel):
     image_url: str = None
     store_id: int
     status: str = "active"
+    duration_minutes: int = Field(60, ge=5, le=24 * 60)
 
 class ServiceResponse(ServiceCreate):
     service_id: int
@@ -45,7 +46,8 @@ def create_service(
         service_price=service.service_price,
         image_url=service.image_url,
         store_id=service.store_id,
-        status=service.status
+        status=service.status,
+        duration_minutes=service.duration_minutes
     )
     db.add(db_service)
     db.commit()
@@ -53,7 +55,7 @@ def create_service(
     return db_service
 
 @router.get("/", response_model=List[ServiceResponse])
-def get_services(store_id: int = None, db: Session = Depends(get_db)):
+def get_services(store_id: int = None, db: Session = Depends(get_read_db)):
     # Join with Store to get store details
     # Join with Vendor to ensure the store has a valid vendor owner (filters out orphan seed stores)
     query = db.query(models.Service, models.Store)\
@@ -74,6 +76,7 @@ def get_services(store_id: int = None, db: Session = Depends(get_db)):
             "image_url": service.image_url,
             "store_id": service.store_id,
             "status": service.status,
+            "duration_minutes": service.duration_minutes,
             "store_name": store.store_name,
             "store_type": store.store_type
         }
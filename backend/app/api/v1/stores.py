@@ -1,23 +1,44 @@
 from typing import List
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.schemas.schemas import Store
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.media_store import attach_image_variants, attach_image_variants_async
+from app.api.deps import get_async_read_db, get_read_db
 from app.models import models
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Store])
-def get_stores(db: Session = Depends(get_db)):
-    # Only return stores that have a registered Vendor owner
-    # And filter out specific test/default stores
-    return db.query(models.Store).join(models.Vendor).filter(
-        models.Store.store_name != "Default Store",
-        models.Store.store_name != "Barber Shop",
-        models.Store.store_name != "Tailor Shop"
-    ).distinct().all()
+# Only return stores that have a registered Vendor owner
+# And filter out specific test/default stores
+LISTED_STORE_FILTERS = (
+    models.Store.store_name != "Default Store",
+    models.Store.store_name != "Barber Shop",
+    models.Store.store_name != "Tailor Shop",
+)
+
+def get_stores(db: Session = Depends(get_read_db)):
+    stores = db.query(models.Store).join(models.Vendor).filter(*LISTED_STORE_FILTERS).distinct().all()
+    attach_image_variants(db, stores=stores)
+    return stores
+
+async def get_stores_async(db: AsyncSession = Depends(get_async_read_db)):
+    query = select(models.Store).join(models.Vendor).where(*LISTED_STORE_FILTERS).distinct()
+    stores = (await db.execute(query)).scalars().all()
+    await attach_image_variants_async(db, stores=stores)
+    return stores
+
+router.add_api_route(
+    "/", get_stores_async if settings.ASYNC_READ_ROUTES else get_stores,
+    methods=["GET"], response_model=List[Store],
+)
 
 @router.get("/{store_id}", response_model=Store)
-def get_store(store_id: int, db: Session = Depends(get_db)):
-    return db.query(models.Store).filter(models.Store.store_id == store_id).first()
+def get_store(store_id: int, db: Session = Depends(get_read_db)):
+    store = db.query(models.Store).filter(models.Store.store_id == store_id).first()
+    if store:
+        attach_image_variants(db, stores=[store])
+    return store
@@ -1,9 +1,6 @@
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
-import shutil
-import uuid
-from pathlib import Path
 from typing import Optional
 
 from app.schemas.schemas import (
@@ -12,14 +9,12 @@ from app.schemas.schemas import (
 from app.schemas.auth import UserResponse
 from app.db.database import get_db
 from app.models import models
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_read_db
 from app.models.models import User, UserRole
 from sqlalchemy import text
-from app.core.config import settings
+from app.core.uploads import save_upload_sync
 
 router = APIRouter()
-UPLOAD_DIR = Path(settings.effective_upload_dir)
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 @router.get("/me", response_model=UserResponse)
 def read_users_me(current_user: User = Depends(get_current_user)):
@@ -45,14 +40,10 @@ def update_user_profile(
     # Handle Photo Upload
     if photo:
         try:
-            file_extension = photo.filename.split(".")[-1] if "." in photo.filename else "jpg"
-            file_name = f"profile_{current_user.id}_{uuid.uuid4()}.{file_extension}"
-            file_path = UPLOAD_DIR / file_name
-            
-            with file_path.open("wb") as buffer:
-                shutil.copyfileobj(photo.file, buffer)
-            
-            current_user.profile_image = f"/uploads/{file_name}"
+            stored = save_upload_sync(photo, default_extension="jpg")
+            current_user.profile_image = stored.url
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Failed to upload profile image: {e}")
             raise HTTPException(status_code=500, detail="Failed to upload image")
@@ -69,7 +60,7 @@ def update_user_profile(
 
 # Admin Dashboard
 @router.get("/admin/dashboard", response_model=AdminDashboardData)
-def get_admin_dashboard(db: Session = Depends(get_db)):
+def get_admin_dashboard(db: Session = Depends(get_read_db)):
     from sqlalchemy import func
     from datetime import datetime, timedelta
 
@@ -205,7 +196,7 @@ def get_admin_dashboard(db: Session = Depends(get_db)):
 @router.get("/vendor/dashboard/{user_id}", response_model=VendorDashboardData)
 def get_vendor_dashboard(
     user_id: int, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user) # Add dependency
 ):
     # Security Check: Ensure user is accessing their own dashboard
@@ -272,7 +263,7 @@ def get_vendor_dashboard(
 @router.get("/customer/dashboard/{customer_id}", response_model=CustomerDashboardData)
 def get_customer_dashboard(
     customer_id: int, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     # Security check: Ensure user is accessing their own dashboard
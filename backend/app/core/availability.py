@@ -0,0 +1,241 @@
+"""
+Appointment availability.
+
+A provider is busy for the span of every non-cancelled appointment's time slot.
+Those spans are loaded with one range query per request, merged into an
+IntervalIndex (sorted, non-overlapping) and probed with binary search, so
+listing free slots and validating a booking are O(log n) per candidate.
+
+Working hours are the provider's published TIME_SLOT blocks (app.core.schedules)
+when it has a schedule, otherwise the store-wide APPOINTMENT_OPENING_TIME /
+APPOINTMENT_CLOSING_TIME.
+
+Times are stored as naive UTC (what the frontend's toISOString() bookings
+become). Opening hours are wall-clock times in APPOINTMENT_TIMEZONE and are
+converted per day, so DST changes are handled.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import models
+
+Interval = Tuple[datetime, datetime]
+
+DEFAULT_DURATION_MINUTES = 60
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normalize a datetime to the naive UTC form appointment times are stored in."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def service_duration(service: Optional[models.Service]) -> timedelta:
+    minutes = getattr(service, "duration_minutes", None) or DEFAULT_DURATION_MINUTES
+    return timedelta(minutes=minutes)
+
+
+class IntervalIndex:
+    """Busy intervals merged into sorted, disjoint [start, end) spans."""
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """True if [start, end) intersects any busy span (touching ends do not overlap)."""
+        i = bisect_right(self.starts, start) - 1
+        if i >= 0 and self.ends[i] > start:
+            return True
+        return i + 1 < len(self.starts) and self.starts[i + 1] < end
+
+    def gaps(self, start: datetime, end: datetime) -> Iterator[Interval]:
+        """Free sub-intervals of [start, end)."""
+        cursor = start
+        i = max(bisect_right(self.starts, start) - 1, 0)
+        while i < len(self.starts) and self.starts[i] < end:
+            if self.ends[i] > cursor:
+                if self.starts[i] > cursor:
+                    yield cursor, self.starts[i]
+                cursor = self.ends[i]
+            i += 1
+        if cursor < end:
+            yield cursor, end
+
+
+def _parse_clock(value: str) -> time:
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+def opening_windows(date_from: date, date_to: date) -> List[Interval]:
+    """Opening hours for each day in [date_from, date_to] as naive UTC intervals."""
+    zone = ZoneInfo(settings.APPOINTMENT_TIMEZONE)
+    opens = _parse_clock(settings.APPOINTMENT_OPENING_TIME)
+    closes = _parse_clock(settings.APPOINTMENT_CLOSING_TIME)
+    windows = []
+    day = date_from
+    while day <= date_to:
+        start = to_utc_naive(datetime.combine(day, opens, tzinfo=zone))
+        end = to_utc_naive(datetime.combine(day, closes, tzinfo=zone))
+        if end > start:
+            windows.append((start, end))
+        day += timedelta(days=1)
+    return windows
+
+
+def busy_intervals(db: Session, provider_ids: List[int], start: datetime, end: datetime) -> Dict[int, List[Interval]]:
+    """Booked spans per provider overlapping [start, end), in a single query."""
+    rows = db.query(models.Appointment.provider_id, models.TimeSlot.start_time, models.TimeSlot.end_time)\
+        .join(models.TimeSlot, models.Appointment.slot_id == models.TimeSlot.slot_id)\
+        .filter(
+            models.Appointment.provider_id.in_(provider_ids),
+            models.Appointment.status != "Cancelled",
+            models.TimeSlot.start_time < end,
+            models.TimeSlot.end_time > start,
+        )\
+        .all()
+    busy: Dict[int, List[Interval]] = {pid: [] for pid in provider_ids}
+    for provider_id, slot_start, slot_end in rows:
+        busy[provider_id].append((to_utc_naive(slot_start), to_utc_naive(slot_end)))
+    return busy
+
+
+def working_windows(
+    db: Session,
+    providers: List[models.ServiceProvider],
+    date_from: date,
+    date_to: date,
+) -> Dict[int, List[Interval]]:
+    """Working intervals per provider; published schedules are read with one indexed range scan."""
+    default = opening_windows(date_from, date_to)
+    windows = {p.provider_id: default for p in providers if p.slots_generated_until is None}
+    published = [p.provider_id for p in providers if p.slots_generated_until is not None]
+    if not published:
+        return windows
+
+    zone = ZoneInfo(settings.APPOINTMENT_TIMEZONE)
+    range_start = to_utc_naive(datetime.combine(date_from, time(0), tzinfo=zone))
+    range_end = to_utc_naive(datetime.combine(date_to + timedelta(days=1), time(0), tzinfo=zone))
+    windows.update({pid: [] for pid in published})
+    rows = db.query(models.TimeSlot.provider_id, models.TimeSlot.start_time, models.TimeSlot.end_time)\
+        .filter(
+            models.TimeSlot.provider_id.in_(published),
+            models.TimeSlot.service_id.is_(None),
+            models.TimeSlot.start_time >= range_start,
+            models.TimeSlot.start_time < range_end,
+        )\
+        .order_by(models.TimeSlot.provider_id, models.TimeSlot.start_time)\
+        .all()
+    for provider_id, start, end in rows:
+        windows[provider_id].append((to_utc_naive(start), to_utc_naive(end)))
+    return windows
+
+
+@dataclass
+class ProviderAvailability:
+    provider_id: int
+    provider_name: str
+    slots: List[Interval]
+
+
+def free_slots(
+    busy: IntervalIndex,
+    windows: List[Interval],
+    duration: timedelta,
+    step: timedelta,
+    not_before: Optional[datetime] = None,
+) -> List[Interval]:
+    """Start times on the step grid of each window where `duration` fits without overlap."""
+    slots = []
+    for window_start, window_end in windows:
+        for gap_start, gap_end in busy.gaps(window_start, window_end):
+            # Snap to the window's grid so offered times stay on :00/:30 after odd-length bookings
+            offset = (gap_start - window_start) % step
+            candidate = gap_start if not offset else gap_start + (step - offset)
+            while candidate + duration <= gap_end:
+                if not_before is None or candidate >= not_before:
+                    slots.append((candidate, candidate + duration))
+                candidate += step
+    return slots
+
+
+def store_availability(
+    db: Session,
+    store_id: int,
+    duration: timedelta,
+    date_from: date,
+    date_to: date,
+    provider_id: Optional[int] = None,
+) -> List[ProviderAvailability]:
+    """Free slots of `duration` for each provider of a store (or just one) between two dates."""
+    providers_query = db.query(models.ServiceProvider).filter(models.ServiceProvider.store_id == store_id)
+    if provider_id is not None:
+        providers_query = providers_query.filter(models.ServiceProvider.provider_id == provider_id)
+    providers = providers_query.order_by(models.ServiceProvider.name).all()
+    if not providers:
+        return []
+
+    windows = working_windows(db, providers, date_from, date_to)
+    spans = [w for provider_windows in windows.values() for w in provider_windows]
+    if not spans:
+        return [ProviderAvailability(p.provider_id, p.name, []) for p in providers]
+
+    busy = busy_intervals(db, [p.provider_id for p in providers], min(s for s, _ in spans), max(e for _, e in spans))
+    step = timedelta(minutes=settings.APPOINTMENT_SLOT_STEP_MINUTES)
+    now = to_utc_naive(datetime.now(timezone.utc))
+    return [
+        ProviderAvailability(
+            p.provider_id,
+            p.name,
+            free_slots(IntervalIndex(busy[p.provider_id]), windows[p.provider_id], duration, step, now),
+        )
+        for p in providers
+    ]
+
+
+def lock_provider(db: Session, provider_id: int) -> Optional[models.ServiceProvider]:
+    """
+    Lock the provider row for the rest of the transaction so concurrent bookings
+    for the same provider check and insert one at a time. None if it was deleted.
+    """
+    return db.query(models.ServiceProvider)\
+        .filter(models.ServiceProvider.provider_id == provider_id)\
+        .with_for_update()\
+        .one_or_none()
+
+
+def is_provider_free(db: Session, provider_id: int, start: datetime, end: datetime) -> bool:
+    """Check [start, end) against the provider's bookings; call after lock_provider()."""
+    busy = busy_intervals(db, [provider_id], start, end)[provider_id]
+    return not IntervalIndex(busy).overlaps(start, end)
+
+
+def is_within_working_hours(db: Session, provider: models.ServiceProvider, start: datetime, end: datetime) -> bool:
+    """True if [start, end) lies inside one published working block (always true without a schedule)."""
+    if provider.slots_generated_until is None:
+        return True
+    return db.query(models.TimeSlot.slot_id)\
+        .filter(
+            models.TimeSlot.provider_id == provider.provider_id,
+            models.TimeSlot.service_id.is_(None),
+            models.TimeSlot.start_time <= start,
+            models.TimeSlot.end_time >= end,
+        )\
+        .first() is not None
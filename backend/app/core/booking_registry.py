@@ -0,0 +1,144 @@
+"""
+Per-store lookup of service providers and services for booking.
+
+Booking used to resolve the barber and the service by exact name with a query
+each (plus a name scan across every store when the service was not found in
+the requested one). A store has a handful of providers and services, so the
+registry loads both lists once per store and answers id and name lookups from
+memory. Names are matched case- and whitespace-insensitively. The cross-store
+name scan remains only as create_appointment's fallback for name-only bookings
+the store does not know; ids are always resolved within the store.
+
+Entries are plain snapshots, never ORM objects, so they can be shared across
+sessions and threads. A store's entry is dropped after any commit that inserts,
+updates or deletes one of its SERVICE or SERVICE_PROVIDER rows (tracked with
+the same session-event pattern as app.core.realtime). Bulk query deletes do not
+emit those events and must call invalidate() themselves. Each worker process
+keeps its own registry, so entries also expire after
+BOOKING_REGISTRY_TTL_SECONDS to pick up changes committed by other workers.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import models
+
+_DIRTY_STORES_KEY = "booking_registry_dirty_stores"
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+@dataclass(frozen=True)
+class ProviderEntry:
+    provider_id: int
+    store_id: int
+    name: str
+    slots_generated_until: Optional[date]
+
+
+@dataclass(frozen=True)
+class ServiceEntry:
+    service_id: int
+    store_id: int
+    service_name: str
+    duration_minutes: Optional[int]
+    status: Optional[str]
+
+
+@dataclass
+class StoreRegistry:
+    store_id: int
+    loaded_at: float
+    providers: Dict[int, ProviderEntry] = field(default_factory=dict)
+    services: Dict[int, ServiceEntry] = field(default_factory=dict)
+    providers_by_name: Dict[str, ProviderEntry] = field(default_factory=dict)
+    services_by_name: Dict[str, ServiceEntry] = field(default_factory=dict)
+
+    def provider(self, provider_id: Optional[int] = None, name: Optional[str] = None) -> Optional[ProviderEntry]:
+        if provider_id is not None:
+            return self.providers.get(provider_id)
+        return self.providers_by_name.get(normalize_name(name or ""))
+
+    def service(self, service_id: Optional[int] = None, name: Optional[str] = None) -> Optional[ServiceEntry]:
+        if service_id is not None:
+            return self.services.get(service_id)
+        return self.services_by_name.get(normalize_name(name or ""))
+
+
+def load_store(db: Session, store_id: int) -> StoreRegistry:
+    registry = StoreRegistry(store_id=store_id, loaded_at=time.monotonic())
+    # Ascending ids: when two rows share a normalized name the oldest wins, as .first() did
+    for provider in db.query(models.ServiceProvider)\
+            .filter(models.ServiceProvider.store_id == store_id)\
+            .order_by(models.ServiceProvider.provider_id):
+        entry = ProviderEntry(provider.provider_id, store_id, provider.name, provider.slots_generated_until)
+        registry.providers[entry.provider_id] = entry
+        registry.providers_by_name.setdefault(normalize_name(entry.name), entry)
+    for service in db.query(models.Service)\
+            .filter(models.Service.store_id == store_id)\
+            .order_by(models.Service.service_id):
+        entry = ServiceEntry(service.service_id, store_id, service.service_name, service.duration_minutes, service.status)
+        registry.services[entry.service_id] = entry
+        registry.services_by_name.setdefault(normalize_name(entry.service_name), entry)
+    return registry
+
+
+class BookingRegistry:
+    def __init__(self):
+        self._stores: Dict[int, StoreRegistry] = {}
+        self._lock = threading.Lock()
+        # Lookups answered from memory / that had to load the store (GET /metrics)
+        self.hits = 0
+        self.misses = 0
+
+    def for_store(self, db: Session, store_id: int) -> StoreRegistry:
+        registry = self._stores.get(store_id)
+        if registry is None or time.monotonic() - registry.loaded_at > settings.BOOKING_REGISTRY_TTL_SECONDS:
+            self.misses += 1
+            registry = load_store(db, store_id)
+            with self._lock:
+                self._stores[store_id] = registry
+        else:
+            self.hits += 1
+        return registry
+
+    def invalidate(self, store_id: int):
+        with self._lock:
+            self._stores.pop(store_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._stores.clear()
+
+
+booking_registry = BookingRegistry()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_stores(session: Session, flush_context):
+    stores: Set[int] = {
+        obj.store_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, (models.Service, models.ServiceProvider)) and obj.store_id is not None
+    }
+    if stores:
+        session.info.setdefault(_DIRTY_STORES_KEY, set()).update(stores)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_stores(session: Session):
+    for store_id in session.info.pop(_DIRTY_STORES_KEY, ()):
+        booking_registry.invalidate(store_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_stores(session: Session):
+    session.info.pop(_DIRTY_STORES_KEY, None)
@@ -21,11 +21,69 @@ class Settings(BaseSettings):
     MYSQL_DB: str = "aiu_microstore"
 
     SQLALCHEMY_DATABASE_URL: str | None = None
+    ASYNC_DATABASE_URL: str | None = None  # Defaults to DATABASE_URL with the asyncio driver (aiomysql / aiosqlite)
+    ASYNC_READ_ROUTES: bool = True  # Serve the hottest read routes from AsyncSession instead of the threadpool
+    DATABASE_REPLICA_URLS: str = ""  # Comma separated read replicas for get_read_db routes (empty = primary only)
+    REPLICA_HEALTH_CHECK_SECONDS: int = 10  # How often a picked replica is re-pinged
+    READ_YOUR_WRITES_SECONDS: int = 5  # Keep a user's reads on the primary this long after they write
+    AUTO_CREATE_TABLES: bool = False  # Run create_all at startup instead of `python migrate.py`
+
+    # Connection Pool (one engine per process, see app/db/session.py)
+    DB_POOL_SIZE: int = 10  # Connections kept open
+    DB_MAX_OVERFLOW: int = 20  # Extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: int = 10  # Seconds to wait for a free connection before failing the request
+    DB_POOL_RECYCLE: int = 1800  # Reopen connections older than this (below the server's wait_timeout)
+    DB_POOL_PRE_PING: str = "idle"  # always | idle | never
+    DB_POOL_PRE_PING_IDLE_SECONDS: int = 30  # With "idle": ping connections unused for this long
+    DB_POOL_SLOW_CHECKOUT_MS: int = 250  # Log checkouts that wait at least this long (0 = off)
+
+    # Query Instrumentation (see app/core/query_stats.py)
+    DEBUG: bool = False  # Adds Server-Timing headers with each response's database figures
+    SLOW_QUERY_MS: int = 200  # Log statements at least this slow, with their route (0 = off)
+    REQUEST_QUERY_WARN_COUNT: int = 30  # Log requests issuing more statements than this (likely N+1; 0 = off)
+
+    # Metrics (GET /metrics, see app/core/metrics.py)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""  # When set, scrapers must send Authorization: Bearer <token>
+
+    # Sampling Profiler (POST /api/admin/profile, see app/core/profiler.py)
+    PROFILER_INTERVAL_MS: int = 10
+    PROFILER_MAX_SECONDS: int = 60
+    PROFILER_REQUEST_TOKEN: str = ""  # Requests sent with X-Profile: <token> are profiled (empty = off)
 
     # Runtime Settings
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:5174,http://localhost:3000,https://aiu-microstore.vercel.app,https://www.aiu-microstore.vercel.app"
     UPLOAD_DIR: str = "uploads"
     BACKEND_PUBLIC_URL: str = "http://localhost:8000"
+    MAX_IMAGE_UPLOAD_MB: int = 10
+    MAX_AUDIO_UPLOAD_MB: int = 25
+    MAX_VIDEO_UPLOAD_MB: int = 100
+    MAX_FILE_UPLOAD_MB: int = 25
+    MEDIA_CACHE_MAX_AGE: int = 3600  # Cache lifetime for files that are not content-addressed
+    MEDIA_PRECOMPRESS: bool = True  # Write .gz sidecars for compressible uploads (SVG, text, JSON)
+
+    # Image Derivatives (thumbnails / WebP / AVIF, generated off the request path)
+    IMAGE_VARIANTS_ENABLED: bool = True
+    IMAGE_VARIANT_WIDTHS: str = "160,480,960"
+    IMAGE_VARIANT_FORMATS: str = "webp,avif"
+    IMAGE_VARIANT_WORKERS: int = 2
+
+    # Messaging Settings
+    READ_RECEIPT_WINDOW_MS: int = 250
+
+    # Notification Retention
+    NOTIFICATION_READ_RETENTION_DAYS: int = 30  # Read notifications older than this are deleted
+    NOTIFICATION_COLLAPSE_TYPES: str = "message"  # Comma separated types collapsed per (user, related_id)
+
+    # Appointment Settings
+    APPOINTMENT_TIMEZONE: str = "UTC"  # Zone the opening hours below are expressed in
+    APPOINTMENT_OPENING_TIME: str = "09:00"
+    APPOINTMENT_CLOSING_TIME: str = "23:00"
+    APPOINTMENT_SLOT_STEP_MINUTES: int = 30  # Granularity of offered start times
+    APPOINTMENT_MAX_AVAILABILITY_DAYS: int = 31  # Longest range one availability request may cover
+    APPOINTMENT_SLOT_HORIZON_DAYS: int = 60  # How far ahead published working hours are materialized
+    APPOINTMENT_MAX_CALENDAR_DAYS: int = 62  # Longest range one calendar request may cover
+    BOOKING_REGISTRY_TTL_SECONDS: int = 300  # Max age of a cached store provider/service list (per worker)
 
     @property
     def effective_upload_dir(self) -> str:
@@ -55,6 +113,22 @@ class Settings(BaseSettings):
             return database_url.replace("mysql://", "mysql+mysqlconnector://", 1)
         return database_url
 
+    @property
+    def DATABASE_REPLICA_URLS_LIST(self) -> list[str]:
+        return [self._normalize_database_url(url.strip()) for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+    @property
+    def IMAGE_VARIANT_WIDTHS_LIST(self) -> list[int]:
+        return sorted(int(width) for width in self.IMAGE_VARIANT_WIDTHS.split(",") if width.strip())
+
+    @property
+    def IMAGE_VARIANT_FORMATS_LIST(self) -> list[str]:
+        return [fmt.strip().lower() for fmt in self.IMAGE_VARIANT_FORMATS.split(",") if fmt.strip()]
+
+    @property
+    def NOTIFICATION_COLLAPSE_TYPES_LIST(self) -> list[str]:
+        return [t.strip() for t in self.NOTIFICATION_COLLAPSE_TYPES.split(",") if t.strip()]
+
     @property
     def CORS_ORIGINS_LIST(self) -> list[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
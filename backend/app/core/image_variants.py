@@ -0,0 +1,135 @@
+"""
+Responsive image derivatives.
+
+After an image upload is stored, a process pool renders downscaled copies
+(IMAGE_VARIANT_WIDTHS) in each configured format next to the original blob:
+media/ab/cd/<sha256>_<width>w.<format>. Rendering never runs on the request
+path; when it finishes the variants are recorded in IMAGE_VARIANT so API
+responses can list them.
+
+Pillow is optional: without it uploads still work and no variants are made.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def variant_file_name(sha256: str, width: int, fmt: str) -> str:
+    return f"{sha256}_{width}w.{fmt}"
+
+
+def render_variants(source_path: str, sha256: str, widths: List[int], formats: List[str]) -> List[dict]:
+    """
+    Render every width/format combination for one image (runs in a worker process).
+
+    Widths at or above the original width are skipped and images no wider than
+    the largest width also get a full-size re-encode, so nothing is upscaled.
+    Existing files are reused.
+    """
+    from PIL import Image, ImageOps
+
+    Image.init()
+    formats = [fmt for fmt in formats if fmt.upper() in Image.SAVE]
+    source = Path(source_path)
+    rendered = []
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.mode in ("LA", "P", "PA") else "RGB")
+
+        targets = [w for w in widths if w < image.width]
+        if image.width <= max(widths):
+            targets.append(image.width)
+
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                target = source.with_name(variant_file_name(sha256, width, fmt))
+                if not target.exists():
+                    # Per-process temp name: the same blob may be rendered by two workers at once
+                    tmp = target.with_name(f".{target.name}.{os.getpid()}.part")
+                    resized.save(tmp, format=fmt.upper(), quality=80)
+                    os.replace(tmp, target)
+                rendered.append({
+                    "width": width,
+                    "height": height,
+                    "format": fmt,
+                    "file_name": target.name,
+                    "size_bytes": target.stat().st_size,
+                })
+    return rendered
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: workers must not inherit the server's threads, sockets or DB connections
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _record(sha256: str, url_prefix: str, future: Future):
+    try:
+        rendered = future.result()
+    except Exception:
+        logger.exception("Failed to generate image variants for %s", sha256)
+        return
+
+    from app.core.media_store import record_variants
+    from app.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        record_variants(db, sha256, url_prefix, rendered)
+    except Exception:
+        logger.exception("Failed to record image variants for %s", sha256)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def schedule_variants(stored) -> Optional[Future]:
+    """Queue derivative generation for a stored upload; returns None if it is not an image."""
+    if not settings.IMAGE_VARIANTS_ENABLED or stored.kind != "image" or not pillow_available():
+        return None
+
+    future = _get_pool().submit(
+        render_variants,
+        str(stored.path),
+        stored.sha256,
+        settings.IMAGE_VARIANT_WIDTHS_LIST,
+        settings.IMAGE_VARIANT_FORMATS_LIST,
+    )
+    url_prefix = stored.url.rsplit("/", 1)[0]
+    future.add_done_callback(partial(_record, stored.sha256, url_prefix))
+    return future
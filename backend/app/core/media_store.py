@@ -0,0 +1,250 @@
+"""
+Content-addressed media store.
+
+Uploads are stored once per distinct content under
+<upload dir>/media/<aa>/<bb>/<sha256>.<ext>, so re-uploading the same photo for
+several colour variants (or by several vendors) reuses a single file. Derived
+images (app.core.image_variants) sit next to their source as <sha256>_*.
+Blobs are referenced by URL from the model columns listed in MEDIA_REFERENCES;
+a blob that no row points to, together with its derivatives, can be reclaimed
+by collect_garbage().
+"""
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import models
+
+MEDIA_SUBDIR = "media"
+
+# Every column that can hold an /uploads URL
+MEDIA_REFERENCES = [
+    models.Product.image_url,
+    models.ProductImage.image_url,
+    models.Store.image_url,
+    models.Service.image_url,
+    models.User.profile_image,
+    models.Message.attachment_url,
+]
+
+_BLOB_URL_RE = re.compile(r"/uploads/" + MEDIA_SUBDIR + r"/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64}\.[A-Za-z0-9]+)")
+
+
+def media_root() -> Path:
+    return Path(settings.effective_upload_dir) / MEDIA_SUBDIR
+
+
+def blob_relative_path(sha256: str, extension: str) -> str:
+    """Sharded path of a blob relative to the upload dir, e.g. media/ab/cd/abcd....jpg"""
+    return f"{MEDIA_SUBDIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{extension}"
+
+
+def blob_name_from_url(url: str):
+    """Return the blob file name referenced by an /uploads URL, or None for non-media URLs."""
+    match = _BLOB_URL_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def blob_sha256(name: str) -> str:
+    """Content hash a blob or derivative file name belongs to."""
+    return name[:64]
+
+
+def reference_counts(db: Session, batch_size: int = 1000) -> Counter:
+    """Count how many rows reference each content hash, streaming every referencing column."""
+    counts = Counter()
+    for col in MEDIA_REFERENCES:
+        rows = db.query(col).filter(col.like(f"%/uploads/{MEDIA_SUBDIR}/%")).yield_per(batch_size)
+        for (url,) in rows:
+            name = blob_name_from_url(url)
+            if name:
+                counts[blob_sha256(name)] += 1
+    return counts
+
+
+def record_variants(db: Session, sha256: str, url_prefix: str, rendered: List[dict]):
+    """Store rendered derivatives of a blob, skipping any already recorded."""
+    existing = {
+        (width, fmt) for width, fmt in db.query(models.ImageVariant.width, models.ImageVariant.format)
+        .filter(models.ImageVariant.source_sha256 == sha256)
+    }
+    for variant in rendered:
+        if (variant["width"], variant["format"]) in existing:
+            continue
+        db.add(models.ImageVariant(
+            source_sha256=sha256,
+            width=variant["width"],
+            height=variant["height"],
+            format=variant["format"],
+            url=f"{url_prefix}/{variant['file_name']}",
+            size_bytes=variant["size_bytes"],
+        ))
+    db.commit()
+
+
+def _url_hashes(urls: Iterable[str]) -> Dict[str, str]:
+    hashes = {}
+    for url in urls:
+        name = blob_name_from_url(url)
+        if name:
+            hashes[url] = blob_sha256(name)
+    return hashes
+
+
+def _variants_query(hashes: Dict[str, str]):
+    return select(models.ImageVariant)\
+        .where(models.ImageVariant.source_sha256.in_(set(hashes.values())))\
+        .order_by(models.ImageVariant.width, models.ImageVariant.format)
+
+
+def _group_variants(hashes: Dict[str, str], rows) -> Dict[str, List[models.ImageVariant]]:
+    by_hash: Dict[str, List[models.ImageVariant]] = {}
+    for row in rows:
+        by_hash.setdefault(row.source_sha256, []).append(row)
+    return {url: by_hash.get(sha, []) for url, sha in hashes.items()}
+
+
+def variants_for_urls(db: Session, urls: Iterable[str]) -> Dict[str, List[models.ImageVariant]]:
+    """Map each media URL to its recorded derivatives (smallest first) with a single query."""
+    hashes = _url_hashes(urls)
+    if not hashes:
+        return {}
+    return _group_variants(hashes, db.execute(_variants_query(hashes)).scalars())
+
+
+async def variants_for_urls_async(db: AsyncSession, urls: Iterable[str]) -> Dict[str, List[models.ImageVariant]]:
+    hashes = _url_hashes(urls)
+    if not hashes:
+        return {}
+    return _group_variants(hashes, (await db.execute(_variants_query(hashes))).scalars())
+
+
+def _image_urls(products: list, stores: list) -> List[str]:
+    urls = [p.image_url for p in products] + [s.image_url for s in stores]
+    urls += [img.image_url for p in products for img in p.images_rel]
+    return [u for u in urls if u]
+
+
+def _apply_variants(variants: Dict[str, List[models.ImageVariant]], products: list, stores: list):
+    for product in products:
+        product.image_variants = variants.get(product.image_url, [])
+        for image in product.images_rel:
+            image.variants = variants.get(image.image_url, [])
+    for store in stores:
+        store.image_variants = variants.get(store.image_url, [])
+
+
+def attach_image_variants(db: Session, products=(), stores=()):
+    """
+    Set image_variants on products/stores (and variants on product images) for
+    response serialization, using one query for the whole page.
+    """
+    products = list(products)
+    stores = list(stores)
+    _apply_variants(variants_for_urls(db, _image_urls(products, stores)), products, stores)
+
+
+async def attach_image_variants_async(db: AsyncSession, products=(), stores=()):
+    """attach_image_variants for AsyncSession routes; images_rel must already be loaded."""
+    products = list(products)
+    stores = list(stores)
+    _apply_variants(await variants_for_urls_async(db, _image_urls(products, stores)), products, stores)
+
+
+def iter_blobs() -> Iterator[Path]:
+    root = media_root()
+    if not root.exists():
+        return
+    for shard in sorted(root.iterdir()):
+        if not shard.is_dir():
+            continue
+        for sub in sorted(shard.iterdir()):
+            if sub.is_dir():
+                yield from (p for p in sorted(sub.iterdir()) if p.is_file() and not p.name.startswith("."))
+
+
+@dataclass
+class GarbageCollectionReport:
+    scanned: int = 0
+    referenced: int = 0
+    deleted: List[str] = field(default_factory=list)
+    bytes_freed: int = 0
+
+
+def collect_garbage(
+    db: Session,
+    batch_size: int = 500,
+    grace_seconds: int = 24 * 3600,
+    pause_seconds: float = 0.0,
+    dry_run: bool = False,
+) -> GarbageCollectionReport:
+    """
+    Delete blobs no row references, in batches of `batch_size`.
+
+    Blobs modified within `grace_seconds` are kept: they may belong to an upload
+    whose product/message has not been saved yet.
+    """
+    counts = reference_counts(db)
+    report = GarbageCollectionReport()
+    deleted_hashes = set()
+    cutoff = time.time() - grace_seconds
+
+    batch: List[Path] = []
+
+    def flush():
+        for path in batch:
+            if not dry_run:
+                path.unlink(missing_ok=True)
+            report.deleted.append(path.name)
+            deleted_hashes.add(blob_sha256(path.name))
+        batch.clear()
+        if pause_seconds and not dry_run:
+            time.sleep(pause_seconds)
+
+    for path in iter_blobs():
+        report.scanned += 1
+        if counts.get(blob_sha256(path.name)):
+            report.referenced += 1
+            continue
+        stat = path.stat()
+        if stat.st_mtime > cutoff:
+            continue
+        report.bytes_freed += stat.st_size
+        batch.append(path)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    if not dry_run:
+        if deleted_hashes:
+            # Forget derivative rows whose files are gone, unless some were kept (grace period)
+            gone = [sha for sha in deleted_hashes if not any(media_root().joinpath(sha[:2], sha[2:4]).glob(f"{sha}*"))]
+            for i in range(0, len(gone), batch_size):
+                db.query(models.ImageVariant)\
+                    .filter(models.ImageVariant.source_sha256.in_(gone[i:i + batch_size]))\
+                    .delete(synchronize_session=False)
+            db.commit()
+        _prune_empty_shards()
+    return report
+
+
+def _prune_empty_shards():
+    root = media_root()
+    if not root.exists():
+        return
+    for dirpath, _, _ in os.walk(root, topdown=False):
+        if Path(dirpath) != root and not os.listdir(dirpath):
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
@@ -0,0 +1,259 @@
+"""
+Prometheus metrics (text exposition format 0.0.4, served at GET /metrics).
+
+Instruments are plain preallocated counters: a histogram is a fixed list of
+bucket counts, and the per-route histograms are created on a route's first
+request and found afterwards by the path template of the route the router put
+in the scope, so recording a request allocates nothing. Everything is rendered only when the
+endpoint is scraped; gauges that other components already keep (pool figures,
+open sockets, cache counters) are read at that point instead of being mirrored
+here. Values are per worker process: scrape each worker, or sum in the query.
+
+    pbl_http_request_duration_seconds   histogram {method, route}  route = path template
+    pbl_http_requests_in_flight         gauge
+    pbl_password_hash_seconds           histogram {operation}      bcrypt hash / verify
+    pbl_password_hash_in_progress       gauge
+    pbl_upload_bytes_total              counter   {kind}
+    pbl_uploads_total                   counter   {kind, deduplicated}
+
+The endpoint adds the DB pool, threadpool, WebSocket and cache families
+(app/api/v1/metrics.py).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# bcrypt at the default cost takes a few hundred ms, more on a busy CPU
+HASH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Sequence[Tuple[str, object]]
+
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge(Counter):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Histogram:
+    """Fixed buckets; counts[i] holds observations in (bounds[i-1], bounds[i]], the last one +Inf."""
+
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def cumulative(self) -> Tuple[List[int], float]:
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        running = 0
+        for i, count in enumerate(counts):
+            running += count
+            counts[i] = running
+        return counts, total
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float) and value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Exposition:
+    """Builds the text format; each family gets its HELP / TYPE header once."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self._declared = set()
+
+    def _declare(self, name: str, kind: str, help_text: str):
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, kind: str, help_text: str, value: Optional[float], labels: Labels = ()):
+        if value is None:
+            return
+        self._declare(name, kind, help_text)
+        self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name: str, help_text: str, bounds: Sequence[float], cumulative: Sequence[int], total: float, labels: Labels = ()):
+        """`cumulative` has one count per bound plus the +Inf count."""
+        self._declare(name, "histogram", help_text)
+        labels = tuple(labels)
+        for bound, count in zip((*bounds, "+Inf"), cumulative):
+            le = bound if isinstance(bound, str) else _number(float(bound))
+            self.lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {count}")
+        self.lines.append(f"{name}_sum{_labels(labels)} {_number(round(total, 6))}")
+        self.lines.append(f"{name}_count{_labels(labels)} {cumulative[-1]}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class RouteLatency:
+    """One latency histogram per (route template, method), created on first use."""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, route: str, method: str) -> Histogram:
+        methods = self._routes.get(route)
+        histogram = methods.get(method) if methods is not None else None
+        if histogram is None:
+            with self._lock:
+                methods = self._routes.setdefault(route, {})
+                histogram = methods.setdefault(method, Histogram(LATENCY_BUCKETS))
+        return histogram
+
+    def collect(self, out: Exposition):
+        with self._lock:
+            routes = [(route, dict(methods)) for route, methods in self._routes.items()]
+        for route, methods in sorted(routes):
+            for method, histogram in sorted(methods.items()):
+                counts, total = histogram.cumulative()
+                out.histogram(
+                    "pbl_http_request_duration_seconds", "HTTP request latency by route template.",
+                    histogram.bounds, counts, total, (("method", method), ("route", route)),
+                )
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_latency = RouteLatency()
+requests_in_flight = Gauge()
+password_hash_seconds = {operation: Histogram(HASH_BUCKETS) for operation in ("hash", "verify")}
+password_hash_in_progress = Gauge()
+upload_bytes = {kind: Counter() for kind in ("image", "audio", "video", "file")}
+uploads = {(kind, deduplicated): Counter() for kind in upload_bytes for deduplicated in (False, True)}
+
+
+@contextmanager
+def time_password_hash(operation: str) -> Iterator[None]:
+    started = time.perf_counter()
+    with password_hash_in_progress.track():
+        try:
+            yield
+        finally:
+            password_hash_seconds[operation].observe(time.perf_counter() - started)
+
+
+def observe_upload(kind: str, size: int, deduplicated: bool):
+    upload_bytes[kind].inc(size)
+    uploads[(kind, deduplicated)].inc()
+
+
+def collect(out: Exposition):
+    """The instruments kept in this module."""
+    out.sample("pbl_http_requests_in_flight", "gauge", "HTTP requests being handled.", requests_in_flight.value)
+    route_latency.collect(out)
+    out.sample(
+        "pbl_password_hash_in_progress", "gauge", "bcrypt hash / verify calls running.",
+        password_hash_in_progress.value,
+    )
+    for operation, histogram in password_hash_seconds.items():
+        counts, total = histogram.cumulative()
+        out.histogram(
+            "pbl_password_hash_seconds", "bcrypt hash / verify duration.",
+            histogram.bounds, counts, total, (("operation", operation),),
+        )
+    for kind, counter in upload_bytes.items():
+        out.sample("pbl_upload_bytes_total", "counter", "Bytes received in file uploads.", counter.value, (("kind", kind),))
+    for (kind, deduplicated), counter in uploads.items():
+        out.sample(
+            "pbl_uploads_total", "counter", "Stored uploads (deduplicated: content was already stored).",
+            counter.value, (("kind", kind), ("deduplicated", str(deduplicated).lower())),
+        )
+
+
+def route_template(scope: Scope) -> str:
+    """Template of the route the router matched (an existing string, nothing is formatted)."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope.get("endpoint") is not None:
+        # Mount (/uploads): the mount path is the template
+        return scope.get("root_path") or UNMATCHED_ROUTE
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI: in-flight gauge and per-route latency histogram for HTTP requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - started
+            requests_in_flight.dec()
+            route_latency.histogram(route_template(scope), scope["method"]).observe(elapsed)
+
+
+def render(collectors: Iterable) -> str:
+    out = Exposition()
+    collect(out)
+    for collector in collectors:
+        collector(out)
+    return out.render()
@@ -0,0 +1,138 @@
+"""
+Notification retention and compaction.
+
+NOTIFICATION gets a row per order, appointment and chat event. compact_notifications()
+keeps it (and its indexes) small in two passes, committing every `batch_size`
+groups/rows so no transaction holds locks on a large part of the table:
+
+1. Collapse: repeated notifications of the NOTIFICATION_COLLAPSE_TYPES (chat
+   messages by default) for the same user and related_id are folded into the
+   newest one, whose `occurrences` becomes the total. Read and unread rows are
+   collapsed separately so an unread badge never absorbs already-seen events.
+   Chat notifications get their text rewritten for the new total.
+2. Expire: read notifications older than NOTIFICATION_READ_RETENTION_DAYS are
+   deleted. Unread ones are always kept.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import models
+
+
+def message_notification_text(sender_name: str, occurrences: int) -> str:
+    """Text of a chat notification standing for `occurrences` messages from one sender."""
+    if occurrences > 1:
+        return f"You received {occurrences} messages from {sender_name}"
+    return f"You received a message from {sender_name}"
+
+
+@dataclass
+class RetentionReport:
+    collapsed_groups: int = 0
+    collapsed_rows: int = 0
+    expired_rows: int = 0
+
+
+def collapse_repeated(
+    db: Session,
+    types: Optional[List[str]] = None,
+    batch_size: int = 500,
+    pause_seconds: float = 0.0,
+    dry_run: bool = False,
+    report: Optional[RetentionReport] = None,
+) -> RetentionReport:
+    """Fold repeated notifications per (user, type, related_id, is_read) into the newest row."""
+    Notification = models.Notification
+    types = settings.NOTIFICATION_COLLAPSE_TYPES_LIST if types is None else types
+    report = report or RetentionReport()
+    if not types:
+        return report
+
+    key = (Notification.user_id, Notification.type, Notification.related_id, Notification.is_read)
+    groups = db.query(*key, func.max(Notification.id))\
+        .filter(Notification.type.in_(types), Notification.related_id.isnot(None))\
+        .group_by(*key)\
+        .having(func.count(Notification.id) > 1)\
+        .all()
+
+    for start in range(0, len(groups), batch_size):
+        for user_id, type_, related_id, is_read, keeper_id in groups[start:start + batch_size]:
+            same_group = db.query(Notification).filter(
+                Notification.user_id == user_id,
+                Notification.type == type_,
+                Notification.related_id == related_id,
+                Notification.is_read == is_read,
+                Notification.id <= keeper_id,
+            )
+            # Re-read inside the batch transaction so concurrent changes are not double counted
+            rows, total = same_group.with_entities(func.count(Notification.id), func.sum(Notification.occurrences)).one()
+            if rows < 2:
+                continue
+            report.collapsed_groups += 1
+            report.collapsed_rows += rows - 1
+            if dry_run:
+                continue
+            values = {"occurrences": total}
+            sender = db.get(models.User, related_id) if type_ == "message" else None
+            if sender is not None:
+                values["message"] = message_notification_text(sender.full_name or sender.email, total)
+            same_group.filter(Notification.id == keeper_id).update(values, synchronize_session=False)
+            same_group.filter(Notification.id < keeper_id).delete(synchronize_session=False)
+        if not dry_run:
+            db.commit()
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    return report
+
+
+def expire_read(
+    db: Session,
+    retention_days: Optional[int] = None,
+    batch_size: int = 500,
+    pause_seconds: float = 0.0,
+    dry_run: bool = False,
+    report: Optional[RetentionReport] = None,
+) -> RetentionReport:
+    """Delete read notifications older than the retention window, `batch_size` rows per transaction."""
+    Notification = models.Notification
+    retention_days = settings.NOTIFICATION_READ_RETENTION_DAYS if retention_days is None else retention_days
+    report = report or RetentionReport()
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    expired = db.query(Notification.id)\
+        .filter(Notification.is_read == True, Notification.created_at < cutoff)
+
+    if dry_run:
+        report.expired_rows += expired.count()
+        return report
+
+    while True:
+        ids = [row.id for row in expired.order_by(Notification.id).limit(batch_size)]
+        if not ids:
+            break
+        db.query(Notification).filter(Notification.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        report.expired_rows += len(ids)
+        if len(ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return report
+
+
+def compact_notifications(
+    db: Session,
+    retention_days: Optional[int] = None,
+    batch_size: int = 500,
+    pause_seconds: float = 0.0,
+    dry_run: bool = False,
+) -> RetentionReport:
+    report = RetentionReport()
+    collapse_repeated(db, batch_size=batch_size, pause_seconds=pause_seconds, dry_run=dry_run, report=report)
+    expire_read(db, retention_days, batch_size=batch_size, pause_seconds=pause_seconds, dry_run=dry_run, report=report)
+    return report
@@ -0,0 +1,219 @@
+"""
+Sampling profiler for diagnosing slow routes in production.
+
+A Profile runs a daemon thread that reads every thread's current stack
+(sys._current_frames()) every PROFILER_INTERVAL_MS and counts identical stacks.
+Nothing is traced between samples, so the profiled code runs at full speed; the
+cost is the sampling thread itself (well under a millisecond per sample).
+
+Samples are attributed to the request they belong to:
+
+- On the event loop, ProfilerMiddleware registers each request's middleware
+  frame; a stack that contains it belongs to that request (and is cut there,
+  the server frames above it are the same for every request).
+- Sync endpoints run on threadpool threads, whose stacks never contain the
+  middleware; they are attributed by the endpoint function on the stack.
+
+Stacks outside any request (idle threads, background work) are dropped. The
+result is in the collapsed format read by flamegraph.pl, speedscope and
+inferno, with the route as the root frame:
+
+    GET /api/v1/users/dashboard;read_dashboard (app/api/v1/users.py:120);... 37
+
+Two entry points:
+
+- POST /api/admin/profile?seconds=N profiles the whole worker for N seconds
+  (one profile at a time per worker).
+- With PROFILER_REQUEST_TOKEN set, a request sent with
+  "X-Profile: <token>" is profiled on its own; the response carries an
+  X-Profile-Id header and the stacks are fetched from
+  GET /api/admin/profile/requests/{id}. Threadpool samples are matched by
+  route, so concurrent requests to the same sync route are mixed in.
+"""
+import os
+import secrets
+import sys
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from types import CodeType, FrameType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+_RECENT_REQUEST_PROFILES = 20
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+
+# Middleware frame -> request scope, for requests in flight on the event loop
+_request_frames: Dict[FrameType, Scope] = {}
+_labels: Dict[CodeType, str] = {}
+
+
+def _frame_label(code: CodeType) -> str:
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        if path.startswith(_BACKEND_ROOT):
+            path = path[len(_BACKEND_ROOT):]
+        elif "site-packages" + os.sep in path:
+            path = path.split("site-packages" + os.sep, 1)[1]
+        # co_qualname only exists on Python 3.11+
+        name = getattr(code, "co_qualname", code.co_name)
+        label = _labels[code] = f"{name} ({path}:{code.co_firstlineno})".replace(";", ":")
+    return label
+
+
+def _request_label(scope: Scope) -> str:
+    return f"{scope['method']} {route_template(scope)}"
+
+
+def endpoint_routes(routes: Iterable) -> Dict[CodeType, str]:
+    """Endpoint function code -> "METHODS /path", for attributing threadpool stacks."""
+    endpoints = {}
+    for route in routes:
+        code = getattr(getattr(route, "endpoint", None), "__code__", None)
+        if code is not None and getattr(route, "methods", None):
+            endpoints[code] = f"{','.join(sorted(route.methods))} {route.path}"
+    return endpoints
+
+
+class Profile:
+    """One sampling session; `only` restricts it to a single request."""
+
+    def __init__(self, routes: Iterable, interval: float, only: Optional[Scope] = None):
+        self.interval = interval
+        self.only = only
+        self.endpoints = endpoint_routes(routes)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+
+    def _attribute(self, frame: FrameType) -> Tuple[Optional[Scope], Optional[str], List[str]]:
+        """(request scope, route label, labels leaf first) for one thread's stack."""
+        labels = []
+        route = None
+        while frame is not None:
+            scope = _request_frames.get(frame)
+            if scope is not None:
+                return scope, _request_label(scope), labels
+            code = frame.f_code
+            if route is None:
+                route = self.endpoints.get(code)
+            labels.append(_frame_label(code))
+            frame = frame.f_back
+        return None, route, labels
+
+    def _is_target(self, scope: Optional[Scope], route: str) -> bool:
+        if scope is not None:
+            return scope is self.only
+        # Threadpool stack: only the route is known
+        return route.split(" ", 1)[1] == route_template(self.only)
+
+    def sample(self, exclude: Optional[int] = None):
+        self.samples += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == exclude:
+                continue
+            scope, route, labels = self._attribute(frame)
+            if route is None:
+                continue
+            if self.only is not None and not self._is_target(scope, route):
+                continue
+            labels.append(route)
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """Worker-wide profiles (one at a time) and the recent per-request ones."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running: Optional[Profile] = None
+        self.request_profiles: "OrderedDict[str, str]" = OrderedDict()
+
+    def begin(self, routes: Iterable) -> Optional[Profile]:
+        """Start a worker-wide profile, or None if one is already running."""
+        with self._lock:
+            if self.running is not None:
+                return None
+            self.running = Profile(routes, settings.PROFILER_INTERVAL_MS / 1000)
+        self.running.start()
+        return self.running
+
+    def end(self, profile: Profile):
+        profile.stop()
+        with self._lock:
+            self.running = None
+
+    def keep_request_profile(self, profile_id: str, profile: Profile):
+        with self._lock:
+            self.request_profiles[profile_id] = profile.collapsed()
+            while len(self.request_profiles) > _RECENT_REQUEST_PROFILES:
+                self.request_profiles.popitem(last=False)
+
+
+profiler = Profiler()
+
+
+def _wants_profile(scope: Scope) -> bool:
+    token = settings.PROFILER_REQUEST_TOKEN
+    if not token:
+        return False
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return secrets.compare_digest(value, token.encode())
+    return False
+
+
+class ProfilerMiddleware:
+    """Pure ASGI: registers the request frame for attribution and handles X-Profile."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        frame = sys._getframe()
+        _request_frames[frame] = scope
+        profile = profile_id = None
+        if _wants_profile(scope):
+            profile = Profile(scope["app"].routes, settings.PROFILER_INTERVAL_MS / 1000, only=scope)
+            profile_id = uuid.uuid4().hex
+            profile.start()
+
+            async def send_with_id(message: Message):
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+                await send(message)
+        try:
+            await self.app(scope, receive, send if profile is None else send_with_id)
+        finally:
+            del _request_frames[frame]
+            if profile is not None:
+                profile.stop()
+                profiler.keep_request_profile(profile_id, profile)
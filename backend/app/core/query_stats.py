@@ -0,0 +1,195 @@
+"""
+Per-request SQL instrumentation.
+
+QueryStatsMiddleware gives every HTTP request a RequestQueries record; the
+cursor listeners below (registered on every Engine, including the sync side
+of the async engines) add each statement's count and duration to the record
+of the request that issued it. When the request finishes its figures are
+folded into per-route aggregates (GET /api/admin/query-stats).
+
+- Statements slower than SLOW_QUERY_MS are logged with their route.
+- Requests issuing more than REQUEST_QUERY_WARN_COUNT statements are logged:
+  a count that grows with the size of the result is an N+1.
+- With DEBUG on, responses carry a Server-Timing header (browser devtools show
+  it in the request's Timing tab):
+
+      Server-Timing: db;dur=12.4;desc="7 statements", db-slowest;dur=5.1, app;dur=31.0
+
+track_queries() gives the same record to code outside a request (tests, scripts).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+_STATEMENT_PREVIEW = 500
+
+
+class RequestQueries:
+    """Statement count and database time of one request."""
+
+    __slots__ = ("scope", "count", "seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the scope before the endpoint runs
+        route = self.scope.get("route") if self.scope else None
+        return getattr(route, "path", UNMATCHED_ROUTE)
+
+    def observe(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.seconds * 1000:.1f};desc="{self.count} statements", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.1f}, "
+            f"app;dur={total_seconds * 1000:.1f}"
+        )
+
+
+class RouteStats:
+    __slots__ = ("requests", "statements", "statements_max", "seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.statements_max = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+
+class QueryStats:
+    """Per-route aggregates of RequestQueries (per worker process)."""
+
+    def __init__(self):
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, queries: RequestQueries):
+        key = f"{method} {queries.route}"
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = RouteStats()
+            stats.requests += 1
+            stats.statements += queries.count
+            stats.statements_max = max(stats.statements_max, queries.count)
+            stats.seconds += queries.seconds
+            if queries.slowest_seconds > stats.slowest_seconds:
+                stats.slowest_seconds = queries.slowest_seconds
+                stats.slowest_statement = queries.slowest_statement
+
+    def snapshot(self) -> List[dict]:
+        """Routes by total database time, busiest first."""
+        with self._lock:
+            rows = [
+                {
+                    "route": key,
+                    "requests": s.requests,
+                    "statements_avg": round(s.statements / s.requests, 2),
+                    "statements_max": s.statements_max,
+                    "db_ms_avg": round(s.seconds * 1000 / s.requests, 2),
+                    "db_ms_total": round(s.seconds * 1000, 1),
+                    "slowest_ms": round(s.slowest_seconds * 1000, 1),
+                    "slowest_statement": (s.slowest_statement or "")[:_STATEMENT_PREVIEW] or None,
+                }
+                for key, s in self._routes.items()
+            ]
+        return sorted(rows, key=lambda row: -row["db_ms_total"])
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+query_stats = QueryStats()
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[RequestQueries]:
+    """Count the statements run inside the block (on this task / thread and the ones it starts)."""
+    queries = RequestQueries()
+    token = _current.set(queries)
+    try:
+        yield queries
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    queries = _current.get()
+    if queries is not None:
+        queries.observe(statement, elapsed)
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.0f ms) on %s: %s",
+            elapsed * 1000, queries.route if queries else "<no request>", statement[:_STATEMENT_PREVIEW],
+        )
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI (no per-request task or body buffering, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current.set(queries)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                MutableHeaders(scope=message).append("Server-Timing", queries.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            query_stats.record(scope["method"], queries)
+            if settings.REQUEST_QUERY_WARN_COUNT and queries.count > settings.REQUEST_QUERY_WARN_COUNT:
+                logger.warning(
+                    "%s %s issued %d statements (%.0f ms in the database)",
+                    scope["method"], queries.route, queries.count, queries.seconds * 1000,
+                )
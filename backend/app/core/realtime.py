@@ -0,0 +1,100 @@
+"""
+Server push over the /api/messages/ws connection.
+
+ConnectionManager tracks each user's open sockets (several tabs/devices per
+user). Besides chat frames it carries notification frames:
+
+    {"type": "notification", "notification": {...schemas.Notification...}}
+
+Notifications are published from SQLAlchemy session events rather than at
+each call site: rows inserted or updated by a flush are serialized after the
+flush and sent once the transaction commits (dropped on rollback). Clients
+replace a notification they already have by id. Endpoints that create
+notifications run both in the event loop and in the threadpool, so frames are
+always handed to the loop with call_soon_threadsafe. Clients that were offline
+catch up with GET /api/notifications/delta?since_id=<last seen id>.
+"""
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+from fastapi import WebSocket
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import models
+from app.schemas import schemas
+
+_PENDING_KEY = "pending_notification_frames"
+
+
+class ConnectionManager:
+    def __init__(self):
+        # Map user_id to a list of active websockets (support multiple devices/tabs)
+        self.active_connections: Dict[int, List[WebSocket]] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def connect(self, websocket: WebSocket, user_id: int):
+        await websocket.accept()
+        self.loop = asyncio.get_running_loop()
+        if user_id not in self.active_connections:
+            self.active_connections[user_id] = []
+        self.active_connections[user_id].append(websocket)
+
+    def disconnect(self, websocket: WebSocket, user_id: int):
+        if user_id in self.active_connections:
+            if websocket in self.active_connections[user_id]:
+                self.active_connections[user_id].remove(websocket)
+            if not self.active_connections[user_id]:
+                del self.active_connections[user_id]
+
+    def is_connected(self, user_id: int) -> bool:
+        return user_id in self.active_connections
+
+    async def send_personal_message(self, message: dict, user_id: int):
+        if user_id in self.active_connections:
+            # Iterate over a copy of the list to handle disconnections safely during iteration
+            for connection in self.active_connections[user_id][:]:
+                try:
+                    await connection.send_text(json.dumps(message))
+                except RuntimeError:
+                    # Connection might be closed already
+                    pass
+
+    def push_threadsafe(self, message: dict, user_id: int):
+        """Schedule a frame from any thread; a no-op when the user has no open socket."""
+        loop = self.loop
+        if loop is None or loop.is_closed() or not self.is_connected(user_id):
+            return
+        loop.call_soon_threadsafe(lambda: loop.create_task(self.send_personal_message(message, user_id)))
+
+
+manager = ConnectionManager()
+
+
+def notification_frame(notification: models.Notification) -> dict:
+    return {
+        "type": "notification",
+        "notification": schemas.Notification.model_validate(notification).model_dump(mode="json"),
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_notifications(session: Session, flush_context):
+    # New rows, and coalesced rows whose counter was bumped (see upsert_message_notification)
+    changed = [obj for obj in (*session.new, *session.dirty) if isinstance(obj, models.Notification)]
+    # Only serialize for recipients that are online; everyone else catches up via /delta
+    frames = [(n.user_id, notification_frame(n)) for n in changed if manager.is_connected(n.user_id)]
+    if frames:
+        session.info.setdefault(_PENDING_KEY, []).extend(frames)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_notifications(session: Session):
+    for user_id, frame in session.info.pop(_PENDING_KEY, []):
+        manager.push_threadsafe(frame, user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_notifications(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,148 @@
+"""
+Provider working hours.
+
+Vendors publish a weekly schedule per ServiceProvider (PROVIDER_SCHEDULE) plus
+per-date exceptions such as holidays (PROVIDER_SCHEDULE_EXCEPTION). Those are
+materialized into TIME_SLOT rows, one per working block per day, for a rolling
+horizon of APPOINTMENT_SLOT_HORIZON_DAYS. Availability then only needs an
+indexed range scan on (PROVIDER_ID, START_TIME) instead of expanding rules.
+
+Slots are written with executemany bulk inserts. extend_slot_horizons()
+(extend_time_slots.py, run daily) only generates the days past each provider's
+SLOTS_GENERATED_UNTIL, so it never rewrites existing rows.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.availability import to_utc_naive
+from app.core.config import settings
+from app.models import models
+
+INSERT_BATCH_SIZE = 1000
+
+
+def store_today() -> date:
+    return datetime.now(ZoneInfo(settings.APPOINTMENT_TIMEZONE)).date()
+
+
+def local_day_start(day: date) -> datetime:
+    """Midnight of `day` in APPOINTMENT_TIMEZONE, as naive UTC."""
+    return to_utc_naive(datetime.combine(day, time(0), tzinfo=ZoneInfo(settings.APPOINTMENT_TIMEZONE)))
+
+
+def day_blocks(
+    day: date,
+    weekly: Dict[int, List[Tuple[time, time]]],
+    exceptions: Dict[date, models.ProviderScheduleException],
+) -> List[Tuple[time, time]]:
+    """Working blocks for one date: the exception's hours if there is one, else the weekday's."""
+    exception = exceptions.get(day)
+    if exception is not None:
+        if exception.start_time is None:
+            return []
+        return [(exception.start_time, exception.end_time)]
+    return weekly.get(day.weekday(), [])
+
+
+def slot_rows(
+    provider_id: int,
+    weekly: Dict[int, List[Tuple[time, time]]],
+    exceptions: Dict[date, models.ProviderScheduleException],
+    date_from: date,
+    date_to: date,
+) -> List[dict]:
+    zone = ZoneInfo(settings.APPOINTMENT_TIMEZONE)
+    rows = []
+    day = date_from
+    while day <= date_to:
+        for start, end in day_blocks(day, weekly, exceptions):
+            rows.append({
+                "provider_id": provider_id,
+                "service_id": None,
+                "start_time": to_utc_naive(datetime.combine(day, start, tzinfo=zone)),
+                "end_time": to_utc_naive(datetime.combine(day, end, tzinfo=zone)),
+            })
+        day += timedelta(days=1)
+    return rows
+
+
+def materialize_slots(db: Session, provider: models.ServiceProvider, date_from: date, date_to: date) -> int:
+    """Bulk-insert working-hour slots for [date_from, date_to] and advance the provider's horizon."""
+    weekly: Dict[int, List[Tuple[time, time]]] = {}
+    for entry in db.query(models.ProviderSchedule)\
+            .filter(models.ProviderSchedule.provider_id == provider.provider_id)\
+            .order_by(models.ProviderSchedule.weekday, models.ProviderSchedule.start_time):
+        weekly.setdefault(entry.weekday, []).append((entry.start_time, entry.end_time))
+    exceptions = {
+        e.date: e for e in db.query(models.ProviderScheduleException).filter(
+            models.ProviderScheduleException.provider_id == provider.provider_id,
+            models.ProviderScheduleException.date.between(date_from, date_to),
+        )
+    }
+
+    rows = slot_rows(provider.provider_id, weekly, exceptions, date_from, date_to)
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(models.TimeSlot), rows[start:start + INSERT_BATCH_SIZE])
+    provider.slots_generated_until = date_to
+    return len(rows)
+
+
+def clear_published_slots(db: Session, provider_id: int, date_from: date) -> int:
+    """Delete working-hour slots from date_from on; booked slots (with a service) are untouched."""
+    return db.query(models.TimeSlot)\
+        .filter(
+            models.TimeSlot.provider_id == provider_id,
+            models.TimeSlot.service_id.is_(None),
+            models.TimeSlot.start_time >= local_day_start(date_from),
+        )\
+        .delete(synchronize_session=False)
+
+
+def replace_schedule(
+    db: Session,
+    provider: models.ServiceProvider,
+    weekly: Iterable,
+    exceptions: Iterable,
+    horizon_days: Optional[int] = None,
+) -> int:
+    """
+    Replace a provider's schedule and regenerate its slots from today through the horizon.
+    The caller commits. Returns the number of slots created.
+    """
+    horizon_days = horizon_days or settings.APPOINTMENT_SLOT_HORIZON_DAYS
+    pid = provider.provider_id
+    db.query(models.ProviderSchedule).filter(models.ProviderSchedule.provider_id == pid).delete(synchronize_session=False)
+    db.query(models.ProviderScheduleException).filter(models.ProviderScheduleException.provider_id == pid).delete(synchronize_session=False)
+    db.add_all(
+        models.ProviderSchedule(provider_id=pid, weekday=w.weekday, start_time=w.start_time, end_time=w.end_time)
+        for w in weekly
+    )
+    db.add_all(
+        models.ProviderScheduleException(provider_id=pid, date=e.date, start_time=e.start_time, end_time=e.end_time, reason=e.reason)
+        for e in exceptions
+    )
+    db.flush()
+
+    today = store_today()
+    clear_published_slots(db, pid, today)
+    return materialize_slots(db, provider, today, today + timedelta(days=horizon_days - 1))
+
+
+def extend_slot_horizons(db: Session, horizon_days: Optional[int] = None) -> Dict[int, int]:
+    """Generate the missing days for every provider with a published schedule, one commit per provider."""
+    horizon_days = horizon_days or settings.APPOINTMENT_SLOT_HORIZON_DAYS
+    today = store_today()
+    target = today + timedelta(days=horizon_days - 1)
+    created = {}
+    providers = db.query(models.ServiceProvider)\
+        .filter(models.ServiceProvider.slots_generated_until.isnot(None), models.ServiceProvider.slots_generated_until < target)\
+        .all()
+    for provider in providers:
+        date_from = max(provider.slots_generated_until + timedelta(days=1), today)
+        created[provider.provider_id] = materialize_slots(db, provider, date_from, target)
+        db.commit()
+    return created
@@ -3,6 +3,7 @@ from typing import Any, Union
 from jose import jwt
 import bcrypt
 from app.core.config import settings
+from app.core.metrics import time_password_hash
 
 # 2. JWT Configuration
 # HS256 is the standard algorithm for signing tokens
@@ -17,7 +18,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         plain_password = plain_password.encode('utf-8')
     if isinstance(hashed_password, str):
         hashed_password = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(plain_password, hashed_password)
+    with time_password_hash("verify"):
+        return bcrypt.checkpw(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
@@ -26,7 +28,8 @@ def get_password_hash(password: str) -> str:
     """
     if isinstance(password, str):
         password = password.encode('utf-8')
-    return bcrypt.hashpw(password, bcrypt.gensalt()).decode('utf-8')
+    with time_password_hash("hash"):
+        return bcrypt.hashpw(password, bcrypt.gensalt()).decode('utf-8')
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
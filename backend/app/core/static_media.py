@@ -0,0 +1,132 @@
+"""
+Static file serving for /uploads.
+
+Extends Starlette's StaticFiles (which already handles Range / If-Range and
+hands files to servers supporting the ASGI pathsend extension for zero-copy
+transmission) with:
+
+- long-lived immutable caching and content-hash ETags for content-addressed
+  blobs under media/, so browsers never revalidate them;
+- precompressed sidecars (<file>.br / <file>.gz) picked by Accept-Encoding;
+- larger read chunks for big audio/video attachments on servers without pathsend.
+"""
+import gzip
+import os
+import shutil
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.config import settings
+from app.core.media_store import MEDIA_SUBDIR
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Sidecar encodings in order of preference
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+COMPRESSIBLE_TYPES = ("text/", "image/svg+xml", "application/json", "application/javascript", "application/xml")
+
+
+class MediaFileResponse(FileResponse):
+    chunk_size = 256 * 1024
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def write_gzip_sidecar(path: Path):
+    """Write <path>.gz next to a compressible file (atomically)."""
+    target = path.with_name(path.name + ".gz")
+    if target.exists():
+        return
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.part")
+    with path.open("rb") as src, gzip.open(tmp, "wb", compresslevel=9) as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(tmp, target)
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class MediaFiles(StaticFiles):
+    async def check_config(self) -> None:
+        # Mounted with check_dir=False so importing the app never touches the disk
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+        await super().check_config()
+
+    def _is_content_addressed(self, full_path: Path) -> bool:
+        try:
+            relative = full_path.relative_to(Path(self.directory).resolve())
+        except ValueError:
+            return False
+        return relative.parts[:1] == (MEDIA_SUBDIR,)
+
+    def _precompressed(self, full_path: Path, request_headers: Headers) -> Tuple[Optional[Path], Optional[str], bool]:
+        """Return (sidecar path, encoding, any sidecar exists) for this request."""
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        has_sidecar = False
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            sidecar = full_path.with_name(full_path.name + suffix)
+            if sidecar.is_file():
+                has_sidecar = True
+                # Ranges address the identity representation, so never combine them
+                if encoding in accepted and "range" not in request_headers:
+                    return sidecar, encoding, True
+        return None, None, has_sidecar
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = Path(full_path)
+        headers = {}
+
+        if self._is_content_addressed(full_path):
+            # The name is the content hash, so it is also a strong validator
+            headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+            headers["ETag"] = f'"{full_path.name}"'
+        else:
+            headers["Cache-Control"] = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+        serve_path = full_path
+        sidecar, encoding, has_sidecar = self._precompressed(full_path, request_headers)
+        if has_sidecar:
+            headers["Vary"] = "Accept-Encoding"
+        if sidecar is not None:
+            serve_path = sidecar
+            stat_result = sidecar.stat()
+            headers["Content-Encoding"] = encoding
+            if "ETag" in headers:
+                headers["ETag"] = f'"{full_path.name}-{encoding}"'
+
+        response = MediaFileResponse(
+            serve_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=guess_type(full_path.name)[0] or "application/octet-stream",
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
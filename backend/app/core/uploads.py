@@ -0,0 +1,210 @@
+"""
+Upload pipeline shared by every endpoint that accepts files.
+
+Starlette's multipart parser spools a whole request body before an endpoint
+runs, so UploadLimitMiddleware rejects multipart requests larger than the
+biggest per-type limit (plus form overhead) with 413 first: from Content-Length
+when the client sends one, otherwise by counting bytes as they are received.
+The endpoint then checks each file against its own type's limit (from the
+parsed size and again while copying), hashes it in bounded chunks, and writes
+it to a temporary file in the target directory that is atomically renamed into
+place once complete. Nothing is ever left half-written under its final name.
+
+Completed files are named after their content hash (see app.core.media_store),
+so identical uploads share one file on disk. Images are then handed to
+app.core.image_variants for thumbnail generation.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.image_variants import schedule_variants
+from app.core.media_store import blob_relative_path, media_root
+from app.core.metrics import observe_upload
+from app.core.static_media import is_compressible, write_gzip_sidecar
+
+CHUNK_SIZE = 256 * 1024
+# Boundaries, part headers and the small text fields sent alongside a file
+MULTIPART_OVERHEAD = 64 * 1024
+_SAFE_EXTENSION = re.compile(r"^[A-Za-z0-9]{1,10}$")
+
+
+@dataclass
+class StoredUpload:
+    file_name: str
+    path: Path
+    url: str  # Relative to the server root, e.g. /uploads/media/ab/cd/<sha256>.jpg
+    size: int
+    sha256: str
+    content_type: Optional[str]
+    kind: str = "file"  # image, audio, video or file
+    deduplicated: bool = False  # True if identical content was already stored
+
+
+def upload_kind(content_type: Optional[str], filename: Optional[str]) -> str:
+    """Classify an upload as image, audio, video or file for size limiting."""
+    if not content_type or content_type == "application/octet-stream":
+        content_type = mimetypes.guess_type(filename or "")[0] or ""
+    major = content_type.split("/", 1)[0]
+    return major if major in ("image", "audio", "video") else "file"
+
+
+def max_upload_bytes(kind: str) -> int:
+    limits_mb = {
+        "image": settings.MAX_IMAGE_UPLOAD_MB,
+        "audio": settings.MAX_AUDIO_UPLOAD_MB,
+        "video": settings.MAX_VIDEO_UPLOAD_MB,
+    }
+    return limits_mb.get(kind, settings.MAX_FILE_UPLOAD_MB) * 1024 * 1024
+
+
+def max_request_bytes() -> int:
+    """Largest multipart body accepted: the biggest per-type limit plus form overhead."""
+    return max(max_upload_bytes(kind) for kind in ("image", "audio", "video", "file")) + MULTIPART_OVERHEAD
+
+
+def file_extension(filename: Optional[str], default: str) -> str:
+    ext = filename.rsplit(".", 1)[-1] if filename and "." in filename else ""
+    return ext.lower() if _SAFE_EXTENSION.match(ext) else default
+
+
+class _StagedUpload:
+    """Temp file + running hash + size guard for a single upload."""
+
+    def __init__(self, file: UploadFile, default_extension: str):
+        self.kind = upload_kind(file.content_type, file.filename)
+        self.limit = max_upload_bytes(self.kind)
+        if file.size is not None and file.size > self.limit:
+            raise self.too_large()
+
+        self.root = media_root()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.extension = file_extension(file.filename, default_extension)
+        self.content_type = file.content_type
+        self.tmp_path = self.root / f".upload-{uuid.uuid4()}.part"
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.handle: BinaryIO = self.tmp_path.open("wb")
+
+    def too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {self.limit // (1024 * 1024)} MB limit for {self.kind} uploads",
+        )
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.limit:
+            raise self.too_large()
+        self.hasher.update(chunk)
+        self.handle.write(chunk)
+
+    def commit(self) -> StoredUpload:
+        self.handle.close()
+        sha256 = self.hasher.hexdigest()
+        relative_path = blob_relative_path(sha256, self.extension)
+        final_path = Path(settings.effective_upload_dir) / relative_path
+
+        deduplicated = final_path.exists()
+        if deduplicated:
+            # Same content already stored: drop the copy and refresh the blob's
+            # mtime so garbage collection treats it as freshly uploaded
+            self.tmp_path.unlink(missing_ok=True)
+            os.utime(final_path)
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.tmp_path, final_path)
+            if settings.MEDIA_PRECOMPRESS and is_compressible(self.content_type):
+                write_gzip_sidecar(final_path)
+        observe_upload(self.kind, self.size, deduplicated)
+
+        return StoredUpload(
+            file_name=final_path.name,
+            path=final_path,
+            url=f"/uploads/{relative_path}",
+            size=self.size,
+            sha256=sha256,
+            content_type=self.content_type,
+            kind=self.kind,
+            deduplicated=deduplicated,
+        )
+
+    def abort(self):
+        self.handle.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+async def save_upload(file: UploadFile, default_extension: str = "bin") -> StoredUpload:
+    """Stream an upload to disk from an async endpoint without blocking the event loop."""
+    staged = await run_in_threadpool(_StagedUpload, file, default_extension)
+    try:
+        while chunk := await file.read(CHUNK_SIZE):
+            await run_in_threadpool(staged.write, chunk)
+        stored = await run_in_threadpool(staged.commit)
+    except BaseException:
+        await run_in_threadpool(staged.abort)
+        raise
+    schedule_variants(stored)
+    return stored
+
+
+def save_upload_sync(file: UploadFile, default_extension: str = "bin") -> StoredUpload:
+    """Same as save_upload, for sync endpoints that already run in the threadpool."""
+    staged = _StagedUpload(file, default_extension)
+    try:
+        while chunk := file.file.read(CHUNK_SIZE):
+            staged.write(chunk)
+        stored = staged.commit()
+    except BaseException:
+        staged.abort()
+        raise
+    schedule_variants(stored)
+    return stored
+
+
+class UploadLimitMiddleware:
+    """Pure ASGI: 413 for multipart bodies over max_request_bytes(), before the form parser spools them."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = max_request_bytes()
+        detail = f"Request body exceeds the {limit // (1024 * 1024)} MB upload limit"
+        length = headers.get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        # No (or an understated) Content-Length: stop reading once the limit is passed
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,98 @@
+"""
+AsyncSession dependency for the hottest read routes.
+
+Sync handlers run in Starlette's threadpool (40 threads by default), so while
+MySQL is slow at most 40 requests are in flight per worker. Routes that use
+get_async_db instead await the driver on the event loop and are only bounded
+by the pool (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+
+The async engine points at the same database as app.db.session, with the
+driver swapped for its asyncio counterpart (mysql -> aiomysql, sqlite ->
+aiosqlite) unless ASYNC_DATABASE_URL is set. It is created on first use, so
+scripts that only need the sync engine never import the async drivers.
+
+Async sessions cannot lazy-load: routes must eager-load every relationship
+their response model reads (selectinload / joinedload).
+"""
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.pool_metrics import InstrumentedAsyncAdaptedQueuePool, PoolMetrics
+from app.db.session import instrument_engine, pool_options, pre_ping_strategy, uses_queue_pool
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+async_pool_metrics = PoolMetrics(
+    slow_checkout_seconds=settings.DB_POOL_SLOW_CHECKOUT_MS / 1000 if settings.DB_POOL_SLOW_CHECKOUT_MS else None
+)
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+
+
+def async_database_url(database_url: str):
+    """The asyncio-driver form of a sync SQLAlchemy URL."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'; set ASYNC_DATABASE_URL")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_async_db_engine(database_url: Optional[str] = None, metrics: Optional[PoolMetrics] = None) -> AsyncEngine:
+    """Build the async engine; `database_url` overrides ASYNC_DATABASE_URL / DATABASE_URL."""
+    if database_url:
+        url = make_url(database_url)
+    elif settings.ASYNC_DATABASE_URL:
+        url = make_url(settings.ASYNC_DATABASE_URL)
+    else:
+        url = async_database_url(settings.DATABASE_URL)
+    strategy = pre_ping_strategy()
+
+    if not uses_queue_pool(url):
+        return create_async_engine(url)
+
+    engine = create_async_engine(url, poolclass=InstrumentedAsyncAdaptedQueuePool, **pool_options(strategy))
+    instrument_engine(engine.sync_engine, strategy, metrics or async_pool_metrics)
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        _engine = create_async_db_engine()
+    return _engine
+
+
+def async_session_factory() -> async_sessionmaker:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _session_factory
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with async_session_factory()() as db:
+        yield db
+
+
+def async_pool_status() -> Optional[dict]:
+    """Pool figures for the async engine, or None before its first use."""
+    if _engine is None:
+        return None
+    return async_pool_metrics.snapshot(_engine.pool)
+
+
+async def dispose_async_engine():
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
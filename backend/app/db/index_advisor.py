@@ -0,0 +1,192 @@
+"""
+Index advisor.
+
+QueryCapture records every distinct SELECT / UPDATE / DELETE an engine runs
+(index_advisor.py attaches it to all engines while the test suite runs, which
+exercises every route). advise() then replays each statement through the
+planner of a database built from the current models and reports the tables
+it reads with a full scan:
+
+    SQLite  EXPLAIN QUERY PLAN   "SCAN <table>" (no index used for the predicate)
+    MySQL   EXPLAIN              access type ALL
+
+For each scan the advisor suggests a composite index from the statement
+itself: the scanned table's equality columns (=, IN, IS) first,
+then one range or ORDER BY column, which is the column order a B-tree can use
+for all of them. Suggestions are heuristics to review, not DDL to apply
+blindly; accepted ones are declared on the model (__table_args__) and added
+to existing databases by a migration.
+"""
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+MAX_INDEX_COLUMNS = 3
+
+_ADVISED = ("SELECT", "UPDATE", "DELETE", "WITH")
+_NAME = r'[`"]?(\w+)[`"]?'
+# The alias is matched in a lookahead so "FROM a JOIN b" still sees the JOIN
+_ALIAS_RE = re.compile(rf"(?:FROM|JOIN|UPDATE)\s+{_NAME}(?=(?:(?:\s+AS)?\s+{_NAME})?)", re.IGNORECASE)
+_COMPARISON_RE = re.compile(
+    rf"{_NAME}\.{_NAME}\s*(=|!=|<>|>=|<=|>|<|\bIN\b|\bIS\b|\bBETWEEN\b|\bLIKE\b)", re.IGNORECASE
+)
+_REVERSED_EQ_RE = re.compile(rf"=\s*{_NAME}\.{_NAME}", re.IGNORECASE)
+_ORDER_BY_RE = re.compile(r"\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|\bFOR UPDATE\b|\)|$)", re.IGNORECASE | re.DOTALL)
+_COLUMN_RE = re.compile(rf"{_NAME}\.{_NAME}")
+# A scan without "USING ... INDEX" reads every row of the table
+_SQLITE_SCAN_RE = re.compile(r"^SCAN (\w+)$")
+_KEYWORDS = {"AS", "ON", "WHERE", "LEFT", "RIGHT", "INNER", "OUTER", "JOIN", "GROUP", "ORDER", "LIMIT", "SET", "CROSS"}
+
+
+@dataclass
+class CapturedQuery:
+    statement: str
+    parameters: object
+    count: int = 0
+
+
+class QueryCapture:
+    """Distinct statements (with one set of parameters each) seen on the engines it is attached to."""
+
+    def __init__(self):
+        self.queries: Dict[str, CapturedQuery] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(_ADVISED):
+            return
+        with self._lock:
+            captured = self.queries.get(statement)
+            if captured is None:
+                captured = self.queries[statement] = CapturedQuery(statement, parameters)
+            captured.count += 1
+
+    def attach(self, target=Engine):
+        """Listen on one engine, or on every engine (the default) including async ones."""
+        event.listen(target, "before_cursor_execute", self._record)
+
+    def detach(self, target=Engine):
+        event.remove(target, "before_cursor_execute", self._record)
+
+
+@dataclass
+class Finding:
+    table: str
+    detail: str
+    statement: str
+    count: int
+    columns: Tuple[str, ...] = field(default_factory=tuple)
+
+
+def table_aliases(statement: str) -> Dict[str, str]:
+    """alias -> table for every FROM/JOIN/UPDATE target (tables map to themselves)."""
+    aliases = {}
+    for table, alias in _ALIAS_RE.findall(statement):
+        aliases[table] = table
+        if alias and alias.upper() not in _KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def suggest_columns(statement: str, alias: str) -> Tuple[str, ...]:
+    """WHERE equality columns of `alias`, then its first range / ORDER BY column (join keys as a fallback)."""
+    where = re.split(r"\bWHERE\b", statement, maxsplit=1, flags=re.IGNORECASE)
+    predicates = statement if len(where) == 1 else where[1]
+    joins = " ".join(re.findall(r"\bON\b(.*?)(?=\bJOIN\b|\bWHERE\b|$)", where[0], re.IGNORECASE | re.DOTALL))
+
+    equality, ranged = [], []
+    for name, column, operator in _COMPARISON_RE.findall(predicates):
+        if name != alias or operator.upper() == "LIKE":
+            continue  # LIKE patterns cannot seek a B-tree in general
+        (equality if operator.upper() in ("=", "IN", "IS") else ranged).append(column)
+    equality += [column for name, column in _REVERSED_EQ_RE.findall(predicates) if name == alias]
+    if not equality and not ranged:
+        # Only a join condition: index the join key so the table can be the inner side of the join
+        equality = [column for name, column, operator in _COMPARISON_RE.findall(joins) if name == alias and operator == "="]
+        equality += [column for name, column in _REVERSED_EQ_RE.findall(joins) if name == alias]
+
+    order = _ORDER_BY_RE.search(predicates)
+    if order:
+        ranged.extend(column for name, column in _COLUMN_RE.findall(order.group(1)) if name == alias)
+
+    columns = list(dict.fromkeys(equality))
+    for column in ranged:
+        if column not in columns:
+            columns.append(column)
+            break
+    return tuple(columns[:MAX_INDEX_COLUMNS])
+
+
+def _explain_sqlite(conn, statement: str, parameters) -> List[Tuple[str, str]]:
+    """(alias, plan detail) for each full scan in the plan."""
+    scans = []
+    for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+        match = _SQLITE_SCAN_RE.match(row[-1].strip())
+        if match:
+            scans.append((match.group(1), row[-1]))
+    return scans
+
+
+def _explain_mysql(conn, statement: str, parameters) -> List[Tuple[str, str]]:
+    scans = []
+    for row in conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings():
+        if row["type"] == "ALL" and row["table"] and not row["table"].startswith("<"):
+            scans.append((row["table"], f"{row['type']} on {row['table']} (~{row['rows']} rows)"))
+    return scans
+
+
+def advise(queries: Sequence[CapturedQuery], engine: Engine) -> List[Finding]:
+    """Full scans for the captured queries on `engine`, most frequent first."""
+    explain = _explain_mysql if engine.dialect.name == "mysql" else _explain_sqlite
+    tables = set(inspect(engine).get_table_names())
+    findings = []
+    with engine.connect() as conn:
+        for query in queries:
+            try:
+                scans = explain(conn, query.statement, query.parameters)
+            except DBAPIError:
+                continue  # Dialect-specific SQL or a table the models do not declare
+            aliases = table_aliases(query.statement)
+            for alias, detail in scans:
+                table = aliases.get(alias)
+                if table not in tables:
+                    continue  # Subquery, CTE or catalog table
+                findings.append(Finding(table, detail, query.statement, query.count, suggest_columns(query.statement, alias)))
+    return sorted(findings, key=lambda f: -f.count)
+
+
+def recommendations(findings: Sequence[Finding]) -> List[Tuple[str, Tuple[str, ...], int]]:
+    """(table, columns, statements executed that would use it), most used first."""
+    usage = Counter()
+    for finding in findings:
+        if finding.columns:
+            usage[(finding.table, finding.columns)] += finding.count
+    # A suggestion that is a prefix of another is served by the longer index
+    merged = Counter()
+    for (table, columns), count in usage.items():
+        wider = [c for t, c in usage if t == table and len(c) > len(columns) and c[:len(columns)] == columns]
+        merged[(table, max(wider, key=len) if wider else columns)] += count
+    return [(table, columns, count) for (table, columns), count in merged.most_common()]
+
+
+def format_report(findings: Sequence[Finding], limit: Optional[int] = None) -> str:
+    lines = [f"{len(findings)} full scans in {len({f.statement for f in findings})} distinct statements", ""]
+    lines.append("Recommended indexes:")
+    recommended = recommendations(findings)
+    for table, columns, count in recommended:
+        lines.append(f"  {table} ({', '.join(columns)})  -- {count} executions")
+    if not recommended:
+        lines.append("  none")
+
+    lines += ["", "Scans:"]
+    for finding in findings[:limit]:
+        statement = " ".join(finding.statement.split())
+        lines.append(f"  [{finding.count}x] {finding.detail}")
+        lines.append(f"      {statement[:200]}{'...' if len(statement) > 200 else ''}")
+    return "\n".join(lines)
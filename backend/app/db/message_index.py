@@ -0,0 +1,173 @@
+"""
+Full-text index over MESSAGE.content.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers, MySQL uses a
+native FULLTEXT index. Both are maintained incrementally by the database itself,
+so inserting a message is all that is needed to make it searchable.
+"""
+import html
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, event, func, literal_column, table, text
+from sqlalchemy.orm import Session
+
+from app.models import models
+
+FTS_TABLE = "MESSAGE_FTS"
+MYSQL_FULLTEXT_INDEX = "ix_message_content_ft"
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_WORDS = 12
+# snippet() is told to emit these control characters around matches; the text
+# is HTML-escaped first and only then are they swapped for the real markers.
+_RAW_START = "\x02"
+_RAW_END = "\x03"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(content, content='MESSAGE', content_rowid='id')",
+    f"""CREATE TRIGGER IF NOT EXISTS message_fts_ai AFTER INSERT ON MESSAGE BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS message_fts_ad AFTER DELETE ON MESSAGE BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS message_fts_au AFTER UPDATE OF content ON MESSAGE BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+
+def tokenize(query: str) -> List[str]:
+    """Split a user query into search terms, dropping operators and punctuation."""
+    return _TOKEN_RE.findall(query or "")
+
+
+def create_message_index(connection, rebuild: bool = False):
+    """Create the full-text index for the connection's dialect (idempotent)."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if rebuild:
+            connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    elif dialect == "mysql":
+        exists = connection.execute(
+            text("SHOW INDEX FROM MESSAGE WHERE Key_name = :name"),
+            {"name": MYSQL_FULLTEXT_INDEX}
+        ).fetchone()
+        if not exists:
+            connection.execute(text(f"CREATE FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} ON MESSAGE (content)"))
+
+
+def drop_message_index(connection):
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+# Keep the index in step with the MESSAGE table whenever metadata is created or dropped
+event.listen(models.Message.__table__, "after_create", lambda target, connection, **kw: create_message_index(connection))
+event.listen(models.Message.__table__, "before_drop", lambda target, connection, **kw: drop_message_index(connection))
+
+
+def _render_snippet(raw: Optional[str]) -> str:
+    """HTML-escape an FTS snippet, then turn its raw match delimiters into highlight markers."""
+    escaped = html.escape(raw or "")
+    return escaped.replace(_RAW_START, HIGHLIGHT_START).replace(_RAW_END, HIGHLIGHT_END)
+
+
+def highlight(content: str, terms: List[str]) -> str:
+    """
+    Build a short snippet around the first matching term, wrapping matches in highlight markers.
+
+    The message text is HTML-escaped, so the only markup in the result is the markers.
+    """
+    if not content:
+        return ""
+    words = content.split()
+    lowered = [t.lower() for t in terms]
+
+    def is_match(word: str) -> bool:
+        return any(tok.lower().startswith(term) for tok in _TOKEN_RE.findall(word) for term in lowered)
+
+    first = next((i for i, word in enumerate(words) if is_match(word)), 0)
+    start = max(0, first - SNIPPET_WORDS // 2)
+    window = words[start:start + SNIPPET_WORDS]
+    snippet = " ".join(
+        f"{HIGHLIGHT_START}{html.escape(w)}{HIGHLIGHT_END}" if is_match(w) else html.escape(w) for w in window
+    )
+    if start > 0:
+        snippet = "…" + snippet
+    if start + SNIPPET_WORDS < len(words):
+        snippet += "…"
+    return snippet
+
+
+def search_messages(
+    db: Session,
+    user_id: int,
+    query: str,
+    partner_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Tuple[models.Message, str]]:
+    """
+    Search the messages a user sent or received.
+
+    Every term must match (prefix match on each term). Returns up to `limit`
+    (message, snippet) pairs, best matches first on SQLite and MySQL.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    Message = models.Message
+
+    filters = [(Message.sender_id == user_id) | (Message.receiver_id == user_id)]
+    if partner_id is not None:
+        filters.append((Message.sender_id == partner_id) | (Message.receiver_id == partner_id))
+    if since is not None:
+        filters.append(Message.timestamp >= since)
+    if until is not None:
+        filters.append(Message.timestamp <= until)
+
+    if dialect == "sqlite":
+        fts = table(FTS_TABLE, column("rowid"), column("rank"))
+        match = " ".join('"{}"*'.format(term) for term in terms)
+        snippet = func.snippet(literal_column(FTS_TABLE), 0, _RAW_START, _RAW_END, "…", SNIPPET_WORDS)
+        rows = db.query(Message, snippet)\
+            .join(fts, fts.c.rowid == Message.id)\
+            .filter(literal_column(FTS_TABLE).op("MATCH")(match), *filters)\
+            .order_by(fts.c.rank, Message.id.desc())\
+            .offset(offset)\
+            .limit(limit)\
+            .all()
+        return [(message, _render_snippet(snip)) for message, snip in rows]
+
+    if dialect == "mysql":
+        against = " ".join("+{}*".format(term) for term in terms)
+        relevance = "MATCH (MESSAGE.content) AGAINST (:against IN BOOLEAN MODE)"
+        messages = db.query(Message)\
+            .filter(text(relevance), *filters)\
+            .params(against=against)\
+            .order_by(text(f"{relevance} DESC"), Message.id.desc())\
+            .offset(offset)\
+            .limit(limit)\
+            .all()
+    else:
+        # Unindexed fallback for other dialects
+        messages = db.query(Message)\
+            .filter(*filters, *[Message.content.ilike(f"%{term}%") for term in terms])\
+            .order_by(Message.timestamp.desc())\
+            .offset(offset)\
+            .limit(limit)\
+            .all()
+
+    return [(message, highlight(message.content, terms)) for message in messages]
@@ -2,10 +2,9 @@ from datetime import datetime, date
 from app.schemas.schemas import (
     Vendor, Customer, Order, Product, Store, Appointment, OrderItem
 )
-from app.core.security import get_password_hash
 
-# Mock Users DB
-hashed_password = get_password_hash("password")
+# Mock Users DB (bcrypt hash of "password", precomputed so importing this module stays cheap)
+hashed_password = "$2b$12$Xgacnot7gjM.UQx9gkStpOfBS7ns29Lhx6kOiAB0rHPbJ1EfMmXjG"
 fake_users_db = {
     "admin": {"username": "admin", "password": hashed_password, "role": "admin", "user_id": 1},
     "customer": {"username": "customer", "password": hashed_password, "role": "customer", "user_id": 1},
@@ -0,0 +1,114 @@
+"""
+Connection pool instrumentation.
+
+InstrumentedQueuePool (and its asyncio counterpart) times every checkout
+(waiting for a free connection, plus opening one when the pool grows) and
+counts checkout timeouts. Live occupancy is read from the pool itself, so snapshot() reports both how long
+requests wait for a connection and how close the pool is to its limit:
+
+    saturation = checked_out / (pool_size + max_overflow)
+
+A pool that keeps hitting saturation 1.0 with growing wait times needs a
+larger DB_POOL_SIZE / DB_MAX_OVERFLOW (or fewer connections held per request).
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the cumulative checkout-wait histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolMetrics:
+    def __init__(self, slow_checkout_seconds: Optional[float] = None):
+        self.slow_checkout_seconds = slow_checkout_seconds
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.peak_checked_out = 0
+            self.wait_buckets = [0] * len(WAIT_BUCKETS)
+
+    def observe_checkout(self, wait: float, checked_out: int):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if wait <= bound:
+                    self.wait_buckets[i] += 1
+        if self.slow_checkout_seconds is not None and wait >= self.slow_checkout_seconds:
+            logger.warning("Waited %.0f ms for a database connection (%d checked out)", wait * 1000, checked_out)
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> Dict:
+        """Counters plus the pool's live occupancy."""
+        capacity = getattr(pool, "capacity", None)
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+        with self._lock:
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "capacity": capacity,
+                "checked_out": checked_out,
+                "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "saturation": round(checked_out / capacity, 4) if capacity else None,
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_buckets": dict(zip(WAIT_BUCKETS, self.wait_buckets)),
+            }
+
+
+class _InstrumentedPool:
+    """Mixin recording checkout wait time and timeouts into a PoolMetrics."""
+
+    def __init__(self, *args, metrics: Optional[PoolMetrics] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    @property
+    def capacity(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+    def recreate(self):
+        # Called on engine.dispose() and after a disconnect invalidates the pool; keep the counters
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
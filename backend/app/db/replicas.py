@@ -0,0 +1,184 @@
+"""
+Read-replica routing.
+
+Routes that only read (catalog, stores, reviews, dashboards) take their
+session from get_read_db / get_async_read_db (app.api.deps) instead of
+get_db. With DATABASE_REPLICA_URLS set, those sessions are bound to a replica
+picked round-robin among the healthy ones; without replicas, or when none is
+healthy, they fall back to the primary session.
+
+Health: a replica is pinged (SELECT 1) at most every
+REPLICA_HEALTH_CHECK_SECONDS when it is picked, and is marked down at once
+when one of its connections is lost; a down replica is retried after the same
+interval.
+
+Read-your-writes: get_current_user records the token subject on the request's
+primary session. When that session commits a write, the subject is pinned to
+the primary for READ_YOUR_WRITES_SECONDS, so the user's next reads cannot hit
+a replica that has not applied the write yet. Pins are per worker process.
+"""
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.async_session import async_database_url, create_async_db_engine
+from app.db.pool_metrics import PoolMetrics
+from app.db.session import create_db_engine
+
+SUBJECT_KEY = "auth_subject"
+_WROTE_KEY = "wrote"
+
+# Sessions on a replica engine; the engine is bound per request
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncReplicaSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+class Replica:
+    def __init__(self, url: str, engine: Engine):
+        self.url = url
+        self.engine = engine
+        self.async_engine: Optional[AsyncEngine] = None
+        self.healthy = True
+        self.checked_at: Optional[float] = None
+
+
+def _ping(engine: Engine) -> bool:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except exc.DBAPIError:
+        return False
+
+
+async def _ping_async(engine: AsyncEngine) -> bool:
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except exc.DBAPIError:
+        return False
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        urls: List[str],
+        check_interval: float,
+        engine_factory: Callable[..., Engine] = create_db_engine,
+    ):
+        self.check_interval = check_interval
+        self.replicas = [Replica(url, engine_factory(url, metrics=PoolMetrics())) for url in urls]
+        self._counter = itertools.count()
+        for replica in self.replicas:
+            self._watch_disconnects(replica, replica.engine)
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    def _watch_disconnects(self, replica: Replica, engine: Engine):
+        @event.listens_for(engine, "handle_error")
+        def _mark_down(context):
+            if context.is_disconnect:
+                replica.healthy = False
+                replica.checked_at = time.monotonic()
+
+    def _due(self, replica: Replica) -> bool:
+        return replica.checked_at is None or time.monotonic() - replica.checked_at >= self.check_interval
+
+    def _rotation(self) -> List[Replica]:
+        start = next(self._counter) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    def choose(self) -> Optional[Replica]:
+        """Next healthy replica in round-robin order, or None."""
+        for replica in self._rotation() if self.replicas else []:
+            if self._due(replica):
+                replica.healthy = _ping(replica.engine)
+                replica.checked_at = time.monotonic()
+            if replica.healthy:
+                return replica
+        return None
+
+    async def choose_async(self) -> Optional[Replica]:
+        for replica in self._rotation() if self.replicas else []:
+            engine = self.async_engine(replica)
+            if self._due(replica):
+                replica.healthy = await _ping_async(engine)
+                replica.checked_at = time.monotonic()
+            if replica.healthy:
+                return replica
+        return None
+
+    def async_engine(self, replica: Replica) -> AsyncEngine:
+        if replica.async_engine is None:
+            url = async_database_url(replica.url).render_as_string(hide_password=False)
+            replica.async_engine = create_async_db_engine(url, metrics=PoolMetrics())
+            self._watch_disconnects(replica, replica.async_engine.sync_engine)
+        return replica.async_engine
+
+    async def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+                replica.async_engine = None
+
+
+class PrimaryPins:
+    """Token subjects that must read from the primary until their pin expires."""
+
+    def __init__(self):
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def pin(self, subject: str, seconds: float):
+        now = time.monotonic()
+        with self._lock:
+            self._until[subject] = now + seconds
+            if len(self._until) > 10000:
+                self._until = {s: t for s, t in self._until.items() if t > now}
+
+    def is_pinned(self, subject: Optional[str]) -> bool:
+        if not subject:
+            return False
+        until = self._until.get(subject)
+        return until is not None and until > time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._until.clear()
+
+
+replica_set = ReplicaSet(settings.DATABASE_REPLICA_URLS_LIST, settings.REPLICA_HEALTH_CHECK_SECONDS)
+primary_pins = PrimaryPins()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flush_write(session: Session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_write(orm_execute_state):
+    # query.update()/delete() and insert() executemany skip the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer(session: Session):
+    if session.info.pop(_WROTE_KEY, False) and session.info.get(SUBJECT_KEY):
+        primary_pins.pin(session.info[SUBJECT_KEY], settings.READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session: Session):
+    session.info.pop(_WROTE_KEY, None)
@@ -1,9 +1,99 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
-
-# 1. Create the engine
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-
-# 2. Create a session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+"""
+The application's single SQLAlchemy engine.
+
+Every module (API routes, background jobs, maintenance scripts) imports
+`engine` / `SessionLocal` from here (or via app.db.database), so a process
+holds exactly one connection pool sized by the DB_POOL_* settings.
+
+Pre-ping strategies (DB_POOL_PRE_PING):
+    always  SELECT 1 round-trip on every checkout (SQLAlchemy pool_pre_ping)
+    idle    ping only connections idle for DB_POOL_PRE_PING_IDLE_SECONDS;
+            recently used connections are handed out directly
+    never   rely on DB_POOL_RECYCLE and SQLAlchemy's disconnect handling
+"""
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+pool_metrics = PoolMetrics(
+    slow_checkout_seconds=settings.DB_POOL_SLOW_CHECKOUT_MS / 1000 if settings.DB_POOL_SLOW_CHECKOUT_MS else None
+)
+
+
+def uses_queue_pool(url) -> bool:
+    # In-memory SQLite is one connection per thread; everything else gets a sized queue pool
+    return not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"))
+
+
+def _ping_idle_connections(engine: Engine, idle_seconds: float):
+    @event.listens_for(engine, "checkin")
+    def _stamp(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception:
+            # The pool discards this connection and retries the checkout with a new one
+            raise exc.DisconnectionError("Idle connection failed pre-ping")
+
+
+def pre_ping_strategy() -> str:
+    strategy = settings.DB_POOL_PRE_PING.lower()
+    if strategy not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}")
+    return strategy
+
+
+def pool_options(strategy: str) -> dict:
+    """create_engine() pool arguments from the DB_POOL_* settings (shared with the async engine)."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": strategy == "always",
+    }
+
+
+def instrument_engine(engine: Engine, strategy: str, metrics: PoolMetrics):
+    engine.pool.metrics = metrics
+    if strategy == "idle":
+        _ping_idle_connections(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+
+
+def create_db_engine(database_url: Optional[str] = None, metrics: Optional[PoolMetrics] = None) -> Engine:
+    """Build an engine from Settings; `database_url` overrides settings.DATABASE_URL."""
+    url = make_url(database_url or settings.DATABASE_URL)
+    strategy = pre_ping_strategy()
+
+    if not uses_queue_pool(url):
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, **pool_options(strategy))
+    instrument_engine(engine, strategy, metrics or pool_metrics)
+    return engine
+
+
+# 1. Create the engine
+engine = create_db_engine()
+
+# 2. Create a session factory
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def pool_status() -> dict:
+    """Checkout wait and saturation figures for the shared pool."""
+    return pool_metrics.snapshot(engine.pool)
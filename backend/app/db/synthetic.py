@@ -0,0 +1,320 @@
+"""
+Synthetic marketplace data for load tests and benchmarks.
+
+generate() bulk-loads stores with their vendor accounts, categories and
+products, service stores with services and providers, customers, orders with
+their items, chat histories and reviews, at volumes set by a Scale (the
+"large" preset is 2,000 stores, 1M products and 10M orders).
+
+Rows are never built as ORM objects: each table is streamed in batches of
+plain dicts through ORM bulk INSERT (session.execute(insert(Model), rows)),
+which runs as one executemany per batch. mysql-connector-python batches an
+INSERT executemany into multi-row INSERT ... VALUES (...), (...) statements
+and SQLite reuses one prepared statement, and no flush, identity map or
+session event is involved.
+Primary keys are assigned here, continuing after the current maximum, so
+child rows can reference their parents without reading anything back and the
+generator can be run again on top of an existing database. On MySQL each
+batch runs with foreign key and unique checks off.
+
+Every generated account logs in with SYNTHETIC_PASSWORD (one bcrypt hash is
+computed and shared). The id ranges and logins are returned as a manifest,
+which benchmark.py reads to pick its users, stores and products.
+"""
+import logging
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models import models
+from app.models.models import UserRole
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_PASSWORD = "synthetic-password"
+EMAIL_DOMAIN = "synthetic.test"
+
+STORE_TYPES = ("Electronics", "Retail", "Fashion", "Food & Beverage", "Books", "Home")
+SERVICE_STORE_TYPE = "Services"
+ORDER_STATUSES = ("Completed", "Completed", "Completed", "Shipped", "Processing", "Cancelled")
+FIRST_NAMES = ("Aigerim", "Daniyar", "Amina", "Timur", "Madina", "Arman", "Dana", "Nurlan", "Saule", "Yerlan")
+LAST_NAMES = ("Abenova", "Bekov", "Sadykova", "Omarov", "Nurpeisova", "Zhakupov", "Iskakova", "Tulegenov")
+ADJECTIVES = ("Classic", "Premium", "Compact", "Organic", "Wireless", "Vintage", "Eco", "Smart", "Deluxe", "Mini")
+NOUNS = ("Lamp", "Mug", "Jacket", "Speaker", "Notebook", "Backpack", "Tea", "Charger", "Scarf", "Bottle")
+SERVICE_NAMES = ("Haircut", "Beard Trim", "Massage", "Alteration", "Consultation", "Coloring")
+CHAT_LINES = (
+    "Hi, is this still available?", "Yes, we have it in stock.", "Can you deliver tomorrow?",
+    "Sure, delivery is free over 5000.", "Great, I just placed the order.", "Thanks! It ships today.",
+)
+
+
+@dataclass(frozen=True)
+class Scale:
+    stores: int
+    products_per_store: int
+    customers: int
+    orders: int
+    conversations: int
+    messages_per_conversation: int
+    service_store_share: float = 0.1  # Stores that take bookings instead of selling products
+    categories_per_store: int = 5
+    services_per_store: int = 4
+    providers_per_store: int = 3
+    reviews_per_store: int = 10
+    max_items_per_order: int = 4
+    days_of_history: int = 365
+
+    @property
+    def products(self) -> int:
+        return self.product_stores * self.products_per_store
+
+    @property
+    def service_stores(self) -> int:
+        return int(self.stores * self.service_store_share)
+
+    @property
+    def product_stores(self) -> int:
+        return self.stores - self.service_stores
+
+
+PRESETS: Dict[str, Scale] = {
+    "tiny": Scale(stores=10, products_per_store=20, customers=50, orders=300, conversations=20, messages_per_conversation=5),
+    "small": Scale(stores=100, products_per_store=100, customers=5_000, orders=50_000, conversations=2_000, messages_per_conversation=20),
+    "medium": Scale(stores=500, products_per_store=400, customers=50_000, orders=1_000_000, conversations=20_000, messages_per_conversation=30),
+    "large": Scale(stores=2_000, products_per_store=556, customers=500_000, orders=10_000_000, conversations=200_000, messages_per_conversation=40),
+}
+
+
+def product_price(product_id: int) -> float:
+    """Deterministic price, so order totals need no lookup of 1M prices."""
+    return round(1 + (product_id * 7919 % 49_900) / 100, 2)
+
+
+def email(user_id: int) -> str:
+    return f"user{user_id}@{EMAIL_DOMAIN}"
+
+
+class BulkLoader:
+    """Streams rows into tables in batches, one transaction per batch."""
+
+    def __init__(self, engine: Engine, batch_size: int = 5000):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.counts: Dict[str, int] = {}
+
+    def next_id(self, column) -> int:
+        with Session(self.engine) as session:
+            return (session.execute(select(func.max(column))).scalar() or 0) + 1
+
+    def _write(self, batch: Dict[type, List[dict]]):
+        mysql = self.engine.dialect.name == "mysql"
+        with Session(self.engine) as session:
+            if mysql:
+                session.execute(text("SET SESSION foreign_key_checks = 0, unique_checks = 0"))
+            try:
+                for model, rows in batch.items():
+                    if rows:
+                        session.execute(insert(model), rows)
+                        self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+                session.commit()
+            finally:
+                # The connection goes back to the pool: never leave the checks off on it
+                if mysql:
+                    session.rollback()
+                    session.execute(text("SET SESSION foreign_key_checks = 1, unique_checks = 1"))
+
+    def load(self, model: type, rows: Iterable[dict], total: int = 0):
+        self.load_with_children(model, ((row, {}) for row in rows), total)
+
+    def load_with_children(self, model: type, rows: Iterable[Tuple[dict, Dict[type, List[dict]]]], total: int = 0):
+        """Rows paired with {child model: child rows}; each batch writes the parents first."""
+        loaded = 0
+        batch: Dict[type, List[dict]] = {model: []}
+        for row, children in rows:
+            batch[model].append(row)
+            for child_model, child_rows in children.items():
+                batch.setdefault(child_model, []).extend(child_rows)
+            if len(batch[model]) >= self.batch_size:
+                loaded += len(batch[model])
+                self._write(batch)
+                batch = {model: []}
+                logger.info("%s: %d/%s rows", model.__tablename__, loaded, total or "?")
+        self._write(batch)
+
+
+def _id_range(first: int, count: int) -> List[int]:
+    """[first, last] of a block of ids (empty block: last = first - 1)."""
+    return [first, first + count - 1]
+
+
+def generate(engine: Engine, scale: Scale, seed: int = 0, batch_size: int = 5000) -> dict:
+    """Load a synthetic marketplace of `scale` into `engine`; returns the manifest."""
+    rng = random.Random(seed)
+    loader = BulkLoader(engine, batch_size)
+    password_hash = get_password_hash(SYNTHETIC_PASSWORD)
+    now = datetime.now().replace(microsecond=0)
+    history_start = now - timedelta(days=scale.days_of_history)
+
+    first = {
+        "store": loader.next_id(models.Store.store_id),
+        "user": loader.next_id(models.User.id),
+        "vendor": loader.next_id(models.Vendor.vendor_id),
+        "category": loader.next_id(models.Category.category_id),
+        "product": loader.next_id(models.Product.product_id),
+        "service": loader.next_id(models.Service.service_id),
+        "provider": loader.next_id(models.ServiceProvider.provider_id),
+        "order": loader.next_id(models.Order.order_id),
+        "order_item": loader.next_id(models.OrderItem.order_item_id),
+        "message": loader.next_id(models.Message.id),
+        "review": loader.next_id(models.Review.review_id),
+    }
+    # Product stores come first, then service stores; vendor user i owns store i; customers follow the vendors
+    store_ids = range(first["store"], first["store"] + scale.stores)
+    product_store_ids = store_ids[:scale.product_stores]
+    service_store_ids = store_ids[scale.product_stores:]
+    vendor_user = lambda store_id: first["user"] + store_id - first["store"]
+    first_customer = first["user"] + scale.stores
+    customer_ids = range(first_customer, first_customer + scale.customers)
+    store_names = {store_id: f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}s {store_id}" for store_id in store_ids}
+
+    def person(user_id: int, role: UserRole) -> dict:
+        return dict(
+            id=user_id, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+            email=email(user_id), hashed_password=password_hash, role=role, status="active",
+        )
+
+    loader.load(models.Store, (
+        dict(
+            store_id=store_id, store_name=store_names[store_id],
+            store_type=SERVICE_STORE_TYPE if store_id in service_store_ids else rng.choice(STORE_TYPES),
+        )
+        for store_id in store_ids
+    ), scale.stores)
+    loader.load(models.User, (person(vendor_user(store_id), UserRole.VENDOR) for store_id in store_ids), scale.stores)
+    loader.load(models.Vendor, (
+        dict(vendor_id=first["vendor"] + i, vendor_name=store_names[store_id], store_id=store_id, user_id=vendor_user(store_id))
+        for i, store_id in enumerate(store_ids)
+    ), scale.stores)
+    loader.load(models.User, (person(user_id, UserRole.CUSTOMER) for user_id in customer_ids), scale.customers)
+
+    # Catalog: store i owns categories and products in consecutive id blocks
+    category_of = lambda store_index, n: first["category"] + store_index * scale.categories_per_store + n % scale.categories_per_store
+    product_of = lambda store_index, n: first["product"] + store_index * scale.products_per_store + n
+    loader.load(models.Category, (
+        dict(
+            category_id=category_of(i, n), category_name=f"{NOUNS[n % len(NOUNS)]}s", category_type="product", store_id=store_id,
+        )
+        for i, store_id in enumerate(product_store_ids) for n in range(scale.categories_per_store)
+    ), scale.product_stores * scale.categories_per_store)
+    loader.load(models.Product, (
+        dict(
+            product_id=product_of(i, n), product_name=f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {n + 1}",
+            product_desc=f"{store_names[store_id]} item {n + 1}", product_price=product_price(product_of(i, n)),
+            sku=f"SKU-{product_of(i, n)}", stock_quantity=1_000_000, status="active" if rng.random() < 0.95 else "inactive",
+            store_id=store_id, category_id=category_of(i, n),
+        )
+        for i, store_id in enumerate(product_store_ids) for n in range(scale.products_per_store)
+    ), scale.products)
+
+    # Booking: services and providers without a published schedule (bookable at any time)
+    loader.load(models.Service, (
+        dict(
+            service_id=first["service"] + i * scale.services_per_store + n, service_name=SERVICE_NAMES[n % len(SERVICE_NAMES)],
+            service_desc="", service_price=float(rng.randrange(2000, 15000, 500)), status="active",
+            store_id=store_id, duration_minutes=rng.choice((30, 45, 60)),
+        )
+        for i, store_id in enumerate(service_store_ids) for n in range(scale.services_per_store)
+    ), scale.service_stores * scale.services_per_store)
+    loader.load(models.ServiceProvider, (
+        dict(
+            provider_id=first["provider"] + i * scale.providers_per_store + n, name=f"{rng.choice(FIRST_NAMES)} {n + 1}",
+            store_id=store_id,
+        )
+        for i, store_id in enumerate(service_store_ids) for n in range(scale.providers_per_store)
+    ), scale.service_stores * scale.providers_per_store)
+
+    loader.load_with_children(models.Order, _orders(rng, scale, first, product_store_ids, customer_ids, history_start, now), scale.orders)
+    loader.load(models.Message, _messages(rng, scale, first["message"], store_ids, vendor_user, customer_ids, history_start, now),
+                scale.conversations * scale.messages_per_conversation)
+    loader.load(models.Review, (
+        dict(
+            review_id=first["review"] + i * scale.reviews_per_store + n, customer_id=rng.choice(customer_ids),
+            customer_name=rng.choice(FIRST_NAMES), store_id=store_id, rating=rng.choice((3, 4, 4, 5, 5, 5)),
+            comment=rng.choice(("Great service", "Fast delivery", "Would buy again", "Good value")),
+            created_at=history_start + timedelta(seconds=rng.randrange(scale.days_of_history * 86400)),
+        )
+        for i, store_id in enumerate(store_ids) for n in range(scale.reviews_per_store)
+    ) if customer_ids else (), scale.stores * scale.reviews_per_store)
+
+    return {
+        "password": SYNTHETIC_PASSWORD,
+        "email_domain": EMAIL_DOMAIN,
+        "seed": seed,
+        "scale": asdict(scale),
+        "stores": _id_range(first["store"], scale.stores),
+        "product_stores": _id_range(first["store"], scale.product_stores),
+        "service_stores": _id_range(first["store"] + scale.product_stores, scale.service_stores),
+        "vendor_users": _id_range(first["user"], scale.stores),
+        "customers": _id_range(first_customer, scale.customers),
+        "products": _id_range(first["product"], scale.products),
+        "services": _id_range(first["service"], scale.service_stores * scale.services_per_store),
+        "providers": _id_range(first["provider"], scale.service_stores * scale.providers_per_store),
+        "rows": loader.counts,
+    }
+
+
+def _orders(rng, scale: Scale, first: dict, store_ids: range, customer_ids: range, start: datetime, end: datetime) -> Iterator:
+    """Orders in date order (ids and per-store numbers grow with time), each with its items."""
+    if not store_ids or not customer_ids or not scale.products_per_store:
+        return
+    step = (end - start) / max(scale.orders, 1)
+    store_order_ids = [0] * len(store_ids)
+    item_id = first["order_item"]
+    for n in range(scale.orders):
+        # Squaring skews sales towards the first stores, like a real marketplace's best sellers
+        store_index = int(len(store_ids) * rng.random() ** 2)
+        store_order_ids[store_index] += 1
+        order_id = first["order"] + n
+        picks = rng.sample(range(scale.products_per_store), min(rng.randint(1, scale.max_items_per_order), scale.products_per_store))
+        items = []
+        for pick in picks:
+            product_id = first["product"] + store_index * scale.products_per_store + pick
+            items.append(dict(
+                order_item_id=item_id, order_id=order_id, product_id=product_id,
+                quantity=rng.randint(1, 3), price=product_price(product_id),
+            ))
+            item_id += 1
+        customer_id = rng.choice(customer_ids)
+        yield dict(
+            order_id=order_id, customer_id=customer_id, store_id=store_ids[store_index],
+            order_date=start + step * n, total_amount=round(sum(i["quantity"] * i["price"] for i in items), 2),
+            status=rng.choice(ORDER_STATUSES), customer_name=f"Customer {customer_id}",
+            store_order_id=store_order_ids[store_index],
+        ), {models.OrderItem: items}
+
+
+def _messages(rng, scale: Scale, first_id: int, store_ids: range, vendor_user: Callable[[int], int],
+              customer_ids: range, start: datetime, end: datetime) -> Iterator[dict]:
+    """Customer <-> vendor conversations; everything is read except some last replies."""
+    if not customer_ids:
+        return
+    message_id = first_id
+    span = max(int((end - start).total_seconds()) - scale.messages_per_conversation * 600, 1)
+    for _ in range(scale.conversations):
+        customer, vendor = rng.choice(customer_ids), vendor_user(rng.choice(store_ids))
+        sent_at = start + timedelta(seconds=rng.randrange(span))
+        for n in range(scale.messages_per_conversation):
+            last = n == scale.messages_per_conversation - 1
+            yield dict(
+                id=message_id, sender_id=customer if n % 2 == 0 else vendor, receiver_id=vendor if n % 2 == 0 else customer,
+                content=CHAT_LINES[n % len(CHAT_LINES)], timestamp=sent_at, is_read=not (last and rng.random() < 0.3),
+                message_type="text",
+            )
+            message_id += 1
+            sent_at += timedelta(seconds=rng.randrange(30, 600))
@@ -1,5 +1,5 @@
-import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 BACKEND_ROOT = Path(__file__).resolve().parent.parent
@@ -7,22 +7,40 @@ if str(BACKEND_ROOT) not in sys.path:
     sys.path.insert(0, str(BACKEND_ROOT))
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from app.api.v1 import auth, users, products, orders, stores, appointments, reviews, messages, admin, services, notifications, newsletter
+from app.api.v1 import auth, users, products, orders, stores, appointments, reviews, messages, admin, services, notifications, newsletter, metrics
 from app.core.config import settings
+from app.core.image_variants import shutdown_pool
+from app.core.metrics import MetricsMiddleware
+from app.core.profiler import ProfilerMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.uploads import UploadLimitMiddleware
+from app.core.static_media import MediaFiles
+from app.db.async_session import dispose_async_engine
 from app.db.database import engine, Base
+from app.db.replicas import replica_set
 from app.models import models
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Tables are created by `python migrate.py` (or at startup with AUTO_CREATE_TABLES), never on import
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.AUTO_CREATE_TABLES:
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
+    yield
+    shutdown_pool()
+    await replica_set.dispose()
+    await dispose_async_engine()
 
-app = FastAPI(title="PBL Microservice Platform")
+app = FastAPI(title="PBL Microservice Platform", lifespan=lifespan)
 
-uploads_dir = os.path.join(os.path.dirname(__file__), "..", "uploads")
+# Mount static files (cache headers, Range requests, precompressed sidecars);
+# the directory is created on the first request, not at import
+app.mount("/uploads", MediaFiles(directory=settings.effective_upload_dir, check_dir=False), name="uploads")
 
-# Mount static files
-app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
+# Oversized multipart bodies get 413 before the form parser spools them to disk
+# (added first, so CORS headers and the metrics below still wrap the response)
+app.add_middleware(UploadLimitMiddleware)
 
 # CORS Configuration
 origins = settings.CORS_ORIGINS_LIST
@@ -35,6 +53,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Statement counts / DB time per request and route (Server-Timing header with DEBUG)
+app.add_middleware(QueryStatsMiddleware)
+
+# Latency per route template and in-flight requests for GET /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Attributes sampled stacks to requests (admin profiler, X-Profile header)
+app.add_middleware(ProfilerMiddleware)
+
 # Include Routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 # Dashboard routes moved to /api/v1/users
@@ -49,6 +76,7 @@ app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 app.include_router(services.router, prefix="/api/services", tags=["services"])
 app.include_router(notifications.router, prefix="/api/notifications", tags=["notifications"])
 app.include_router(newsletter.router, prefix="/api", tags=["newsletter"])
+app.include_router(metrics.router, tags=["metrics"])
 
 @app.get("/")
 def read_root():
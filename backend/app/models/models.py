@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Enum, Integer, String, Text, DECIMAL, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Enum, Integer, String, Text, DECIMAL, ForeignKey, Boolean, Date, DateTime, Index, Time, UniqueConstraint
 import enum
+from datetime import datetime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -41,6 +42,7 @@ class PaymentMethod(Base):
 
 class OrderHistory(Base):
     __tablename__ = "ORDER_HISTORY"
+    __table_args__ = (Index("ix_order_history_order", "order_id"),)
     
     history_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     order_id = Column(Integer, ForeignKey("ORDERS.ORDER_ID"), nullable=False)
@@ -52,6 +54,7 @@ class OrderHistory(Base):
 
 class Category(Base):
     __tablename__ = "CATEGORY"
+    __table_args__ = (Index("ix_category_store", "STORE_ID"),)
 
     category_id = Column("CATEGORY_ID", Integer, primary_key=True, index=True, autoincrement=True)
     category_name = Column("CATEGORY_NAME", String(100), nullable=False)
@@ -63,6 +66,11 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "PRODUCT"
+    __table_args__ = (
+        # Store catalog pages filter on store and status
+        Index("ix_product_store_status", "STORE_ID", "STATUS"),
+        Index("ix_product_category", "CATEGORY_ID"),
+    )
 
     product_id = Column("PRODUCT_ID", Integer, primary_key=True, index=True, autoincrement=True)
     product_name = Column("PRODUCT_NAME", String(100), nullable=False)
@@ -98,6 +106,7 @@ class Product(Base):
 
 class ProductImage(Base):
     __tablename__ = "PRODUCT_IMAGE"
+    __table_args__ = (Index("ix_product_image_product", "PRODUCT_ID"),)
 
     image_id = Column("IMAGE_ID", Integer, primary_key=True, index=True, autoincrement=True)
     product_id = Column("PRODUCT_ID", Integer, ForeignKey("PRODUCT.PRODUCT_ID"), nullable=False)
@@ -107,8 +116,23 @@ class ProductImage(Base):
 
     product = relationship("Product", back_populates="images_rel")
 
+class ImageVariant(Base):
+    __tablename__ = "IMAGE_VARIANT"
+    __table_args__ = (UniqueConstraint("SOURCE_SHA256", "WIDTH", "FORMAT", name="uq_image_variant"),)
+
+    variant_id = Column("VARIANT_ID", Integer, primary_key=True, index=True, autoincrement=True)
+    # Content hash of the original upload (see app.core.media_store)
+    source_sha256 = Column("SOURCE_SHA256", String(64), nullable=False, index=True)
+    width = Column("WIDTH", Integer, nullable=False)
+    height = Column("HEIGHT", Integer, nullable=False)
+    format = Column("FORMAT", String(10), nullable=False) # webp, avif
+    url = Column("URL", String(255), nullable=False)
+    size_bytes = Column("SIZE_BYTES", Integer, nullable=True)
+    created_at = Column("CREATED_AT", DateTime(timezone=True), server_default=func.now())
+
 class Service(Base):
     __tablename__ = "SERVICE"
+    __table_args__ = (Index("ix_service_store", "STORE_ID"),)
 
     service_id = Column("SERVICE_ID", Integer, primary_key=True, index=True, autoincrement=True)
     service_name = Column("SERVICE_NAME", String(100), nullable=False)
@@ -117,11 +141,17 @@ class Service(Base):
     image_url = Column("IMAGE_URL", Text, nullable=True)
     status = Column("STATUS", String(20), default="active")
     store_id = Column("STORE_ID", Integer, ForeignKey("STORE.STORE_ID"))
+    duration_minutes = Column("DURATION_MINUTES", Integer, nullable=False, default=60, server_default="60")
     
     store = relationship("Store")
 
 class Order(Base):
     __tablename__ = "ORDERS"
+    __table_args__ = (
+        # Vendor and customer order lists: seek + ordered scan, no sort
+        Index("ix_orders_store_date", "STORE_ID", "ORDER_DATE"),
+        Index("ix_orders_customer_date", "CUSTOMER_ID", "ORDER_DATE"),
+    )
 
     order_id = Column("ORDER_ID", Integer, primary_key=True, index=True, autoincrement=True)
     customer_id = Column("CUSTOMER_ID", Integer, nullable=False)
@@ -149,6 +179,7 @@ class Order(Base):
 
 class OrderItem(Base):
     __tablename__ = "ORDER_ITEM"
+    __table_args__ = (Index("ix_order_item_order", "ORDER_ID"),)
 
     order_item_id = Column("ORDER_ITEM_ID", Integer, primary_key=True, index=True, autoincrement=True)
     order_id = Column("ORDER_ID", Integer, ForeignKey("ORDERS.ORDER_ID"), nullable=False)
@@ -169,26 +200,64 @@ class OrderItem(Base):
 
 class ServiceProvider(Base):
     __tablename__ = "SERVICE_PROVIDER"
+    __table_args__ = (Index("ix_service_provider_store_name", "STORE_ID", "NAME"),)
 
     provider_id = Column("PROVIDER_ID", Integer, primary_key=True, index=True, autoincrement=True)
     name = Column("NAME", String(100), nullable=False)
     contact = Column("CONTACT", String(255), nullable=True) # Normalized "contact" attribute
     store_id = Column("STORE_ID", Integer, ForeignKey("STORE.STORE_ID"), nullable=False)
+    # Last day TIME_SLOT working hours have been generated for (None = no published schedule)
+    slots_generated_until = Column("SLOTS_GENERATED_UNTIL", Date, nullable=True)
 
     store = relationship("Store")
 
+class ProviderSchedule(Base):
+    """Recurring weekly working hours, wall-clock in APPOINTMENT_TIMEZONE."""
+    __tablename__ = "PROVIDER_SCHEDULE"
+
+    schedule_id = Column("SCHEDULE_ID", Integer, primary_key=True, index=True, autoincrement=True)
+    provider_id = Column("PROVIDER_ID", Integer, ForeignKey("SERVICE_PROVIDER.PROVIDER_ID"), nullable=False, index=True)
+    weekday = Column("WEEKDAY", Integer, nullable=False) # 0 = Monday
+    start_time = Column("START_TIME", Time, nullable=False)
+    end_time = Column("END_TIME", Time, nullable=False)
+
+class ProviderScheduleException(Base):
+    """A date whose weekly hours are replaced: closed when start/end are empty, otherwise those hours only."""
+    __tablename__ = "PROVIDER_SCHEDULE_EXCEPTION"
+    __table_args__ = (UniqueConstraint("PROVIDER_ID", "DATE", name="uq_provider_schedule_exception"),)
+
+    exception_id = Column("EXCEPTION_ID", Integer, primary_key=True, index=True, autoincrement=True)
+    provider_id = Column("PROVIDER_ID", Integer, ForeignKey("SERVICE_PROVIDER.PROVIDER_ID"), nullable=False)
+    date = Column("DATE", Date, nullable=False)
+    start_time = Column("START_TIME", Time, nullable=True)
+    end_time = Column("END_TIME", Time, nullable=True)
+    reason = Column("REASON", String(255), nullable=True)
+
 class TimeSlot(Base):
+    """
+    A booked span (SERVICE_ID set, referenced by an appointment) or a published
+    working-hours block of a provider (PROVIDER_ID set, no service).
+    """
     __tablename__ = "TIME_SLOT"
+    __table_args__ = (Index("ix_time_slot_provider_start", "PROVIDER_ID", "START_TIME"),)
 
     slot_id = Column("SLOT_ID", Integer, primary_key=True, index=True, autoincrement=True)
     start_time = Column("START_TIME", DateTime(timezone=True), nullable=False)
     end_time = Column("END_TIME", DateTime(timezone=True), nullable=False)
-    service_id = Column("SERVICE_ID", Integer, ForeignKey("SERVICE.SERVICE_ID"), nullable=False)
+    service_id = Column("SERVICE_ID", Integer, ForeignKey("SERVICE.SERVICE_ID"), nullable=True)
+    provider_id = Column("PROVIDER_ID", Integer, ForeignKey("SERVICE_PROVIDER.PROVIDER_ID"), nullable=True)
 
     service = relationship("Service")
 
 class Appointment(Base):
     __tablename__ = "APPOINTMENT"
+    __table_args__ = (
+        Index("ix_appointment_store", "STORE_ID"),
+        Index("ix_appointment_customer", "CUSTOMER_ID"),
+        # Availability reads a provider's non-cancelled bookings
+        Index("ix_appointment_provider_status", "PROVIDER_ID", "STATUS"),
+        Index("ix_appointment_slot", "SLOT_ID"),
+    )
 
     appointment_id = Column("APPOINTMENT_ID", Integer, primary_key=True, index=True, autoincrement=True)
     customer_id = Column("CUSTOMER_ID", Integer, nullable=False)
@@ -229,6 +298,7 @@ class Appointment(Base):
 
 class SystemLog(Base):
     __tablename__ = "system_logs"
+    __table_args__ = (Index("ix_system_logs_timestamp", "TIMESTAMP"),)
     
     log_id = Column("LOG_ID", Integer, primary_key=True, index=True, autoincrement=True)
     action = Column("ACTION", Text, nullable=False)
@@ -238,6 +308,7 @@ class SystemLog(Base):
 
 class Review(Base):
     __tablename__ = "REVIEW"
+    __table_args__ = (Index("ix_review_store_created", "STORE_ID", "CREATED_AT"),)
 
     review_id = Column("REVIEW_ID", Integer, primary_key=True, index=True, autoincrement=True)
     customer_id = Column("CUSTOMER_ID", Integer, nullable=False)
@@ -290,6 +361,10 @@ class User(Base):
 
 class Vendor(Base):
     __tablename__ = "VENDOR"
+    __table_args__ = (
+        Index("ix_vendor_user", "USER_ID"),
+        Index("ix_vendor_store", "STORE_ID"),
+    )
 
     vendor_id = Column("VENDOR_ID", Integer, primary_key=True, index=True, autoincrement=True)
     vendor_name = Column("VENDOR_NAME", String(100), nullable=False)
@@ -301,6 +376,7 @@ class Vendor(Base):
 
 class VendorApplication(Base):
     __tablename__ = "VENDOR_APPLICATION"
+    __table_args__ = (Index("ix_vendor_application_user", "user_id"),)
     
     application_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("USER.id"), nullable=False)
@@ -315,6 +391,12 @@ class VendorApplication(Base):
 
 class Message(Base):
     __tablename__ = "MESSAGE"
+    __table_args__ = (
+        # Unread counts per sender
+        Index("ix_message_receiver_read", "receiver_id", "is_read", "sender_id"),
+        # Both directions of a conversation, in time order
+        Index("ix_message_conversation", "sender_id", "receiver_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     sender_id = Column(Integer, ForeignKey("USER.id"), nullable=False)
@@ -332,6 +414,18 @@ class Message(Base):
 
 class Notification(Base):
     __tablename__ = "NOTIFICATION"
+    # Load server defaults (created_at) during flush so new rows can be pushed without a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Covers the unread badge count: index-only scan of one user's unread rows
+        Index("ix_notification_user_unread", "user_id", "is_read"),
+        # Keyset paging of the newest-first list: seek + ordered scan, no sort
+        Index("ix_notification_user_created", "user_id", "created_at", "id"),
+        # Retention: expire read notifications by age
+        Index("ix_notification_read_created", "is_read", "created_at"),
+        # Reconnect catch-up: seek on (updated_at, id) past the client's cursor
+        Index("ix_notification_user_updated", "user_id", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("USER.id"), nullable=False)
@@ -340,7 +434,11 @@ class Notification(Base):
     type = Column(String(50), nullable=False) # 'order', 'appointment', 'system'
     related_id = Column(Integer, nullable=True) # ID of the order/appointment
     is_read = Column(Boolean, default=False)
+    occurrences = Column(Integer, nullable=False, default=1, server_default="1") # Events collapsed into this row
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set on insert and on every change (bumps, reads), so catch-up also returns rows updated in place.
+    # Python-side for sub-second precision; SQLite's CURRENT_TIMESTAMP has whole seconds.
+    updated_at = Column(DateTime(timezone=True), default=datetime.now, onupdate=datetime.now)
     
     user = relationship("User", back_populates="notifications")
 
@@ -14,7 +14,7 @@ class Subscriber(SubscriberBase):
     subscribed_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional
 from datetime import datetime, date, time
 
@@ -58,11 +58,20 @@ class Category(CategoryBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
+    model_config = ConfigDict(from_attributes=True)
+
 class Store(BaseModel):
     store_id: int
     store_name: str
     store_type: Optional[str] = None
     image_url: Optional[str] = None
+    image_variants: List[ImageVariant] = [] # Responsive thumbnails of image_url, smallest first
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -95,6 +104,7 @@ class ProductImageBase(BaseModel):
 class ProductImage(ProductImageBase):
     image_id: int
     product_id: int
+    variants: List[ImageVariant] = []
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -105,6 +115,7 @@ class Product(ProductBase):
     store: Optional[Store] = None
     # Include the images in the response
     images_rel: List[ProductImage] = []
+    image_variants: List[ImageVariant] = [] # Responsive thumbnails of image_url, smallest first
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -195,6 +206,7 @@ class ProductImageBase(BaseModel):
 class ProductImage(ProductImageBase):
     image_id: int
     product_id: int
+    variants: List[ImageVariant] = []
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -240,10 +252,21 @@ class TimeSlot(BaseModel):
 
 class AppointmentCreate(BaseModel):
     store_id: int
-    barber_name: str
-    service_name: str
+    # Either the id or the name of each; ids skip the name lookup
+    provider_id: Optional[int] = None
+    barber_name: Optional[str] = None
+    service_id: Optional[int] = None
+    service_name: Optional[str] = None
     booking_date: Optional[datetime] = None
 
+    @model_validator(mode="after")
+    def check_references(self):
+        if self.provider_id is None and not self.barber_name:
+            raise ValueError("provider_id or barber_name is required")
+        if self.service_id is None and not self.service_name:
+            raise ValueError("service_id or service_name is required")
+        return self
+
 class Appointment(BaseModel):
     appointment_id: int
     booking_date: datetime
@@ -256,6 +279,76 @@ class Appointment(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class AppointmentPage(BaseModel):
+    items: List[Appointment]
+    total: int
+    limit: int
+    offset: int
+    has_more: bool
+    next_offset: Optional[int] = None # None on the last page
+
+class CalendarAppointment(BaseModel):
+    appointment_id: int
+    start: datetime
+    end: Optional[datetime] = None # Unknown for legacy rows without a time slot
+    barber_name: Optional[str] = None
+    service_name: Optional[str] = None
+    customer_name: Optional[str] = None
+    status: str
+
+class CalendarDay(BaseModel):
+    date: date
+    appointments: List[CalendarAppointment]
+
+class AvailableSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+class ProviderAvailability(BaseModel):
+    provider_id: int
+    provider_name: str
+    slots: List[AvailableSlot]
+
+class WeeklyHours(BaseModel):
+    weekday: int = Field(..., ge=0, le=6) # 0 = Monday
+    start_time: time
+    end_time: time
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="after")
+    def check_order(self):
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+class ScheduleException(BaseModel):
+    date: date
+    start_time: Optional[time] = None # Both empty = closed that day
+    end_time: Optional[time] = None
+    reason: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="after")
+    def check_hours(self):
+        if (self.start_time is None) != (self.end_time is None):
+            raise ValueError("start_time and end_time must be given together")
+        if self.start_time is not None and self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+class ProviderScheduleUpdate(BaseModel):
+    weekly: List[WeeklyHours]
+    exceptions: List[ScheduleException] = []
+    horizon_days: Optional[int] = Field(None, ge=1, le=365)
+
+class ProviderScheduleOut(BaseModel):
+    provider_id: int
+    weekly: List[WeeklyHours]
+    exceptions: List[ScheduleException]
+    slots_generated_until: Optional[date] = None
+
 class ReviewCreate(BaseModel):
     store_id: int
     barber_name: Optional[str] = None
@@ -319,6 +412,15 @@ class Message(MessageBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class MessageSearchHit(Message):
+    snippet: str = "" # Matched terms wrapped in <mark></mark>
+
+class MessageSearchPage(BaseModel):
+    items: List[MessageSearchHit]
+    limit: int
+    offset: int
+    has_more: bool
+
 class NotificationBase(BaseModel):
     title: str
     message: str
@@ -332,6 +434,18 @@ class Notification(NotificationBase):
     id: int
     user_id: int
     is_read: bool
+    occurrences: int = 1
     created_at: datetime
+    updated_at: Optional[datetime] = None # Pass with id as the /delta cursor
     
     model_config = ConfigDict(from_attributes=True)
+
+class NotificationUnreadCount(BaseModel):
+    unread_count: int
+
+class NotificationPage(BaseModel):
+    items: List[Notification]
+    next_cursor: Optional[str] = None # Opaque; pass as ?before= to get the next (older) page
+
+class NotificationsMarkedRead(BaseModel):
+    updated: int
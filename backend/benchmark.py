@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from benchmark_async_reads import wait_until_up
+
+# (weight, label, builder): builder(ctx, rng) -> (method, path, httpx kwargs, role of the caller or None).
+# "{user_id}" in a path is replaced with the id of the account making the request.
+SCENARIOS = {
+    "catalog": [
+        (1, "GET /api/stores/", lambda ctx, rng: ("GET", "/api/stores/", {}, None)),
+        (2, "GET /api/stores/{store_id}", lambda ctx, rng: ("GET", f"/api/stores/{ctx.store(rng)}", {}, None)),
+        (4, "GET /api/products/?store_id", lambda ctx, rng: ("GET", "/api/products/", {"params": {"store_id": ctx.store(rng)}}, None)),
+        (4, "GET /api/products/{product_id}", lambda ctx, rng: ("GET", f"/api/products/{ctx.product(rng)}", {}, None)),
+        (1, "GET /api/reviews/?store_id", lambda ctx, rng: ("GET", "/api/reviews/", {"params": {"store_id": ctx.store(rng)}}, None)),
+    ],
+    "checkout": [
+        (1, "POST /api/orders/", lambda ctx, rng: ("POST", "/api/orders/", {"json": ctx.cart(rng)}, "customer")),
+    ],
+    "booking": [
+        (1, "GET /api/appointments/availability", lambda ctx, rng: (
+            "GET", "/api/appointments/availability", {"params": ctx.availability_query(rng)}, None)),
+        (1, "POST /api/appointments/", lambda ctx, rng: ("POST", "/api/appointments/", {"json": ctx.booking()}, "customer")),
+    ],
+    "chat": [
+        (2, "GET /api/messages/conversations", lambda ctx, rng: ("GET", "/api/messages/conversations", {}, "customer")),
+        (2, "GET /api/messages/{user_id}", lambda ctx, rng: ("GET", f"/api/messages/{ctx.vendor_user(rng)}", {}, "customer")),
+        (1, "POST /api/messages/", lambda ctx, rng: ("POST", "/api/messages/", {"json": {
+            "receiver_id": ctx.vendor_user(rng), "content": "Is this available in blue?"}}, "customer")),
+    ],
+    "dashboards": [
+        (1, "GET /api/v1/users/vendor/dashboard/{user_id}", lambda ctx, rng: (
+            "GET", "/api/v1/users/vendor/dashboard/{user_id}", {}, "vendor")),
+        (1, "GET /api/v1/users/customer/dashboard/{customer_id}", lambda ctx, rng: (
+            "GET", "/api/v1/users/customer/dashboard/{user_id}", {}, "customer")),
+    ],
+}
+
+
+class Context:
+    """Picks stores, products and users from the generate_data.py manifest."""
+
+    def __init__(self, manifest, run_seed):
+        self.manifest = manifest
+        self.scale = manifest["scale"]
+        self.product_stores = manifest["product_stores"]
+        self.service_stores = manifest["service_stores"]
+        self.providers = manifest["providers"][1] - manifest["providers"][0] + 1
+        # Unique (provider, start) per booking: providers in turn, one hour apart, far enough out not to
+        # collide with earlier runs on the same database
+        self.bookings = itertools.count()
+        self.booking_start = datetime.combine(date.today() + timedelta(days=30 + run_seed % 3000), datetime.min.time())
+        self.tokens = {"customer": [], "vendor": []}
+
+    def store(self, rng):
+        # Skewed like the generated orders: the first stores are the busy ones
+        first, last = self.product_stores
+        return first + int((last - first + 1) * rng.random() ** 2)
+
+    def product(self, rng, store_id=None):
+        store_id = store_id or self.store(rng)
+        per_store = self.scale["products_per_store"]
+        return self.manifest["products"][0] + (store_id - self.product_stores[0]) * per_store + rng.randrange(per_store)
+
+    def vendor_user(self, rng):
+        first, last = self.manifest["vendor_users"]
+        return rng.randint(first, last)
+
+    def cart(self, rng):
+        store_id = self.store(rng)
+        return {
+            "items": [{"product_id": self.product(rng, store_id), "quantity": 1, "product_price": 0} for _ in range(rng.randint(1, 3))],
+            "payment_method": "online",
+        }
+
+    def availability_query(self, rng):
+        store_id = rng.randint(*self.service_stores)
+        index = store_id - self.service_stores[0]
+        return {
+            "store_id": store_id,
+            "service_id": self.manifest["services"][0] + index * self.scale["services_per_store"],
+            "date_from": (date.today() + timedelta(days=rng.randint(1, 14))).isoformat(),
+        }
+
+    def booking(self):
+        n = next(self.bookings)
+        provider_id = self.manifest["providers"][0] + n % self.providers
+        index = (provider_id - self.manifest["providers"][0]) // self.scale["providers_per_store"]
+        return {
+            "store_id": self.service_stores[0] + index,
+            "provider_id": provider_id,
+            "service_id": self.manifest["services"][0] + index * self.scale["services_per_store"],
+            "booking_date": (self.booking_start + timedelta(hours=n // self.providers)).isoformat(),
+        }
+
+
+async def login(client, user_id, manifest):
+    response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": f"user{user_id}@{manifest['email_domain']}", "password": manifest["password"]},
+    )
+    response.raise_for_status()
+    return user_id, response.json()["access_token"]
+
+
+async def run_scenario(base_url, ctx, name, clients, duration, users):
+    """Closed loop: `clients` virtual users each issue the next request as soon as the last one returns."""
+    requests = SCENARIOS[name]
+    weights = [weight for weight, _, _ in requests]
+    latencies = {label: [] for _, label, _ in requests}
+    errors = {label: 0 for _, label, _ in requests}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for role, (first, last) in (("customer", ctx.manifest["customers"]), ("vendor", ctx.manifest["vendor_users"])):
+            if not ctx.tokens[role]:
+                ids = random.Random(0).sample(range(first, last + 1), min(users, last - first + 1))
+                ctx.tokens[role] = await asyncio.gather(*(login(client, user_id, ctx.manifest) for user_id in ids))
+        deadline = time.perf_counter() + duration
+
+        async def virtual_user(n):
+            rng = random.Random(n)
+            while time.perf_counter() < deadline:
+                _, label, build = rng.choices(requests, weights)[0]
+                method, path, kwargs, role = build(ctx, rng)
+                headers = {}
+                if role:
+                    user_id, token = ctx.tokens[role][n % len(ctx.tokens[role])]
+                    headers["Authorization"] = f"Bearer {token}"
+                    path = path.replace("{user_id}", str(user_id))
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, headers=headers, **kwargs)
+                    if response.status_code >= 400:
+                        errors[label] += 1
+                        continue
+                except httpx.HTTPError:
+                    errors[label] += 1
+                    continue
+                latencies[label].append(time.perf_counter() - started)
+
+        await asyncio.gather(*(virtual_user(n) for n in range(clients)))
+
+    return {label: summarize(latencies[label], errors[label], duration) for _, label, _ in requests}
+
+
+def summarize(latencies, errors, duration):
+    ordered = sorted(latencies)
+    pct = lambda p: round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2) if ordered else None
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / duration, 2),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def format_report(results):
+    lines = [f"{'scenario':<11}{'endpoint':<52}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"]
+    for scenario, endpoints in results["scenarios"].items():
+        for label, s in endpoints.items():
+            fmt = lambda v: f"{v:>9.1f}" if v is not None else f"{'-':>9}"
+            lines.append(f"{scenario:<11}{label:<52}{s['rps']:>9.1f}{fmt(s['p50_ms'])}{fmt(s['p95_ms'])}{fmt(s['p99_ms'])}{s['errors']:>8}")
+    return "\n".join(lines)
+
+
+def compare(results, baseline, tolerance, min_requests=20, noise_ms=2.0):
+    """Regressions against a baseline: p95 up or throughput down by more than `tolerance`, or new errors."""
+    regressions = []
+    for scenario, endpoints in results["scenarios"].items():
+        for label, current in endpoints.items():
+            base = baseline.get("scenarios", {}).get(scenario, {}).get(label)
+            if not base or base["requests"] < min_requests or current["requests"] < min_requests:
+                continue
+            name = f"{scenario} {label}"
+            if current["p95_ms"] > base["p95_ms"] * (1 + tolerance) and current["p95_ms"] - base["p95_ms"] > noise_ms:
+                regressions.append(f"{name}: p95 {base['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms")
+            if current["rps"] < base["rps"] * (1 - tolerance):
+                regressions.append(f"{name}: throughput {base['rps']:.1f} -> {current['rps']:.1f} req/s")
+            error_rate = lambda s: s["errors"] / max(s["requests"] + s["errors"], 1)
+            if error_rate(current) > error_rate(base) + 0.01:
+                regressions.append(f"{name}: error rate {error_rate(base):.1%} -> {error_rate(current):.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test catalog, checkout, booking, chat and dashboard endpoints against data from generate_data.py."
+    )
+    parser.add_argument("--manifest", default="synthetic_manifest.json", help="Manifest written by generate_data.py")
+    parser.add_argument("--scenario", dest="scenarios", action="append", choices=SCENARIOS, help="Scenario to run (repeatable, default all)")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent virtual users per scenario")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load per scenario")
+    parser.add_argument("--users", type=int, default=20, help="Distinct customer and vendor accounts to log in as")
+    parser.add_argument("--port", type=int, default=8766, help="Port for the uvicorn server started by this script")
+    parser.add_argument("--base-url", help="Load an already running server instead of starting one")
+    parser.add_argument("--out", help="Write the results as JSON (use as a later --baseline)")
+    parser.add_argument("--baseline", help="Results JSON to compare against; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 increase / throughput drop (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    ctx = Context(manifest, run_seed=int(time.time()))
+    scenarios = args.scenarios or list(SCENARIOS)
+    if "booking" in scenarios and ctx.providers < 1:
+        sys.exit("The manifest has no service stores: generate data with --service-store-share > 0 or skip booking")
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            env=dict(os.environ, IMAGE_VARIANTS_ENABLED="false"),
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_up(base_url)
+        print(f"{args.clients} clients, {args.duration:.0f}s per scenario against {base_url}")
+        results = {
+            "clients": args.clients,
+            "duration": args.duration,
+            "scale": manifest["scale"],
+            "scenarios": {},
+        }
+        for name in scenarios:
+            results["scenarios"][name] = asyncio.run(run_scenario(base_url, ctx, name, args.clients, args.duration, args.users))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(format_report(results))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != results["scale"] or baseline.get("clients") != results["clients"]:
+            print("Warning: the baseline was recorded with a different data scale or client count")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
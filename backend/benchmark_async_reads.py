@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+DEFAULT_PATHS = ["/api/products/", "/api/stores/"]
+
+
+async def run_load(base_url, paths, clients, duration, token=None):
+    """Keep `clients` requests in flight for `duration` seconds; returns (latencies, errors)."""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def worker(n):
+            nonlocal errors
+            i = n
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    if response.status_code >= 400:
+                        errors += 1
+                    else:
+                        latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+                i += 1
+
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+    return latencies, errors
+
+
+def summarize(label, latencies, errors, duration):
+    if not latencies:
+        return f"{label:<8} no successful requests ({errors} errors)"
+    ordered = sorted(latencies)
+    pct = lambda p: ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+    return (
+        f"{label:<8} {len(latencies) / duration:>9.1f} req/s   "
+        f"p50 {statistics.median(ordered) * 1000:>7.1f} ms   p95 {pct(0.95):>7.1f} ms   "
+        f"p99 {pct(0.99):>7.1f} ms   errors {errors}"
+    )
+
+
+def wait_until_up(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def serve_and_load(async_routes, args):
+    """Start uvicorn with ASYNC_READ_ROUTES on or off and load it."""
+    env = dict(os.environ, ASYNC_READ_ROUTES=str(async_routes).lower(), IMAGE_VARIANTS_ENABLED="false")
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    try:
+        wait_until_up(base_url)
+        return asyncio.run(run_load(base_url, args.paths, args.clients, args.duration, args.token))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare read throughput of the threadpool (sync) and AsyncSession route variants."
+    )
+    parser.add_argument("--clients", type=int, default=500, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load per run")
+    parser.add_argument("--path", dest="paths", action="append", help=f"GET path to load (repeatable, default {DEFAULT_PATHS})")
+    parser.add_argument("--token", help="Bearer token, for /api/notifications/ and /api/messages/<id>")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the uvicorn servers started by this script")
+    parser.add_argument("--base-url", help="Load an already running server instead of starting sync and async ones")
+    args = parser.parse_args()
+    args.paths = args.paths or DEFAULT_PATHS
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per run, paths: {', '.join(args.paths)}")
+    if args.base_url:
+        latencies, errors = asyncio.run(run_load(args.base_url, args.paths, args.clients, args.duration, args.token))
+        print(summarize("server", latencies, errors, args.duration))
+        return
+
+    results = {}
+    for label, async_routes in (("sync", False), ("async", True)):
+        latencies, errors = serve_and_load(async_routes, args)
+        results[label] = len(latencies) / args.duration
+        print(summarize(label, latencies, errors, args.duration))
+    if results["sync"]:
+        print(f"async/sync throughput: {results['async'] / results['sync']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
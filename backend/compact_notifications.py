@@ -0,0 +1,35 @@
+import argparse
+
+from app.core.config import settings
+from app.core.notification_retention import compact_notifications
+from app.db.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collapse repeated notifications and delete old read ones.")
+    parser.add_argument("--retention-days", type=int, default=settings.NOTIFICATION_READ_RETENTION_DAYS, help="Delete read notifications older than this")
+    parser.add_argument("--batch-size", type=int, default=500, help="Groups/rows per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without changing it")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = compact_notifications(
+            db,
+            retention_days=args.retention_days,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+
+    prefix = "Would collapse" if args.dry_run else "Collapsed"
+    print(f"{prefix} {report.collapsed_rows} notifications into {report.collapsed_groups} rows.")
+    prefix = "Would delete" if args.dry_run else "Deleted"
+    print(f"{prefix} {report.expired_rows} read notifications older than {args.retention_days} days.")
+
+
+if __name__ == "__main__":
+    main()
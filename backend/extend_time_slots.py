@@ -0,0 +1,23 @@
+import argparse
+
+from app.core.config import settings
+from app.core.schedules import extend_slot_horizons
+from app.db.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize provider working hours up to the rolling horizon.")
+    parser.add_argument("--horizon-days", type=int, default=settings.APPOINTMENT_SLOT_HORIZON_DAYS, help="Days ahead to keep generated")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        created = extend_slot_horizons(db, args.horizon_days)
+    finally:
+        db.close()
+
+    print(f"Extended {len(created)} providers, {sum(created.values())} new time slots.")
+
+
+if __name__ == "__main__":
+    main()
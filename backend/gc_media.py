@@ -0,0 +1,33 @@
+import argparse
+
+from app.core.media_store import collect_garbage
+from app.db.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete media blobs that no product, store, user or message references.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Blobs deleted per batch")
+    parser.add_argument("--grace-hours", type=float, default=24, help="Keep unreferenced blobs newer than this")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = collect_garbage(
+            db,
+            batch_size=args.batch_size,
+            grace_seconds=int(args.grace_hours * 3600),
+            pause_seconds=args.pause,
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+
+    action = "Would delete" if args.dry_run else "Deleted"
+    print(f"Scanned {report.scanned} blobs, {report.referenced} referenced.")
+    print(f"{action} {len(report.deleted)} blobs ({report.bytes_freed / (1024 * 1024):.1f} MB).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import dataclasses
+import json
+import logging
+import sys
+import time
+
+from app.db import migrations
+from app.db.database import engine
+from app.db.synthetic import PRESETS, generate
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bulk-load a synthetic marketplace (see app/db/synthetic.py) for load tests and benchmark.py."
+    )
+    parser.add_argument("--preset", choices=PRESETS, default="small", help="Volume preset (large: 1M products, 10M orders)")
+    for field in dataclasses.fields(PRESETS["small"]):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=field.type, help=f"Override the preset's {field.name}")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed and scale, same data)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Parent rows per INSERT batch / transaction")
+    parser.add_argument("--manifest", default="synthetic_manifest.json", help="Where to write id ranges and logins for benchmark.py")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    if migrations.is_empty(engine) or migrations.pending_migrations(engine):
+        sys.exit("The schema is missing or not up to date: run `python migrate.py` first")
+
+    overrides = {
+        field.name: getattr(args, field.name)
+        for field in dataclasses.fields(PRESETS[args.preset])
+        if getattr(args, field.name) is not None
+    }
+    scale = dataclasses.replace(PRESETS[args.preset], **overrides)
+
+    started = time.perf_counter()
+    manifest = generate(engine, scale, seed=args.seed, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+    rows = sum(manifest["rows"].values())
+
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Loaded {rows} rows in {elapsed:.0f}s ({rows / elapsed:.0f} rows/s); manifest written to {args.manifest}")
+    for table, count in manifest["rows"].items():
+        print(f"  {table:<20} {count}")
+
+
+if __name__ == "__main__":
+    main()
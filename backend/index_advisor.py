@@ -0,0 +1,53 @@
+import argparse
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.db.database import Base
+from app.db.index_advisor import QueryCapture, advise, format_report
+from app.models import models  # noqa: F401  (registers the tables on Base.metadata)
+
+
+class CapturePlugin:
+    """Records the suite's SQL from the first test to the last."""
+
+    def __init__(self, capture: QueryCapture):
+        self.capture = capture
+
+    def pytest_sessionstart(self, session):
+        self.capture.attach()
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.capture.detach()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the test suite, EXPLAIN every query it issued and report full table scans with suggested indexes."
+    )
+    parser.add_argument("paths", nargs="*", default=["tests"], help="Test paths (default: tests)")
+    parser.add_argument("-k", dest="keyword", help="Only run tests matching this pytest -k expression")
+    parser.add_argument("--limit", type=int, default=30, help="Scans listed in the report")
+    parser.add_argument("--out", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    capture = QueryCapture()
+    pytest_args = ["-q", "-p", "no:cacheprovider", *args.paths] + (["-k", args.keyword] if args.keyword else [])
+    if pytest.main(pytest_args, plugins=[CapturePlugin(capture)]) not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+        sys.exit("Test run failed to start")
+
+    # The suite runs on SQLite, so its statements are explained on a fresh SQLite schema from the models
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    report = format_report(advise(list(capture.queries.values()), engine), limit=args.limit)
+
+    print(f"\nCaptured {len(capture.queries)} distinct statements\n")
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
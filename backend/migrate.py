@@ -0,0 +1,46 @@
+import argparse
+import logging
+
+from app.db import migrations
+from app.db.database import engine
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply pending schema migrations (see app/db/migrations.py). Run once per deploy."
+    )
+    parser.add_argument("--status", action="store_true", help="List applied and pending migrations")
+    parser.add_argument("--dry-run", action="store_true", help="Show planned DDL and estimated backfill time")
+    parser.add_argument("--to", type=int, dest="target", help="Stop after this version")
+    parser.add_argument("--batch-size", type=int, default=migrations.DEFAULT_BATCH_SIZE, help="Rows per backfill transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between backfill batches")
+    parser.add_argument("--stamp", action="store_true", help="Mark migrations as applied without running them")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+
+    if args.status:
+        applied = migrations.applied_versions(engine)
+        for m in migrations.MIGRATIONS:
+            row = applied.get(m.version)
+            state = f"applied {row['APPLIED_AT']:%Y-%m-%d %H:%M} ({row['DURATION_MS']} ms)" if row else "pending"
+            print(f"{m.version:04d} {m.name:<40} {state}")
+        return
+
+    if args.stamp:
+        migrations.stamp(engine, args.target)
+        print(f"Stamped up to version {args.target or migrations.head()}")
+        return
+
+    migrations.upgrade(
+        engine,
+        target=args.target,
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        pause=args.pause,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -168,3 +168,18 @@ class TestUserDeletion:
             headers=auth_headers
         )
         assert response.status_code == 403
+
+
+class TestDatabasePoolStatus:
+    """Component tests for the connection pool status endpoint."""
+
+    def test_pool_status_as_admin(self, client, admin_auth_headers):
+        response = client.get("/api/admin/db-pool", headers=admin_auth_headers)
+
+        assert response.status_code == 200
+        assert {"checked_out", "saturation", "checkouts", "wait_seconds_max"} <= set(response.json())
+
+    def test_pool_status_as_customer_fails(self, client, auth_headers):
+        response = client.get("/api/admin/db-pool", headers=auth_headers)
+
+        assert response.status_code == 403
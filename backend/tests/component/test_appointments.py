@@ -105,7 +105,7 @@ class TestAppointmentRetrieval:
         """Test getting user's appointments."""
         response = client.get("/api/appointments/my-appointments", headers=auth_headers)
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert response.json() == {"items": [], "total": 0, "limit": 100, "offset": 0, "has_more": False, "next_offset": None}
 
     def test_get_store_appointments(self, client, auth_headers, test_store):
         """Test getting store's appointments."""
@@ -114,7 +114,7 @@ class TestAppointmentRetrieval:
             headers=auth_headers
         )
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(response.json()["items"], list)
 
 
 class TestAppointmentCancellation:
@@ -237,10 +237,362 @@ class TestNormalizedAppointmentData:
         response = client.get("/api/appointments/my-appointments", headers=auth_headers)
         assert response.status_code == 200
         
-        appointments = response.json()
+        appointments = response.json()["items"]
         if len(appointments) > 0:
             appt = appointments[-1]
             # Check backward compatibility fields exist
             assert "barber_name" in appt
             assert "booking_date" in appt
             assert "service_name" in appt
+
+
+@pytest.fixture
+def haircut(db_session, test_store):
+    """A 45 minute service and one provider in the test store."""
+    from app.models.models import Service, ServiceProvider
+
+    service = Service(service_name="Haircut", service_price=25.00, store_id=test_store.store_id, duration_minutes=45)
+    provider = ServiceProvider(name="John", store_id=test_store.store_id)
+    db_session.add_all([service, provider])
+    db_session.commit()
+    return {"service": service, "provider": provider}
+
+
+def book(client, auth_headers, test_store, when, barber="John", service="Haircut"):
+    return client.post(
+        "/api/appointments/",
+        json={"store_id": test_store.store_id, "barber_name": barber, "service_name": service, "booking_date": when.isoformat()},
+        headers=auth_headers
+    )
+
+
+class TestAppointmentAvailability:
+    """Component tests for overlap-free booking and the availability endpoint."""
+
+    def test_overlapping_booking_is_rejected(self, client, auth_headers, test_store, haircut):
+        start = datetime(2030, 3, 4, 10, 0)
+
+        first = book(client, auth_headers, test_store, start)
+        overlapping = book(client, auth_headers, test_store, start + timedelta(minutes=30))
+        adjacent = book(client, auth_headers, test_store, start + timedelta(minutes=45))
+        other_barber = book(client, auth_headers, test_store, start + timedelta(minutes=30), barber="Mike")
+
+        assert first.status_code == 200
+        assert overlapping.status_code == 400
+        assert adjacent.status_code == 200
+        assert other_barber.status_code == 200
+
+    def test_cancelled_booking_frees_the_slot(self, client, auth_headers, db_session, test_store, haircut):
+        from app.models.models import Appointment
+
+        start = datetime(2030, 3, 4, 10, 0)
+        appointment_id = book(client, auth_headers, test_store, start).json()["appointment_id"]
+        db_session.get(Appointment, appointment_id).status = "Cancelled"
+        db_session.commit()
+
+        assert book(client, auth_headers, test_store, start).status_code == 200
+
+    def test_provider_deleted_behind_the_registry_is_not_found(self, client, auth_headers, db_session, test_store, haircut):
+        from sqlalchemy import text
+
+        start = datetime(2030, 3, 4, 10, 0)
+        assert book(client, auth_headers, test_store, start).status_code == 200
+        # Bypasses the ORM, so the cached registry still lists the provider
+        db_session.execute(text('DELETE FROM "APPOINTMENT"'))
+        db_session.execute(text('DELETE FROM "SERVICE_PROVIDER" WHERE "PROVIDER_ID" = :id'), {"id": haircut["provider"].provider_id})
+        db_session.commit()
+        db_session.expunge(haircut["provider"])
+
+        response = book(client, auth_headers, test_store, start + timedelta(hours=1))
+
+        assert response.status_code == 404
+        # The stale entry is dropped, so the next booking creates the provider again
+        assert book(client, auth_headers, test_store, start + timedelta(hours=1)).status_code == 200
+
+    def test_availability_excludes_booked_spans(self, client, auth_headers, test_store, haircut, monkeypatch):
+        from app.core import availability
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_TIMEZONE", "UTC")
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_OPENING_TIME", "09:00")
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_CLOSING_TIME", "12:00")
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_SLOT_STEP_MINUTES", 30)
+        book(client, auth_headers, test_store, datetime(2030, 3, 4, 10, 0))
+
+        response = client.get("/api/appointments/availability", params={
+            "store_id": test_store.store_id,
+            "service_id": haircut["service"].service_id,
+            "date_from": "2030-03-04",
+        })
+
+        assert response.status_code == 200
+        [john] = response.json()
+        assert john["provider_name"] == "John"
+        starts = [slot["start"][11:16] for slot in john["slots"]]
+        # 09:00 fits before the 10:00-10:45 booking; 10:45 is snapped to 11:00
+        assert starts == ["09:00", "11:00"]
+        assert john["slots"][0]["end"].startswith("2030-03-04T09:45:00")
+
+    def test_availability_range_is_bounded(self, client, test_store):
+        response = client.get("/api/appointments/availability", params={
+            "store_id": test_store.store_id,
+            "date_from": "2030-01-01",
+            "date_to": "2030-06-01",
+        })
+
+        assert response.status_code == 400
+
+
+@pytest.fixture
+def utc_store_hours(monkeypatch):
+    from app.core import availability
+    monkeypatch.setattr(availability.settings, "APPOINTMENT_TIMEZONE", "UTC")
+    monkeypatch.setattr(availability.settings, "APPOINTMENT_SLOT_STEP_MINUTES", 30)
+
+
+def next_weekday(weekday):
+    from app.core.schedules import store_today
+    today = store_today()
+    return today + timedelta(days=(weekday - today.weekday()) % 7 or 7)
+
+
+class TestProviderSchedules:
+    """Component tests for published weekly schedules."""
+
+    def publish(self, client, headers, provider, **body):
+        return client.put(f"/api/appointments/providers/{provider.provider_id}/schedule", json=body, headers=headers)
+
+    def test_publish_materializes_slots_for_horizon(self, client, admin_auth_headers, db_session, haircut, utc_store_hours):
+        from app.models.models import TimeSlot
+
+        provider = haircut["provider"]
+        holiday = next_weekday(0)
+        response = self.publish(
+            client, admin_auth_headers, provider,
+            weekly=[
+                {"weekday": 0, "start_time": "09:00", "end_time": "12:00"},
+                {"weekday": 0, "start_time": "13:00", "end_time": "17:00"},
+                {"weekday": 2, "start_time": "10:00", "end_time": "14:00"},
+            ],
+            exceptions=[{"date": holiday.isoformat(), "reason": "Holiday"}],
+            horizon_days=14,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["weekly"]) == 3
+        assert data["exceptions"][0]["reason"] == "Holiday"
+        slots = db_session.query(TimeSlot).filter(TimeSlot.provider_id == provider.provider_id).all()
+        # Two weeks: 2 Mondays (one a holiday) x 2 blocks + 2 Wednesdays x 1 block
+        assert len(slots) == 4
+        assert all(s.service_id is None for s in slots)
+        assert holiday not in {s.start_time.date() for s in slots}
+
+    def test_availability_and_booking_follow_published_hours(self, client, admin_auth_headers, auth_headers, test_store, haircut, utc_store_hours):
+        provider = haircut["provider"]
+        day = next_weekday(2)
+        self.publish(client, admin_auth_headers, provider, weekly=[{"weekday": 2, "start_time": "10:00", "end_time": "12:00"}])
+
+        response = client.get("/api/appointments/availability", params={
+            "store_id": test_store.store_id, "service_id": haircut["service"].service_id, "date_from": day.isoformat(),
+        })
+        starts = [slot["start"][11:16] for slot in response.json()[0]["slots"]]
+
+        assert starts == ["10:00", "10:30", "11:00"]
+        assert book(client, auth_headers, test_store, datetime.combine(day, datetime.min.time()).replace(hour=8)).status_code == 400
+        assert book(client, auth_headers, test_store, datetime.combine(day, datetime.min.time()).replace(hour=11)).status_code == 200
+
+    def test_republishing_keeps_bookings(self, client, admin_auth_headers, auth_headers, db_session, test_store, haircut, utc_store_hours):
+        from app.models.models import Appointment
+
+        provider = haircut["provider"]
+        day = next_weekday(2)
+        self.publish(client, admin_auth_headers, provider, weekly=[{"weekday": 2, "start_time": "10:00", "end_time": "12:00"}])
+        book(client, auth_headers, test_store, datetime.combine(day, datetime.min.time()).replace(hour=10))
+
+        self.publish(client, admin_auth_headers, provider, weekly=[{"weekday": 2, "start_time": "09:00", "end_time": "18:00"}])
+
+        assert db_session.query(Appointment).one().time_slot.service_id == haircut["service"].service_id
+
+    def test_customers_cannot_publish(self, client, auth_headers, haircut):
+        response = self.publish(client, auth_headers, haircut["provider"], weekly=[])
+
+        assert response.status_code == 403
+
+    def test_extend_generates_only_missing_days(self, db_session, haircut, utc_store_hours):
+        from app.core.schedules import extend_slot_horizons, materialize_slots, store_today
+        from app.models.models import ProviderSchedule, TimeSlot
+
+        provider = haircut["provider"]
+        db_session.add_all(ProviderSchedule(provider_id=provider.provider_id, weekday=d, start_time=datetime.min.time().replace(hour=9), end_time=datetime.min.time().replace(hour=17)) for d in range(7))
+        db_session.flush()
+        today = store_today()
+        materialize_slots(db_session, provider, today, today + timedelta(days=4))
+        db_session.commit()
+
+        created = extend_slot_horizons(db_session, horizon_days=10)
+
+        assert created == {provider.provider_id: 5}
+        assert db_session.query(TimeSlot).count() == 10
+        assert provider.slots_generated_until == today + timedelta(days=9)
+
+
+@pytest.fixture
+def booked_week(client, auth_headers, test_store, haircut, utc_store_hours):
+    """Three bookings over two days and one the following week."""
+    times = [datetime(2030, 3, 4, 10), datetime(2030, 3, 4, 14), datetime(2030, 3, 5, 9), datetime(2030, 3, 12, 9)]
+    return [book(client, auth_headers, test_store, when).json()["appointment_id"] for when in times]
+
+
+class TestAppointmentCalendar:
+    """Component tests for range-filtered listings and the calendar view."""
+
+    def test_store_listing_is_range_filtered_ordered_and_paginated(self, client, auth_headers, test_store, booked_week):
+        url = f"/api/appointments/store/{test_store.store_id}"
+
+        week = client.get(url, params={"date_from": "2030-03-04", "date_to": "2030-03-10"}, headers=auth_headers).json()
+        page = client.get(url, params={"limit": 2, "offset": 1}, headers=auth_headers).json()
+        last = client.get(url, params={"limit": 2, "offset": page["next_offset"]}, headers=auth_headers).json()
+
+        assert [a["appointment_id"] for a in week["items"]] == booked_week[:3]
+        assert week["items"][0]["barber_name"] == "John" and week["items"][0]["service_name"] == "Haircut"
+        assert [a["appointment_id"] for a in page["items"]] == booked_week[1:3]
+        assert (page["total"], page["has_more"], page["next_offset"]) == (4, True, 3)
+        assert [a["appointment_id"] for a in last["items"]] == booked_week[3:]
+        assert (last["total"], last["has_more"], last["next_offset"]) == (4, False, None)
+
+    def test_listing_puts_upcoming_before_past(self, client, auth_headers, db_session, test_store, test_user, booked_week):
+        from app.models.models import Appointment
+
+        now = datetime.now()
+        past = [
+            Appointment(customer_id=test_user.id, store_id=test_store.store_id, legacy_booking_date=now - timedelta(days=days))
+            for days in (30, 2)
+        ]
+        db_session.add_all(past)
+        db_session.commit()
+
+        response = client.get("/api/appointments/my-appointments", params={"limit": 5}, headers=auth_headers).json()
+
+        # Soonest upcoming first, then the most recent past booking
+        assert [a["appointment_id"] for a in response["items"]] == booked_week + [past[1].appointment_id]
+        assert (response["total"], response["has_more"]) == (6, True)
+
+    def test_listing_query_count_does_not_grow_with_rows(self, client, auth_headers, test_store, booked_week):
+        from sqlalchemy import event
+        from tests.conftest import engine
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = client.get(f"/api/appointments/store/{test_store.store_id}", headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(response.json()["items"]) == 4
+        appointment_selects = [s for s in statements if "FROM \"APPOINTMENT\"" in s]
+        assert len(appointment_selects) == 1
+        # Slot, service and provider come from the same statement, not per-row lazy loads
+        assert not [s for s in statements if s.split("FROM", 1)[-1].lstrip().startswith(('"TIME_SLOT"', '"SERVICE"', '"SERVICE_PROVIDER"'))]
+
+    def test_calendar_groups_by_day(self, client, auth_headers, test_store, booked_week):
+        response = client.get(
+            f"/api/appointments/store/{test_store.store_id}/calendar",
+            params={"date_from": "2030-03-01", "date_to": "2030-03-07"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        days = response.json()
+        assert [d["date"] for d in days] == ["2030-03-04", "2030-03-05"]
+        assert [a["appointment_id"] for a in days[0]["appointments"]] == booked_week[:2]
+        first = days[0]["appointments"][0]
+        assert first["start"].startswith("2030-03-04T10:00:00") and first["end"].startswith("2030-03-04T10:45:00")
+
+    def test_my_calendar_range_is_bounded(self, client, auth_headers):
+        response = client.get(
+            "/api/appointments/my-appointments/calendar",
+            params={"date_from": "2030-01-01", "date_to": "2030-12-31"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+
+class TestBookingRegistry:
+    """Component tests for booking by id and the cached provider/service lookup."""
+
+    def test_booking_by_ids(self, client, auth_headers, test_store, haircut, utc_store_hours):
+        response = client.post(
+            "/api/appointments/",
+            json={
+                "store_id": test_store.store_id,
+                "provider_id": haircut["provider"].provider_id,
+                "service_id": haircut["service"].service_id,
+                "booking_date": datetime(2030, 3, 4, 10).isoformat(),
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert (response.json()["barber_name"], response.json()["service_name"]) == ("John", "Haircut")
+
+    def test_names_match_case_and_whitespace_insensitively(self, client, auth_headers, db_session, test_store, haircut, utc_store_hours):
+        from app.models.models import ServiceProvider
+
+        response = book(client, auth_headers, test_store, datetime(2030, 3, 4, 10), barber=" john ", service="HAIRCUT")
+
+        assert response.status_code == 200
+        assert db_session.query(ServiceProvider).count() == 1
+
+    def test_unknown_ids_are_rejected_and_names_fall_back_across_stores(self, client, auth_headers, db_session, test_store, haircut, utc_store_hours):
+        from app.models.models import Service, Store
+
+        other = Store(store_name="Other", store_type="barber")
+        db_session.add(other)
+        db_session.commit()
+        db_session.add(Service(service_name="Beard Trim", service_price=10.00, store_id=other.store_id))
+        db_session.commit()
+        payload = {"store_id": test_store.store_id, "barber_name": "John", "booking_date": datetime(2030, 3, 4, 10).isoformat()}
+
+        by_name = client.post("/api/appointments/", json={**payload, "service_name": "Beard Trim"}, headers=auth_headers)
+        by_id = client.post("/api/appointments/", json={**payload, "service_id": 999}, headers=auth_headers)
+        missing = client.post("/api/appointments/", json={"store_id": test_store.store_id, "service_name": "Haircut"}, headers=auth_headers)
+
+        unknown_name = client.post("/api/appointments/", json={**payload, "service_name": "Perm"}, headers=auth_headers)
+
+        # Legacy clients book by name only, as the baseline allowed
+        assert by_name.status_code == 200 and by_name.json()["service_name"] == "Beard Trim"
+        assert (by_id.status_code, unknown_name.status_code) == (400, 400)
+        assert missing.status_code == 422
+
+    def test_new_service_invalidates_the_store_entry(self, client, auth_headers, admin_auth_headers, test_store, haircut, utc_store_hours):
+        assert book(client, auth_headers, test_store, datetime(2030, 3, 4, 10)).status_code == 200
+
+        created = client.post(
+            "/api/services/",
+            json={
+                "service_name": "Shave", "service_desc": "Hot towel shave", "service_price": 15.00,
+                "image_url": "", "store_id": test_store.store_id, "duration_minutes": 30,
+            },
+            headers=admin_auth_headers,
+        )
+        response = book(client, auth_headers, test_store, datetime(2030, 3, 4, 12), service="Shave")
+
+        assert created.status_code == 200
+        assert response.status_code == 200
+
+    def test_repeat_bookings_skip_name_lookups(self, client, auth_headers, test_store, haircut, utc_store_hours):
+        from sqlalchemy import event
+        from tests.conftest import engine
+
+        book(client, auth_headers, test_store, datetime(2030, 3, 4, 10))
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = book(client, auth_headers, test_store, datetime(2030, 3, 4, 12))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert response.status_code == 200
+        assert not [s for s in statements if '"SERVICE"."SERVICE_NAME" =' in s or '"SERVICE_PROVIDER"."NAME" =' in s]
@@ -0,0 +1,308 @@
+"""
+Component tests for Messaging API endpoints.
+"""
+import asyncio
+import pytest
+
+
+@pytest.fixture
+def conversation(db_session, test_user, test_vendor):
+    """Create three unread messages from the vendor to the customer."""
+    from app.models.models import Message
+
+    vendor = test_vendor["user"]
+    messages = []
+    for text in ["Hello", "Your order is ready", "See you soon"]:
+        message = Message(sender_id=vendor.id, receiver_id=test_user.id, content=text)
+        db_session.add(message)
+        db_session.commit()
+        db_session.refresh(message)
+        messages.append(message)
+    return {"sender": vendor, "reader": test_user, "messages": messages}
+
+
+@pytest.fixture
+def no_receipt_window(monkeypatch):
+    """Flush read receipts without waiting for the coalescing window."""
+    from app.api.v1.messages import read_receipts
+    from tests.conftest import TestingSessionLocal
+    monkeypatch.setattr(read_receipts, "window_seconds", 0)
+    monkeypatch.setattr(read_receipts, "session_factory", TestingSessionLocal)
+    return read_receipts
+
+
+class TestReadReceipts:
+    """Component tests for batched read receipts."""
+
+    def test_mark_read_respects_high_water_mark(self, client, auth_headers, db_session, conversation, no_receipt_window):
+        """Only messages up to the given id are marked as read."""
+        messages = conversation["messages"]
+        response = client.put(
+            f"/api/messages/read/{conversation['sender'].id}",
+            params={"up_to_id": messages[1].id},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+
+        db_session.expire_all()
+        assert [m.is_read for m in messages] == [True, True, False]
+
+    def test_mark_read_without_mark_reads_everything(self, client, auth_headers, db_session, conversation, no_receipt_window):
+        """Omitting up_to_id marks the whole conversation as read."""
+        response = client.put(
+            f"/api/messages/read/{conversation['sender'].id}",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        db_session.expire_all()
+        assert all(m.is_read for m in conversation["messages"])
+
+    def test_concurrent_receipts_are_coalesced(self, db_session, conversation, no_receipt_window):
+        """Receipts submitted within one window are applied by a single flush."""
+        reader = conversation["reader"].id
+        sender = conversation["sender"].id
+        messages = conversation["messages"]
+
+        async def submit_both():
+            return await asyncio.gather(
+                no_receipt_window.submit(reader, sender, messages[0].id),
+                no_receipt_window.submit(reader, sender, messages[2].id),
+            )
+
+        flushed = asyncio.run(submit_both())
+        assert flushed == [True, False]
+
+        db_session.expire_all()
+        assert all(m.is_read for m in messages)
+
+    def test_open_ended_mark_is_pinned_at_submit(self, db_session, conversation, monkeypatch):
+        """A message arriving during the window is not marked by an earlier open-ended receipt."""
+        from app.api.v1.messages import ReadReceiptBatcher
+        from app.models.models import Message
+        from tests.conftest import TestingSessionLocal
+
+        batcher = ReadReceiptBatcher(window_seconds=0, session_factory=TestingSessionLocal)
+        reader = conversation["reader"]
+        sender = conversation["sender"]
+
+        late = []
+
+        async def message_arrives_during_window(seconds):
+            late.append(Message(sender_id=sender.id, receiver_id=reader.id, content="One more thing"))
+            db_session.add(late[0])
+            db_session.commit()
+
+        monkeypatch.setattr(asyncio, "sleep", message_arrives_during_window)
+        asyncio.run(batcher.submit(reader.id, sender.id))
+
+        db_session.expire_all()
+        assert all(m.is_read for m in conversation["messages"])
+        assert late[0].is_read is False
+
+    def test_waiters_see_a_failed_flush(self, db_session, conversation, monkeypatch):
+        """Every caller coalesced into a failed flush gets the error instead of a silent drop."""
+        from app.api.v1.messages import ReadReceiptBatcher
+        from tests.conftest import TestingSessionLocal
+
+        batcher = ReadReceiptBatcher(window_seconds=0, session_factory=TestingSessionLocal)
+        reader = conversation["reader"].id
+        sender = conversation["sender"].id
+
+        def fail(db, batch):
+            raise RuntimeError("database unavailable")
+        monkeypatch.setattr(batcher, "apply", fail)
+
+        async def submit_both():
+            return await asyncio.gather(
+                batcher.submit(reader, sender, 1),
+                batcher.submit(reader, sender, 2),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(submit_both())
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+        # The next window starts clean
+        assert batcher._pending == {} and batcher._flushed is None
+
+    def test_cancelled_first_caller_does_not_strand_the_batch(self, db_session, conversation):
+        """A disconnecting first caller neither cancels the flush nor blocks the others."""
+        from app.api.v1.messages import ReadReceiptBatcher
+        from tests.conftest import TestingSessionLocal
+
+        batcher = ReadReceiptBatcher(window_seconds=0.05, session_factory=TestingSessionLocal)
+        reader = conversation["reader"].id
+        sender = conversation["sender"].id
+        messages = conversation["messages"]
+
+        async def first_caller_disconnects():
+            first = asyncio.create_task(batcher.submit(reader, sender, messages[0].id))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(batcher.submit(reader, sender, messages[2].id))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await asyncio.wait_for(second, timeout=5)
+
+        assert asyncio.run(first_caller_disconnects()) is False
+
+        db_session.expire_all()
+        assert all(m.is_read for m in messages)
+
+
+
+class TestMessageSearch:
+    """Component tests for full-text message search."""
+
+    @pytest.fixture
+    def inbox(self, db_session, test_user, test_vendor, test_admin):
+        from app.models.models import Message
+
+        vendor = test_vendor["user"]
+        rows = [
+            (test_user.id, vendor.id, "Is the leather jacket still available?"),
+            (vendor.id, test_user.id, "Yes, the jacket comes in black and brown"),
+            (test_admin.id, vendor.id, "Please update your jacket listing"),
+            (vendor.id, test_user.id, "Pickup is at the main gate"),
+        ]
+        for sender, receiver, content in rows:
+            db_session.add(Message(sender_id=sender, receiver_id=receiver, content=content))
+        db_session.commit()
+        return vendor
+
+    def test_search_returns_highlighted_matches(self, client, auth_headers, inbox):
+        """Matching messages come back with highlighted snippets."""
+        response = client.get("/api/messages/search", params={"q": "jacket"}, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["has_more"] is False
+        assert all("<mark>jacket</mark>" in hit["snippet"] for hit in data["items"])
+
+    def test_search_is_scoped_to_own_conversations(self, client, auth_headers, test_user, inbox):
+        """Messages between other users are never returned."""
+        response = client.get("/api/messages/search", params={"q": "listing"}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+
+    def test_search_requires_all_terms_and_supports_prefixes(self, client, auth_headers, inbox):
+        """Every term must match and terms match as prefixes."""
+        response = client.get("/api/messages/search", params={"q": "jack brown"}, headers=auth_headers)
+        items = response.json()["items"]
+        assert len(items) == 1
+        assert "brown" in items[0]["content"]
+
+    def test_search_paginates(self, client, auth_headers, inbox):
+        """limit/offset page through results and report has_more."""
+        first = client.get("/api/messages/search", params={"q": "jacket", "limit": 1}, headers=auth_headers).json()
+        second = client.get("/api/messages/search", params={"q": "jacket", "limit": 1, "offset": 1}, headers=auth_headers).json()
+        assert first["has_more"] is True
+        assert second["has_more"] is False
+        assert first["items"][0]["id"] != second["items"][0]["id"]
+
+    def test_search_ignores_query_operators(self, client, auth_headers, inbox):
+        """Raw FTS syntax in the query is treated as plain text."""
+        response = client.get("/api/messages/search", params={"q": 'jacket"* -('}, headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 2
+
+    def test_search_snippets_escape_message_markup(self, client, auth_headers, test_user, inbox, db_session):
+        """Message text is HTML-escaped; only the highlight markers are markup."""
+        from app.models.models import Message
+
+        db_session.add(Message(sender_id=inbox.id, receiver_id=test_user.id,
+                               content='<script>alert(1)</script> parcel <b>ready</b>'))
+        db_session.commit()
+        response = client.get("/api/messages/search", params={"q": "parcel"}, headers=auth_headers)
+        snippet = response.json()["items"][0]["snippet"]
+        assert "<script>" not in snippet and "<b>" not in snippet
+        assert "&lt;script&gt;" in snippet
+        assert "<mark>parcel</mark>" in snippet
+
+    def test_fallback_highlight_escapes_message_markup(self):
+        """The Python highlighter used off SQLite escapes text around the markers too."""
+        from app.db.message_index import highlight
+
+        snippet = highlight('<img src=x onerror=alert(1)> jacket & "scarf"', ["jacket"])
+        assert snippet == '&lt;img src=x onerror=alert(1)&gt; <mark>jacket</mark> &amp; &quot;scarf&quot;'
+
+
+class TestMessageNotifications:
+    """Chat notifications are coalesced per (receiver, sender)."""
+
+    def notifications_for(self, db_session, user):
+        from app.models.models import Notification
+        db_session.expire_all()
+        return db_session.query(Notification).filter(Notification.user_id == user.id).order_by(Notification.id).all()
+
+    def test_consecutive_messages_share_one_notification(self, client, auth_headers, db_session, test_user, test_vendor):
+        receiver = test_vendor["user"]
+        for text in ["Hi", "Are you open?", "Hello?"]:
+            response = client.post("/api/messages/", json={"receiver_id": receiver.id, "content": text}, headers=auth_headers)
+            assert response.status_code == 200
+
+        notifications = self.notifications_for(db_session, receiver)
+
+        assert len(notifications) == 1
+        assert notifications[0].occurrences == 3
+        assert notifications[0].related_id == test_user.id
+        assert notifications[0].message.startswith("You received 3 messages from")
+
+    def test_message_after_read_starts_new_notification(self, client, auth_headers, db_session, test_vendor):
+        receiver = test_vendor["user"]
+        client.post("/api/messages/", json={"receiver_id": receiver.id, "content": "First"}, headers=auth_headers)
+        first = self.notifications_for(db_session, receiver)[0]
+        first.is_read = True
+        db_session.commit()
+
+        client.post("/api/messages/", json={"receiver_id": receiver.id, "content": "Second"}, headers=auth_headers)
+
+        assert [(n.is_read, n.occurrences) for n in self.notifications_for(db_session, receiver)] == [(True, 1), (False, 1)]
+
+    def test_websocket_messages_push_updated_notification(self, client, auth_headers, vendor_auth_headers, db_session, test_user, test_vendor):
+        receiver = test_vendor["user"]
+        sender_token = auth_headers["Authorization"].split(" ", 1)[1]
+        receiver_token = vendor_auth_headers["Authorization"].split(" ", 1)[1]
+
+        with client.websocket_connect(f"/api/messages/ws?token={receiver_token}") as inbox, \
+                client.websocket_connect(f"/api/messages/ws?token={sender_token}") as outbox:
+            frames = []
+            for text in ["One", "Two"]:
+                outbox.send_json({"receiver_id": receiver.id, "content": text})
+                frames += [inbox.receive_json(), inbox.receive_json()]
+                outbox.receive_json()  # echo
+
+        pushed = [f["notification"] for f in frames if f.get("type") == "notification"]
+        assert [n["occurrences"] for n in pushed] == [1, 2]
+        assert pushed[0]["id"] == pushed[1]["id"]
+        assert len(self.notifications_for(db_session, receiver)) == 1
+
+    def test_open_socket_does_not_hold_a_pooled_connection(self, client, auth_headers, db_session, test_vendor):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import QueuePool
+        from app.db.database import get_db
+        from app.main import app
+        from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+        pooled = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=QueuePool)
+        PooledSession = sessionmaker(autocommit=False, autoflush=False, bind=pooled)
+
+        def pooled_db():
+            db = PooledSession()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = pooled_db
+        token = auth_headers["Authorization"].split(" ", 1)[1]
+        try:
+            with client.websocket_connect(f"/api/messages/ws?token={token}") as ws:
+                ws.send_json({"receiver_id": test_vendor["user"].id, "content": "Hello"})
+                ws.receive_json()  # echo, sent after the frame's session is closed
+                assert pooled.pool.checkedout() == 0
+        finally:
+            pooled.dispose()
+
+        assert len(self.notifications_for(db_session, test_vendor["user"])) == 1
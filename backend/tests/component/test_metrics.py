@@ -0,0 +1,86 @@
+"""
+Component tests for the Prometheus /metrics endpoint.
+"""
+import re
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import get_password_hash
+
+
+def scrape(client, **kwargs):
+    response = client.get("/metrics", **kwargs)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    return response.text
+
+
+def sample(text, name, **labels):
+    """Value of the sample `name` with exactly these labels, or None."""
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = "^" + re.escape(f"{name}{{{rendered}}}" if labels else name) + r" (\S+)$"
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class TestMetrics:
+    """Component tests for the metrics endpoint and middleware."""
+
+    def setup_method(self):
+        metrics.route_latency.reset()
+
+    def test_latency_is_labelled_by_route_template(self, client, test_product):
+        client.get(f"/api/products/{test_product.product_id}")
+        client.get(f"/api/products/{test_product.product_id}")
+        client.get("/api/does-not-exist")
+
+        text = scrape(client)
+
+        labels = {"method": "GET", "route": "/api/products/{product_id}"}
+        assert sample(text, "pbl_http_request_duration_seconds_count", **labels) == 2
+        assert sample(text, "pbl_http_request_duration_seconds_bucket", **labels, le="+Inf") == 2
+        assert sample(text, "pbl_http_request_duration_seconds_count", method="GET", route="<unmatched>") == 1
+        assert str(test_product.product_id) not in re.findall(r'route="([^"]*)"', text)
+
+    def test_buckets_are_cumulative(self):
+        histogram = metrics.Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+
+        counts, total = histogram.cumulative()
+
+        assert counts == [2, 3, 4]
+        assert total == 5.65
+
+    def test_scrape_counts_itself_in_flight(self, client):
+        text = scrape(client)
+
+        assert sample(text, "pbl_http_requests_in_flight") == 1
+        assert "# TYPE pbl_http_requests_in_flight gauge" in text
+
+    def test_pool_threadpool_and_websocket_families(self, client):
+        text = scrape(client)
+
+        assert sample(text, "pbl_db_pool_checkout_wait_seconds_count", pool="primary") is not None
+        assert sample(text, "pbl_threadpool_size") > 0
+        assert sample(text, "pbl_websocket_connections") == 0
+        assert sample(text, "pbl_websocket_users_by_sockets", sockets="4+") == 0
+
+    def test_password_hashing_is_timed(self, client):
+        before = sample(scrape(client), "pbl_password_hash_seconds_count", operation="hash")
+
+        get_password_hash("secret123")
+
+        assert sample(scrape(client), "pbl_password_hash_seconds_count", operation="hash") == before + 1
+
+    def test_token_is_required_when_configured(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        scrape(client, headers={"Authorization": "Bearer scrape-me"})
+
+    def test_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+
+        assert client.get("/metrics").status_code == 404
@@ -0,0 +1,189 @@
+"""
+Component tests for Notification API endpoints and push delivery.
+"""
+import pytest
+
+
+def add_notification(db_session, user, title="Order shipped"):
+    from app.models.models import Notification
+
+    notification = Notification(user_id=user.id, title=title, message=f"{title}!", type="order", related_id=1)
+    db_session.add(notification)
+    db_session.commit()
+    db_session.refresh(notification)
+    return notification
+
+
+@pytest.fixture
+def ws_token(auth_headers):
+    return auth_headers["Authorization"].split(" ", 1)[1]
+
+
+class TestNotificationPush:
+    """Notifications are pushed over /api/messages/ws once committed."""
+
+    def test_committed_notification_is_pushed(self, client, db_session, test_user, ws_token):
+        with client.websocket_connect(f"/api/messages/ws?token={ws_token}") as ws:
+            notification = add_notification(db_session, test_user)
+
+            frame = ws.receive_json()
+
+        assert frame["type"] == "notification"
+        assert frame["notification"]["id"] == notification.id
+        assert frame["notification"]["title"] == "Order shipped"
+        assert frame["notification"]["is_read"] is False
+        assert frame["notification"]["created_at"]
+
+    def test_rolled_back_notification_is_discarded(self, db_session, test_user, monkeypatch):
+        from app.core import realtime
+        from app.models.models import Notification
+
+        monkeypatch.setitem(realtime.manager.active_connections, test_user.id, [])
+        pushed = []
+        monkeypatch.setattr(realtime.manager, "push_threadsafe", lambda frame, user_id: pushed.append(frame))
+
+        db_session.add(Notification(user_id=test_user.id, title="Draft", message="Draft", type="system"))
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert pushed == []
+        assert realtime._PENDING_KEY not in db_session.info
+
+    def test_offline_users_are_not_serialized(self, db_session, test_user):
+        from app.core import realtime
+
+        add_notification(db_session, test_user)
+
+        assert realtime._PENDING_KEY not in db_session.info
+
+
+class TestNotificationDelta:
+    """Tests for the reconnect catch-up endpoint."""
+
+    def test_returns_newer_notifications_oldest_first(self, client, auth_headers, db_session, test_user, test_vendor):
+        first = add_notification(db_session, test_user, "First")
+        second = add_notification(db_session, test_user, "Second")
+        third = add_notification(db_session, test_user, "Third")
+        add_notification(db_session, test_vendor["user"], "Not yours")
+
+        response = client.get("/api/notifications/delta", params={"since_id": first.id}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert [n["id"] for n in response.json()] == [second.id, third.id]
+
+    def test_limit_pages_by_last_id(self, client, auth_headers, db_session, test_user):
+        ids = [add_notification(db_session, test_user, f"N{i}").id for i in range(3)]
+
+        page = client.get("/api/notifications/delta", params={"limit": 2}, headers=auth_headers).json()
+        rest = client.get("/api/notifications/delta", params={"since_id": page[-1]["id"]}, headers=auth_headers).json()
+
+        assert [n["id"] for n in page + rest] == ids
+
+    def test_cursor_returns_notifications_updated_in_place(self, client, auth_headers, vendor_auth_headers, db_session, test_vendor):
+        vendor = test_vendor["user"]
+        client.post("/api/messages/", json={"receiver_id": vendor.id, "content": "Hi"}, headers=auth_headers)
+        seen = client.get("/api/notifications/delta", headers=vendor_auth_headers).json()[-1]
+        other = add_notification(db_session, vendor, "Order shipped")
+
+        # A repeat message bumps the notification the client already has
+        client.post("/api/messages/", json={"receiver_id": vendor.id, "content": "Still there?"}, headers=auth_headers)
+        cursor = {"since": seen["updated_at"], "since_id": seen["id"]}
+        changed = client.get("/api/notifications/delta", params=cursor, headers=vendor_auth_headers).json()
+        page = client.get("/api/notifications/delta", params={**cursor, "limit": 1}, headers=vendor_auth_headers).json()
+        rest = client.get(
+            "/api/notifications/delta",
+            params={"since": page[-1]["updated_at"], "since_id": page[-1]["id"]},
+            headers=vendor_auth_headers,
+        ).json()
+
+        assert [n["id"] for n in changed] == [other.id, seen["id"]]
+        assert changed[-1]["occurrences"] == 2 and changed[-1]["message"].startswith("You received 2 messages")
+        assert [n["id"] for n in page + rest] == [other.id, seen["id"]]
+
+
+class TestUnreadCount:
+    """Tests for the navbar badge counter."""
+
+    def test_counts_only_own_unread_notifications(self, client, auth_headers, db_session, test_user, test_vendor):
+        read = add_notification(db_session, test_user, "Seen")
+        add_notification(db_session, test_user, "New")
+        add_notification(db_session, test_user, "Newer")
+        add_notification(db_session, test_vendor["user"], "Not yours")
+        read.is_read = True
+        db_session.commit()
+
+        response = client.get("/api/notifications/unread-count", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"unread_count": 2}
+
+    def test_mark_all_as_read_resets_count(self, client, auth_headers, db_session, test_user):
+        add_notification(db_session, test_user)
+
+        client.put("/api/notifications/read-all", headers=auth_headers)
+
+        assert client.get("/api/notifications/unread-count", headers=auth_headers).json() == {"unread_count": 0}
+
+
+class TestNotificationListing:
+    """Tests for keyset paging and bulk read."""
+
+    def test_pages_newest_first_without_gaps_or_duplicates(self, client, auth_headers, db_session, test_user):
+        from datetime import datetime, timedelta
+        from app.models.models import Notification
+
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        # Two pairs share a timestamp, so ordering must fall back to id
+        for i, offset in enumerate([0, 1, 1, 2, 3, 3, 4]):
+            db_session.add(Notification(
+                user_id=test_user.id, title=f"N{i}", message="m", type="order",
+                created_at=base + timedelta(minutes=offset),
+            ))
+        db_session.commit()
+        expected = [n.id for n in db_session.query(Notification).order_by(Notification.created_at.desc(), Notification.id.desc())]
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"before": cursor} if cursor else {})}
+            page = client.get("/api/notifications/", params=params, headers=auth_headers).json()
+            seen += [n["id"] for n in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == expected
+
+    def test_cursor_survives_its_row_being_deleted_or_bumped(self, client, auth_headers, db_session, test_user):
+        from datetime import datetime, timedelta
+        from app.models.models import Notification
+
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        rows = [Notification(user_id=test_user.id, title=f"N{i}", message="m", type="order", created_at=base - timedelta(minutes=i)) for i in range(4)]
+        db_session.add_all(rows)
+        db_session.commit()
+
+        first = client.get("/api/notifications/", params={"limit": 2}, headers=auth_headers).json()
+        # The anchor row disappears (retention) and another one is bumped to the top
+        db_session.delete(rows[1])
+        rows[0].created_at = base + timedelta(hours=1)
+        db_session.commit()
+        second = client.get("/api/notifications/", params={"limit": 2, "before": first["next_cursor"]}, headers=auth_headers).json()
+
+        assert [n["id"] for n in second["items"]] == [rows[2].id, rows[3].id]
+        assert second["next_cursor"] is None
+
+    def test_invalid_cursor_is_rejected(self, client, auth_headers):
+        response = client.get("/api/notifications/", params={"before": "not-a-cursor"}, headers=auth_headers)
+
+        assert response.status_code == 400
+
+    def test_mark_all_as_read_returns_affected_count(self, client, auth_headers, db_session, test_user):
+        add_notification(db_session, test_user, "One")
+        add_notification(db_session, test_user, "Two")
+
+        first = client.put("/api/notifications/read-all", headers=auth_headers)
+        second = client.put("/api/notifications/read-all", headers=auth_headers)
+
+        assert first.json() == {"updated": 2}
+        assert second.json() == {"updated": 0}
@@ -152,3 +152,34 @@ class TestProductImageUpload:
         )
         assert response.status_code == 200
         assert "url" in response.json()
+
+
+class TestAsyncReadRoutes:
+    """Component tests for the catalog reads served from AsyncSession."""
+
+    def test_catalog_reads_are_async_handlers(self):
+        from app.main import app
+
+        handlers = {
+            (route.path, route.endpoint.__name__)
+            for route in app.routes
+            if getattr(route, "methods", None) and "GET" in route.methods
+        }
+
+        assert ("/api/products/", "get_products_async") in handlers
+        assert ("/api/products/{product_id}", "get_product_async") in handlers
+        assert ("/api/stores/", "get_stores_async") in handlers
+
+    def test_product_relationships_are_eager_loaded(self, client, db_session, test_product, test_category, test_store):
+        from app.models.models import ProductImage
+
+        db_session.add(ProductImage(product_id=test_product.product_id, image_url="/uploads/red.jpg", color="red"))
+        db_session.commit()
+
+        listed = client.get(f"/api/products?store_id={test_store.store_id}").json()[0]
+        single = client.get(f"/api/products/{test_product.product_id}").json()
+
+        for data in (listed, single):
+            assert data["category"]["category_id"] == test_category.category_id
+            assert data["store"]["store_name"] == test_store.store_name
+            assert [img["color"] for img in data["images_rel"]] == ["red"]
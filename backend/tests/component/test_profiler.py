@@ -0,0 +1,98 @@
+"""
+Component tests for the sampling profiler.
+"""
+import threading
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.core.profiler import Profile, profiler
+
+
+def busy_endpoint(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestProfile:
+    """Sampling and attribution without a server."""
+
+    def test_threadpool_stacks_are_attributed_by_endpoint(self):
+        route = SimpleNamespace(endpoint=busy_endpoint, methods={"GET"}, path="/api/busy")
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_endpoint, args=(stop,))
+        worker.start()
+        profile = Profile([route], interval=0.005)
+        try:
+            for _ in range(5):
+                profile.sample()
+        finally:
+            stop.set()
+            worker.join()
+
+        stacks = profile.collapsed().splitlines()
+        assert profile.samples == 5
+        assert stacks
+        # Root frame is the route; idle threads (pytest's own) are dropped
+        assert all(line.startswith("GET /api/busy;") for line in stacks)
+        assert any("busy_endpoint (tests/component/test_profiler.py:" in line for line in stacks)
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in stacks) == 5
+
+
+class TestProfilerEndpoints:
+    """Component tests for the admin profile endpoints and the X-Profile header."""
+
+    def test_worker_profile_returns_collapsed_file(self, client, admin_auth_headers):
+        response = client.post("/api/admin/profile?seconds=0.05", headers=admin_auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.headers["content-disposition"].endswith('.collapsed"')
+        assert int(response.headers["x-profile-samples"]) > 0
+        assert profiler.running is None
+
+    def test_one_profile_at_a_time(self, client, admin_auth_headers, monkeypatch):
+        monkeypatch.setattr(profiler, "running", object())
+
+        response = client.post("/api/admin/profile?seconds=0.05", headers=admin_auth_headers)
+
+        assert response.status_code == 409
+
+    def test_admin_only(self, client, auth_headers):
+        assert client.post("/api/admin/profile?seconds=0.05", headers=auth_headers).status_code == 403
+        assert client.get("/api/admin/profile/requests/abc", headers=auth_headers).status_code == 403
+
+    def test_seconds_are_capped(self, client, admin_auth_headers):
+        response = client.post(
+            f"/api/admin/profile?seconds={settings.PROFILER_MAX_SECONDS + 1}", headers=admin_auth_headers
+        )
+
+        assert response.status_code == 422
+
+    def test_profile_header_profiles_one_request(self, client, test_user, admin_auth_headers, monkeypatch):
+        monkeypatch.setattr(settings, "PROFILER_REQUEST_TOKEN", "let-me-profile")
+
+        response = client.post(
+            "/api/v1/auth/token",
+            data={"username": test_user.email, "password": "testpassword123"},
+            headers={"X-Profile": "let-me-profile"},
+        )
+        profile = client.get(f"/api/admin/profile/requests/{response.headers['x-profile-id']}", headers=admin_auth_headers)
+
+        assert response.status_code == 200
+        assert profile.status_code == 200
+        stacks = profile.text.splitlines()
+        assert all(line.startswith("POST /api/v1/auth/token;") for line in stacks)
+        # bcrypt dominates the login
+        assert any(";verify_password (app/core/security.py:" in line for line in stacks)
+
+    def test_profile_header_needs_the_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "PROFILER_REQUEST_TOKEN", "let-me-profile")
+
+        response = client.get("/api/products/", headers={"X-Profile": "guess"})
+
+        assert "x-profile-id" not in response.headers
+
+    def test_unknown_request_profile(self, client, admin_auth_headers):
+        response = client.get("/api/admin/profile/requests/missing", headers=admin_auth_headers)
+
+        assert response.status_code == 404
@@ -0,0 +1,99 @@
+"""
+Component tests for per-request SQL statement counting.
+"""
+import logging
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.query_stats import query_stats, track_queries
+from app.models.models import Product
+
+
+def add_products(db_session, store, category, count):
+    for i in range(count):
+        db_session.add(Product(
+            product_name=f"Product {i}", product_price=10, stock_quantity=1, status="active",
+            store_id=store.store_id, category_id=category.category_id,
+        ))
+    db_session.commit()
+
+
+def route_stats(route):
+    return next(row for row in query_stats.snapshot() if row["route"] == route)
+
+
+class TestQueryStats:
+    """Component tests for the query stats middleware."""
+
+    def setup_method(self):
+        query_stats.reset()
+
+    def test_product_list_statements_do_not_grow_with_rows(self, client, db_session, test_store, test_category):
+        add_products(db_session, test_store, test_category, 2)
+        client.get("/api/products/")
+        few = route_stats("GET /api/products/")["statements_max"]
+
+        add_products(db_session, test_store, test_category, 8)
+        query_stats.reset()
+        client.get("/api/products/")
+        many = route_stats("GET /api/products/")["statements_max"]
+
+        assert few > 0
+        assert many == few
+
+    def test_aggregates_are_keyed_by_route_template(self, client, test_product):
+        client.get(f"/api/products/{test_product.product_id}")
+        client.get(f"/api/products/{test_product.product_id}")
+
+        stats = route_stats("GET /api/products/{product_id}")
+
+        assert stats["requests"] == 2
+        assert stats["statements_avg"] >= 1
+        assert stats["slowest_statement"].startswith("SELECT")
+
+    def test_server_timing_header_only_in_debug(self, client, monkeypatch):
+        assert "server-timing" not in client.get("/api/products/").headers
+
+        monkeypatch.setattr(settings, "DEBUG", True)
+        header = client.get("/api/products/").headers["server-timing"]
+
+        assert header.startswith("db;dur=")
+        assert "statements" in header and "app;dur=" in header
+
+    def test_slow_statements_are_logged_with_route(self, client, test_product, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+
+        with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+            client.get(f"/api/products/{test_product.product_id}")
+
+        assert "Slow query" in caplog.text
+        assert "/api/products/{product_id}" in caplog.text
+
+    def test_statement_heavy_requests_are_logged(self, client, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "REQUEST_QUERY_WARN_COUNT", 0.5)
+
+        with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+            client.get("/api/products/")
+
+        assert "GET /api/products/ issued" in caplog.text
+
+    def test_track_queries_outside_requests(self, db_session):
+        with track_queries() as queries:
+            db_session.execute(text("SELECT 1"))
+            db_session.execute(text("SELECT 2"))
+
+        assert queries.count == 2
+        assert queries.seconds >= queries.slowest_seconds > 0
+
+    def test_admin_endpoint(self, client, admin_auth_headers, auth_headers):
+        client.get("/api/products/")
+
+        response = client.get("/api/admin/query-stats", headers=admin_auth_headers)
+        assert response.status_code == 200
+        assert "GET /api/products/" in {row["route"] for row in response.json()}
+
+        assert client.get("/api/admin/query-stats", headers=auth_headers).status_code == 403
+        assert client.delete("/api/admin/query-stats", headers=admin_auth_headers).status_code == 204
+        # Only the reset request itself remains
+        assert [row["route"] for row in query_stats.snapshot()] == ["DELETE /api/admin/query-stats"]
@@ -0,0 +1,57 @@
+"""
+Component tests for read-replica routing, with a second SQLite file as the replica.
+"""
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db import replicas
+from app.db.database import Base
+from app.db.replicas import ReplicaSet
+from app.models.models import Product, Review
+
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path, test_store):
+    """A replica holding one stale review and one product for the test store's id."""
+    replica_set = ReplicaSet([f"sqlite:///{tmp_path / 'replica.db'}"], check_interval=60)
+    engine = replica_set.replicas[0].engine
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.add(Review(customer_id=999, customer_name="Replica", store_id=test_store.store_id, rating=3, comment="stale"))
+        db.add(Product(product_name="Replica Product", product_price=1.0, store_id=test_store.store_id))
+        db.commit()
+    monkeypatch.setattr(replicas, "replica_set", replica_set)
+    yield replica_set
+    engine.dispose()
+
+
+class TestReadReplicaRouting:
+    """Reads go to the replica; a user's reads return to the primary after they write."""
+
+    def test_anonymous_reads_use_the_replica(self, client, test_store, replica):
+        reviews = client.get("/api/reviews/", params={"store_id": test_store.store_id}).json()
+        products = client.get("/api/products/").json()
+
+        assert [r["comment"] for r in reviews] == ["stale"]
+        assert [p["product_name"] for p in products] == ["Replica Product"]
+
+    def test_writer_is_pinned_to_the_primary(self, client, auth_headers, test_store, replica):
+        created = client.post(
+            "/api/reviews/",
+            json={"store_id": test_store.store_id, "rating": 5, "comment": "fresh"},
+            headers=auth_headers,
+        )
+
+        own_view = client.get("/api/reviews/", params={"store_id": test_store.store_id}, headers=auth_headers).json()
+        anonymous_view = client.get("/api/reviews/", params={"store_id": test_store.store_id}).json()
+
+        assert created.status_code == 200
+        assert [r["comment"] for r in own_view] == ["fresh"]
+        assert [r["comment"] for r in anonymous_view] == ["stale"]
+
+    def test_unhealthy_replica_falls_back_to_primary(self, client, monkeypatch, test_store, test_product):
+        monkeypatch.setattr(replicas, "replica_set", ReplicaSet(["sqlite:////nonexistent/dir/replica.db"], check_interval=60))
+
+        products = client.get("/api/products/").json()
+
+        assert [p["product_name"] for p in products] == [test_product.product_name]
@@ -4,16 +4,28 @@ Pytest configuration and fixtures for backend testing.
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
+from app.core.config import settings
+from app.db.async_session import get_async_db
 from app.db.database import Base, get_db
+from app.core.booking_registry import booking_registry
+from app.db.replicas import primary_pins
 from app.core.security import get_password_hash
 from app.models.models import User, UserRole, UserStatus, Store, Product, Category
 
-# Test database URL (in-memory SQLite for speed)
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Image derivatives are rendered in a process pool; tests call render_variants directly
+settings.IMAGE_VARIANTS_ENABLED = False
+
+# Test database URL (in-memory SQLite for speed). The named shared-cache database
+# is visible to the aiosqlite engine behind get_async_db as well; it lives as long
+# as the StaticPool connection below stays open.
+TEST_DATABASE = "file:pbl_tests?mode=memory&cache=shared&uri=true"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DATABASE}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DATABASE}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -22,6 +34,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# NullPool: TestClient runs each test on a fresh event loop, so connections are not reused
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 
 def override_get_db():
     """Override the database dependency for testing."""
@@ -42,12 +63,16 @@ def db_session():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        # Store ids are reused by the next test's fresh database
+        booking_registry.clear()
+        primary_pins.clear()
 
 
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with database override."""
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,26 @@
+"""
+Unit tests for the async engine factory.
+"""
+import pytest
+
+from sqlalchemy.engine import make_url
+
+from app.db.async_session import async_database_url
+
+
+@pytest.mark.parametrize("sync_url, async_driver", [
+    ("mysql+mysqlconnector://user:pw@db:3306/app", "mysql+aiomysql"),
+    ("mysql+pymysql://user:pw@db:3306/app", "mysql+aiomysql"),
+    ("sqlite:///./test.db", "sqlite+aiosqlite"),
+    ("postgresql://user:pw@db/app", "postgresql+asyncpg"),
+])
+def test_sync_urls_map_to_async_drivers(sync_url, async_driver):
+    url = async_database_url(sync_url)
+
+    assert url.drivername == async_driver
+    assert url.set(drivername="x") == make_url(sync_url).set(drivername="x")
+
+
+def test_unknown_backend_needs_explicit_url():
+    with pytest.raises(ValueError):
+        async_database_url("oracle://user:pw@db/app")
@@ -0,0 +1,89 @@
+"""
+Unit tests for the appointment availability engine.
+"""
+from datetime import date, datetime, timedelta
+
+from app.core import availability
+from app.core.availability import IntervalIndex, free_slots, opening_windows, to_utc_naive
+
+
+def at(hour, minute=0, day=1):
+    return datetime(2030, 1, day, hour, minute)
+
+
+class TestIntervalIndex:
+    """Tests for merging and probing busy intervals."""
+
+    def test_overlapping_and_touching_intervals_merge(self):
+        index = IntervalIndex([(at(11), at(12)), (at(10), at(11)), (at(10, 30), at(10, 45)), (at(14), at(15))])
+
+        assert list(zip(index.starts, index.ends)) == [(at(10), at(12)), (at(14), at(15))]
+
+    def test_overlaps_detects_partial_overlap_but_not_adjacency(self):
+        index = IntervalIndex([(at(10), at(11))])
+
+        assert index.overlaps(at(10, 30), at(11, 30))
+        assert index.overlaps(at(9, 30), at(10, 30))
+        assert index.overlaps(at(9), at(12))
+        assert not index.overlaps(at(11), at(12))
+        assert not index.overlaps(at(9), at(10))
+
+    def test_gaps_are_the_complement_within_a_window(self):
+        index = IntervalIndex([(at(8), at(10)), (at(12), at(13))])
+
+        assert list(index.gaps(at(9), at(14))) == [(at(10), at(12)), (at(13), at(14))]
+
+
+class TestFreeSlots:
+    """Tests for slot generation on the step grid."""
+
+    def test_slots_skip_bookings_and_stay_on_grid(self):
+        busy = IntervalIndex([(at(10), at(10, 45))])
+        slots = free_slots(busy, [(at(9), at(12))], timedelta(hours=1), timedelta(minutes=30))
+
+        assert [s for s, _ in slots] == [at(9), at(11)]
+
+    def test_past_start_times_are_not_offered(self):
+        slots = free_slots(IntervalIndex(), [(at(9), at(11))], timedelta(minutes=30), timedelta(minutes=30), not_before=at(10))
+
+        assert [s for s, _ in slots] == [at(10), at(10, 30)]
+
+    def test_opening_hours_are_converted_from_store_timezone(self, monkeypatch):
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_TIMEZONE", "Asia/Kuala_Lumpur")
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_OPENING_TIME", "09:00")
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_CLOSING_TIME", "17:00")
+
+        windows = opening_windows(date(2030, 1, 1), date(2030, 1, 2))
+
+        assert windows == [(at(1), at(9)), (at(1, day=2), at(9, day=2))]
+
+    def test_aware_datetimes_normalize_to_naive_utc(self):
+        from datetime import timezone
+        local = datetime(2030, 1, 1, 9, tzinfo=timezone(timedelta(hours=8)))
+
+        assert to_utc_naive(local) == at(1)
+
+
+class TestScheduleExpansion:
+    """Tests for turning weekly hours into working-slot rows."""
+
+    def test_exceptions_replace_or_close_a_day(self, monkeypatch):
+        from datetime import time
+        from types import SimpleNamespace
+        from app.core.schedules import slot_rows
+
+        monkeypatch.setattr(availability.settings, "APPOINTMENT_TIMEZONE", "UTC")
+        weekly = {0: [(time(9), time(12)), (time(13), time(17))], 1: [(time(9), time(17))], 2: [(time(9), time(17))]}
+        exceptions = {
+            date(2030, 1, 1): SimpleNamespace(start_time=None, end_time=None),  # Tuesday: closed
+            date(2030, 1, 2): SimpleNamespace(start_time=time(10), end_time=time(11)),  # Wednesday: short day
+        }
+
+        rows = slot_rows(5, weekly, exceptions, date(2029, 12, 31), date(2030, 1, 2))
+
+        assert [(r["start_time"], r["end_time"]) for r in rows] == [
+            (datetime(2029, 12, 31, 9), datetime(2029, 12, 31, 12)),
+            (datetime(2029, 12, 31, 13), datetime(2029, 12, 31, 17)),
+            (at(10, day=2), at(11, day=2)),
+        ]
+        assert {r["provider_id"] for r in rows} == {5}
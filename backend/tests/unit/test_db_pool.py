@@ -0,0 +1,81 @@
+"""
+Unit tests for the engine factory and pool instrumentation.
+"""
+import pytest
+from sqlalchemy import exc, text
+
+from app.db import session as db_session_module
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics
+from app.db.session import create_db_engine
+
+
+@pytest.fixture
+def small_pool(monkeypatch, tmp_path):
+    settings = db_session_module.settings
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "never")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}", metrics=PoolMetrics())
+    yield engine
+    engine.dispose()
+
+
+def test_factory_sizes_the_pool_from_settings(small_pool):
+    assert isinstance(small_pool.pool, InstrumentedQueuePool)
+    assert small_pool.pool.capacity == 2
+
+
+def test_saturation_and_timeouts_are_recorded(small_pool):
+    pool = small_pool.pool
+    first, second = small_pool.connect(), small_pool.connect()
+
+    status = pool.metrics.snapshot(pool)
+    with pytest.raises(exc.TimeoutError):
+        small_pool.connect()
+    first.close()
+    second.close()
+
+    assert status["saturation"] == 1.0
+    assert status["checkouts"] == 2 and status["peak_checked_out"] == 2
+    assert pool.metrics.snapshot(pool)["timeouts"] == 1
+
+
+def test_metrics_survive_pool_recreation(small_pool):
+    with small_pool.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    small_pool.dispose()
+    with small_pool.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert small_pool.pool.metrics.checkouts == 2
+
+
+def test_idle_strategy_replaces_connections_that_fail_the_ping(monkeypatch, small_pool, tmp_path):
+    settings = db_session_module.settings
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "idle")
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_IDLE_SECONDS", 0)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'idle.db'}", metrics=PoolMetrics())
+    pings = []
+
+    def failing_ping(dbapi_connection):
+        pings.append(dbapi_connection)
+        raise engine.dialect.dbapi.OperationalError("server has gone away")
+
+    with engine.connect() as conn:
+        first = conn.connection.dbapi_connection
+    monkeypatch.setattr(engine.dialect, "do_ping", failing_ping)
+    with engine.connect() as conn:
+        second = conn.connection.dbapi_connection
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    engine.dispose()
+
+    assert pings == [first]
+    assert second is not first
+
+
+def test_unknown_pre_ping_strategy_is_rejected(monkeypatch):
+    monkeypatch.setattr(db_session_module.settings, "DB_POOL_PRE_PING", "sometimes")
+
+    with pytest.raises(ValueError):
+        create_db_engine("sqlite:///pool.db")
@@ -0,0 +1,110 @@
+"""
+Unit tests for responsive image derivative generation.
+"""
+import io
+
+import pytest
+
+from app.core import image_variants, media_store
+from app.core.uploads import save_upload_sync
+from tests.unit.test_uploads import make_upload
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+def jpeg_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def render(stored, widths=(160, 480), formats=("webp",)):
+    return image_variants.render_variants(str(stored.path), stored.sha256, list(widths), list(formats))
+
+
+class TestRenderVariants:
+    """Tests for render_variants (the worker-side function)."""
+
+    def test_renders_each_width_below_original(self, upload_dir):
+        stored = save_upload_sync(make_upload(jpeg_bytes(1000, 500)))
+
+        rendered = render(stored)
+
+        assert [(v["width"], v["height"], v["format"]) for v in rendered] == [(160, 80, "webp"), (480, 240, "webp")]
+        for variant in rendered:
+            path = stored.path.with_name(variant["file_name"])
+            with Image.open(path) as img:
+                assert img.format == "WEBP"
+                assert img.width == variant["width"]
+
+    def test_never_upscales_small_images(self, upload_dir):
+        stored = save_upload_sync(make_upload(jpeg_bytes(300, 300)))
+
+        rendered = render(stored)
+
+        assert [v["width"] for v in rendered] == [160, 300]
+
+    def test_unsupported_formats_are_skipped(self, upload_dir):
+        stored = save_upload_sync(make_upload(jpeg_bytes(200, 200)))
+
+        rendered = render(stored, formats=("webp", "not-a-format"))
+
+        assert {v["format"] for v in rendered} == {"webp"}
+
+    def test_schedule_ignores_non_images_and_disabled_setting(self, upload_dir, monkeypatch):
+        stored = save_upload_sync(make_upload(b"%PDF", filename="menu.pdf", content_type="application/pdf"))
+        monkeypatch.setattr(image_variants.settings, "IMAGE_VARIANTS_ENABLED", True)
+        assert image_variants.schedule_variants(stored) is None
+
+        monkeypatch.setattr(image_variants.settings, "IMAGE_VARIANTS_ENABLED", False)
+        photo = save_upload_sync(make_upload(jpeg_bytes(50, 50)))
+        assert image_variants.schedule_variants(photo) is None
+
+
+class TestVariantApi:
+    """Recorded variants are exposed on catalog responses."""
+
+    def test_product_listing_includes_variants(self, client, db_session, upload_dir, test_product):
+        from app.models.models import ProductImage
+
+        stored = save_upload_sync(make_upload(jpeg_bytes(800, 400)))
+        test_product.image_url = f"http://localhost:8000{stored.url}"
+        db_session.add(ProductImage(product_id=test_product.product_id, image_url=stored.url, color="Red", is_main=True))
+        db_session.commit()
+        media_store.record_variants(db_session, stored.sha256, stored.url.rsplit("/", 1)[0], render(stored))
+
+        response = client.get("/api/products/")
+        assert response.status_code == 200
+        product = response.json()[0]
+        assert [v["width"] for v in product["image_variants"]] == [160, 480]
+        assert product["image_variants"][0]["url"].endswith(f"{stored.sha256}_160w.webp")
+        assert product["images_rel"][0]["variants"] == product["image_variants"]
+
+    def test_record_variants_is_idempotent(self, db_session, upload_dir):
+        from app.models.models import ImageVariant
+
+        stored = save_upload_sync(make_upload(jpeg_bytes(400, 400)))
+        rendered = render(stored)
+        prefix = stored.url.rsplit("/", 1)[0]
+        media_store.record_variants(db_session, stored.sha256, prefix, rendered)
+        media_store.record_variants(db_session, stored.sha256, prefix, rendered)
+
+        assert db_session.query(ImageVariant).count() == len(rendered)
+
+    def test_garbage_collection_removes_variants_with_source(self, db_session, upload_dir):
+        from app.models.models import ImageVariant
+
+        stored = save_upload_sync(make_upload(jpeg_bytes(400, 400)))
+        media_store.record_variants(db_session, stored.sha256, stored.url.rsplit("/", 1)[0], render(stored))
+
+        report = media_store.collect_garbage(db_session, grace_seconds=-60)
+
+        assert len(report.deleted) == 3
+        assert db_session.query(ImageVariant).count() == 0
@@ -0,0 +1,70 @@
+"""
+Unit tests for the index advisor and the hot-query index migration.
+"""
+from sqlalchemy import create_engine, inspect, text
+
+from app.db import migrations
+from app.db.database import Base
+from app.db.index_advisor import QueryCapture, advise, recommendations, suggest_columns, table_aliases
+
+
+def test_equality_columns_come_before_the_range_column():
+    statement = (
+        'SELECT "ORDERS"."ORDER_ID" FROM "ORDERS" WHERE "ORDERS"."ORDER_DATE" >= ? '
+        'AND "ORDERS"."STORE_ID" = ? ORDER BY "ORDERS"."ORDER_DATE" DESC'
+    )
+
+    assert suggest_columns(statement, "ORDERS") == ("STORE_ID", "ORDER_DATE")
+
+
+def test_aliases_resolve_to_tables_and_join_keys_are_a_fallback():
+    statement = (
+        'SELECT * FROM "TIME_SLOT" JOIN "APPOINTMENT" AS "APPOINTMENT_1" '
+        'ON "TIME_SLOT"."SLOT_ID" = "APPOINTMENT_1"."SLOT_ID" WHERE "TIME_SLOT"."START_TIME" > ?'
+    )
+
+    assert table_aliases(statement)["APPOINTMENT_1"] == "APPOINTMENT"
+    assert suggest_columns(statement, "APPOINTMENT_1") == ("SLOT_ID",)
+
+
+def test_like_predicates_get_no_suggestion():
+    assert suggest_columns('SELECT 1 FROM "STORE" WHERE "STORE"."IMAGE_URL" LIKE ?', "STORE") == ()
+
+
+def test_reports_scans_until_the_index_exists():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE "REVIEW" ("REVIEW_ID" INTEGER PRIMARY KEY, "STORE_ID" INTEGER, "CREATED_AT" DATETIME)'))
+
+    capture = QueryCapture()
+    capture.attach(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            conn.execute(
+                text('SELECT "REVIEW"."REVIEW_ID" FROM "REVIEW" WHERE "REVIEW"."STORE_ID" = :s ORDER BY "REVIEW"."CREATED_AT" DESC'),
+                {"s": 1},
+            )
+    capture.detach(engine)
+
+    findings = advise(list(capture.queries.values()), engine)
+    assert [(f.table, f.count) for f in findings] == [("REVIEW", 3)]
+    assert recommendations(findings) == [("REVIEW", ("STORE_ID", "CREATED_AT"), 3)]
+
+    with engine.begin() as conn:
+        conn.execute(text('CREATE INDEX ix_review_store_created ON "REVIEW" ("STORE_ID", "CREATED_AT")'))
+    assert advise(list(capture.queries.values()), engine) == []
+
+
+def test_migration_adds_missing_hot_query_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexes.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_orders_store_date"))
+        conn.execute(text("DROP INDEX ix_vendor_user"))
+    migrations.stamp(engine, 12)
+
+    migrations.upgrade(engine)
+
+    assert "ix_orders_store_date" in {i["name"] for i in inspect(engine).get_indexes("ORDERS")}
+    assert "ix_vendor_user" in {i["name"] for i in inspect(engine).get_indexes("VENDOR")}
+    assert 13 in migrations.applied_versions(engine)
@@ -0,0 +1,79 @@
+"""
+Unit tests for the content-addressed media store and its garbage collector.
+"""
+import os
+import time
+
+import pytest
+
+from app.core import media_store
+from app.core.uploads import save_upload_sync
+from tests.unit.test_uploads import make_upload
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestMediaReferences:
+    """Tests for URL parsing and reference counting."""
+
+    def test_blob_name_from_relative_and_absolute_urls(self):
+        digest = "ab" * 32
+        relative = f"/uploads/media/ab/ab/{digest}.jpg"
+        assert media_store.blob_name_from_url(relative) == f"{digest}.jpg"
+        assert media_store.blob_name_from_url(f"http://localhost:8000{relative}") == f"{digest}.jpg"
+        assert media_store.blob_name_from_url("/uploads/legacy-uuid.jpg") is None
+        assert media_store.blob_name_from_url(None) is None
+
+    def test_reference_counts_cover_all_columns(self, db_session, upload_dir, test_product, test_user):
+        from app.models.models import ProductImage
+
+        blob = save_upload_sync(make_upload(b"shared photo"))
+        test_product.image_url = f"http://localhost:8000{blob.url}"
+        db_session.add(ProductImage(product_id=test_product.product_id, image_url=blob.url, color="Red"))
+        test_user.profile_image = blob.url
+        db_session.commit()
+
+        counts = media_store.reference_counts(db_session)
+
+        assert counts[blob.sha256] == 3
+
+
+class TestGarbageCollection:
+    """Tests for collect_garbage."""
+
+    def test_deletes_only_old_unreferenced_blobs(self, db_session, upload_dir, test_store):
+        kept = save_upload_sync(make_upload(b"banner"))
+        orphan = save_upload_sync(make_upload(b"orphan"))
+        fresh = save_upload_sync(make_upload(b"just uploaded"))
+        test_store.image_url = kept.url
+        db_session.commit()
+        age(kept.path, 7 * 86400)
+        age(orphan.path, 7 * 86400)
+
+        report = media_store.collect_garbage(db_session, batch_size=1)
+
+        assert report.scanned == 3
+        assert report.referenced == 1
+        assert report.deleted == [orphan.file_name]
+        assert kept.path.exists()
+        assert fresh.path.exists()
+        assert not orphan.path.exists()
+        assert not orphan.path.parent.exists()
+
+    def test_dry_run_keeps_files(self, db_session, upload_dir):
+        orphan = save_upload_sync(make_upload(b"orphan"))
+        age(orphan.path, 7 * 86400)
+
+        report = media_store.collect_garbage(db_session, dry_run=True)
+
+        assert report.deleted == [orphan.file_name]
+        assert orphan.path.exists()
@@ -0,0 +1,195 @@
+"""
+Unit tests for the versioned migration runner.
+"""
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.db import migrations
+from app.db.database import Base
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def legacy_orders_schema(engine, orders):
+    """Current tables, except ORDERS still holds the payment method as text."""
+    Base.metadata.create_all(bind=engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "ORDERS"])
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE ORDERS (
+                ORDER_ID INTEGER PRIMARY KEY, CUSTOMER_ID INTEGER NOT NULL, STORE_ID INTEGER NOT NULL,
+                ORDER_DATE DATETIME, TOTAL_AMOUNT DECIMAL(10, 2) NOT NULL, STATUS VARCHAR(50),
+                CUSTOMER_NAME VARCHAR(100), STORE_ORDER_ID INTEGER, PAYMENT_METHOD VARCHAR(50)
+            )
+        """))
+        for order_id, method in orders:
+            conn.execute(
+                text("INSERT INTO ORDERS (ORDER_ID, CUSTOMER_ID, STORE_ID, TOTAL_AMOUNT, STATUS, PAYMENT_METHOD) "
+                     "VALUES (:id, 1, 1, 10, 'Processing', :method)"),
+                {"id": order_id, "method": method},
+            )
+
+
+def columns(engine, table):
+    return {c["name"] for c in inspect(engine).get_columns(table)}
+
+
+class TestRunner:
+    """Tests for version tracking."""
+
+    def test_empty_database_is_created_at_head(self, engine):
+        applied = migrations.upgrade(engine)
+
+        assert [m.version for m in applied] == [m.version for m in migrations.MIGRATIONS]
+        assert set(migrations.applied_versions(engine)) == {m.version for m in migrations.MIGRATIONS}
+        assert inspect(engine).has_table("ORDERS")
+        assert migrations.upgrade(engine) == []
+
+    def test_existing_database_runs_pending_migrations_in_order(self, engine, monkeypatch):
+        Base.metadata.create_all(bind=engine)
+        ran = []
+        monkeypatch.setattr(migrations, "MIGRATIONS", [
+            migrations.Migration(1, "first", lambda ctx: ran.append(1)),
+            migrations.Migration(2, "second", lambda ctx: ran.append(2)),
+            migrations.Migration(3, "third", lambda ctx: ran.append(3)),
+        ])
+
+        migrations.upgrade(engine, target=2)
+        migrations.upgrade(engine)
+        migrations.upgrade(engine)
+
+        assert ran == [1, 2, 3]
+
+    def test_failed_migration_is_not_recorded(self, engine, monkeypatch):
+        Base.metadata.create_all(bind=engine)
+
+        def broken(ctx):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(migrations, "MIGRATIONS", [
+            migrations.Migration(1, "ok", lambda ctx: None),
+            migrations.Migration(2, "broken", broken),
+        ])
+
+        with pytest.raises(RuntimeError):
+            migrations.upgrade(engine)
+
+        assert set(migrations.applied_versions(engine)) == {1}
+
+    def test_registry_is_ordered(self):
+        versions = [m.version for m in migrations.MIGRATIONS]
+        assert versions == sorted(set(versions))
+
+
+class TestBackfill:
+    """Tests for chunked, resumable backfills."""
+
+    def make_rows(self, engine, count):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE ITEM (ID INTEGER PRIMARY KEY, DONE INTEGER DEFAULT 0)"))
+            conn.execute(text("INSERT INTO ITEM (ID) VALUES (:id)"), [{"id": i} for i in range(1, count + 1)])
+
+    def test_updates_every_row_in_batches(self, engine):
+        self.make_rows(engine, 10)
+        chunks = []
+
+        def mark(conn, lo, hi):
+            chunks.append((lo, hi))
+            conn.execute(text("UPDATE ITEM SET DONE = DONE + 1 WHERE ID > :lo AND ID <= :hi"), {"lo": lo, "hi": hi})
+
+        migrations.MigrationContext(engine, batch_size=4).backfill("items", "ITEM", "ID", mark)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT DONE FROM ITEM")).scalars().all() == [1] * 10
+            progress = conn.execute(text("SELECT LAST_KEY, ROWS_DONE FROM SCHEMA_BACKFILL WHERE NAME = 'items'")).one()
+        assert chunks == [(0, 4), (4, 8), (8, 10)]
+        assert tuple(progress) == (10, 10)
+
+    def test_resumes_after_the_last_committed_batch(self, engine):
+        self.make_rows(engine, 10)
+        calls = []
+
+        def flaky(conn, lo, hi):
+            calls.append(lo)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            conn.execute(text("UPDATE ITEM SET DONE = DONE + 1 WHERE ID > :lo AND ID <= :hi"), {"lo": lo, "hi": hi})
+
+        ctx = migrations.MigrationContext(engine, batch_size=3)
+        with pytest.raises(RuntimeError):
+            ctx.backfill("items", "ITEM", "ID", flaky)
+        ctx.backfill("items", "ITEM", "ID", flaky)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT DONE FROM ITEM")).scalars().all() == [1] * 10
+        assert calls == [0, 3, 3, 6, 9]
+
+    def test_dry_run_estimates_without_writing(self, engine, caplog):
+        self.make_rows(engine, 10)
+        ctx = migrations.MigrationContext(engine, dry_run=True, batch_size=4, pause=0.5)
+
+        with caplog.at_level("INFO", logger="app.db.migrations"):
+            ctx.backfill("items", "ITEM", "ID", "UPDATE ITEM SET DONE = 1 WHERE ID > :lo AND ID <= :hi")
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT SUM(DONE) FROM ITEM")).scalar() == 0
+        assert not inspect(engine).has_table("SCHEMA_BACKFILL")
+        assert "10 rows in 3 batches" in caplog.text
+        assert ctx.estimated_seconds >= 1.5
+
+
+class TestOrdersMigration:
+    """Tests for the ORDERS payment method migration."""
+
+    def test_moves_payment_methods_to_ids_and_drops_legacy_column(self, engine):
+        legacy_orders_schema(engine, [(1, "online"), (2, "cod"), (3, "online"), (4, None), (5, "cod")])
+
+        migrations.upgrade(engine, batch_size=2)
+
+        with engine.connect() as conn:
+            methods = dict(conn.execute(text("SELECT method_name, payment_method_id FROM PAYMENT_METHOD")).all())
+            orders = dict(conn.execute(text("SELECT ORDER_ID, PAYMENT_METHOD_ID FROM ORDERS")).all())
+            history = conn.execute(text("SELECT COUNT(*) FROM ORDER_HISTORY")).scalar()
+        assert set(methods) == {"online", "cod"}
+        assert orders == {1: methods["online"], 2: methods["cod"], 3: methods["online"], 4: None, 5: methods["cod"]}
+        assert history == 5
+        assert "PAYMENT_METHOD" not in columns(engine, "ORDERS")
+        assert migrations.pending_migrations(engine) == []
+
+    def test_dry_run_leaves_schema_and_versions_alone(self, engine):
+        legacy_orders_schema(engine, [(1, "online")])
+
+        planned = migrations.upgrade(engine, dry_run=True)
+
+        assert planned
+        assert "PAYMENT_METHOD_ID" not in columns(engine, "ORDERS")
+        assert migrations.applied_versions(engine) == {}
+
+
+class TestAppointmentsMigration:
+    """Tests for normalizing legacy appointments."""
+
+    def test_legacy_bookings_get_providers_and_slots(self, engine):
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO STORE (STORE_ID, STORE_NAME) VALUES (1, 'Barber Shop')"))
+            conn.execute(text("INSERT INTO SERVICE (SERVICE_ID, SERVICE_NAME, SERVICE_PRICE, STORE_ID) VALUES (1, 'Haircut', 20, 1)"))
+            for appointment_id in (1, 2):
+                conn.execute(
+                    text("INSERT INTO APPOINTMENT (APPOINTMENT_ID, CUSTOMER_ID, STORE_ID, BOOKING_DATE, BARBER_NAME, SERVICE_NAME) "
+                         "VALUES (:id, 1, 1, '2026-03-02 10:00:00', 'Sam', 'Haircut')"),
+                    {"id": appointment_id},
+                )
+
+        migrations.upgrade(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT PROVIDER_ID, SLOT_ID FROM APPOINTMENT ORDER BY APPOINTMENT_ID")).all()
+            providers = conn.execute(text("SELECT COUNT(*) FROM SERVICE_PROVIDER")).scalar()
+        assert providers == 1
+        assert rows[0].PROVIDER_ID == rows[1].PROVIDER_ID
+        assert None not in (rows[0].SLOT_ID, rows[1].SLOT_ID)
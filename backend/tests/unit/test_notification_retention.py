@@ -0,0 +1,92 @@
+"""
+Unit tests for notification retention and compaction.
+"""
+from datetime import datetime, timedelta
+
+from app.core.notification_retention import collapse_repeated, compact_notifications, expire_read
+from app.models.models import Notification
+
+
+def add(db_session, user, type_="message", related_id=7, is_read=False, age_days=0, occurrences=1):
+    notification = Notification(
+        user_id=user.id, title="New Message", message="You received a message", type=type_,
+        related_id=related_id, is_read=is_read, occurrences=occurrences,
+        created_at=datetime.now() - timedelta(days=age_days),
+    )
+    db_session.add(notification)
+    db_session.commit()
+    return notification
+
+
+class TestCollapse:
+    """Tests for collapse_repeated."""
+
+    def test_repeated_chat_notifications_fold_into_newest(self, db_session, test_user):
+        for _ in range(3):
+            add(db_session, test_user)
+        newest = add(db_session, test_user, occurrences=2)
+
+        report = collapse_repeated(db_session, batch_size=1)
+
+        rows = db_session.query(Notification).all()
+        assert [(n.id, n.occurrences) for n in rows] == [(newest.id, 5)]
+        assert (report.collapsed_groups, report.collapsed_rows) == (1, 3)
+
+    def test_collapsed_chat_notification_text_matches_total(self, db_session, test_user, test_vendor):
+        sender = test_vendor["user"]
+        add(db_session, test_user, related_id=sender.id)
+        add(db_session, test_user, related_id=sender.id, occurrences=2)
+
+        collapse_repeated(db_session)
+
+        kept = db_session.query(Notification).one()
+        db_session.refresh(kept)
+        assert kept.occurrences == 3
+        assert kept.message == f"You received 3 messages from {sender.full_name or sender.email}"
+
+    def test_read_unread_senders_and_types_stay_separate(self, db_session, test_user):
+        add(db_session, test_user, is_read=True)
+        add(db_session, test_user, is_read=False)
+        add(db_session, test_user, related_id=8)
+        add(db_session, test_user, type_="order")
+        add(db_session, test_user, type_="order")
+
+        report = collapse_repeated(db_session)
+
+        assert report.collapsed_rows == 0
+        assert db_session.query(Notification).count() == 5
+
+    def test_dry_run_changes_nothing(self, db_session, test_user):
+        add(db_session, test_user)
+        add(db_session, test_user)
+
+        report = collapse_repeated(db_session, dry_run=True)
+
+        assert report.collapsed_rows == 1
+        assert db_session.query(Notification).count() == 2
+
+
+class TestExpire:
+    """Tests for expire_read."""
+
+    def test_deletes_only_old_read_notifications_in_batches(self, db_session, test_user):
+        for _ in range(5):
+            add(db_session, test_user, type_="order", is_read=True, age_days=40)
+        unread_old = add(db_session, test_user, type_="order", age_days=40)
+        read_recent = add(db_session, test_user, type_="order", is_read=True, age_days=1)
+
+        report = expire_read(db_session, retention_days=30, batch_size=2)
+
+        assert report.expired_rows == 5
+        assert {n.id for n in db_session.query(Notification)} == {unread_old.id, read_recent.id}
+
+    def test_compact_runs_both_passes(self, db_session, test_user):
+        add(db_session, test_user, is_read=True, age_days=60)
+        add(db_session, test_user, is_read=True, age_days=45)
+        add(db_session, test_user)
+
+        report = compact_notifications(db_session, retention_days=30)
+
+        assert report.collapsed_rows == 1
+        assert report.expired_rows == 1
+        assert db_session.query(Notification).count() == 1
@@ -0,0 +1,76 @@
+"""
+Unit tests for replica selection and read-your-writes pins.
+"""
+from sqlalchemy import text
+
+from app.db import replicas
+from app.db.replicas import PrimaryPins, ReplicaSet, SUBJECT_KEY
+
+
+def sqlite_url(tmp_path, name):
+    return f"sqlite:///{tmp_path / name}"
+
+
+class TestReplicaSet:
+    """Tests for round-robin selection and health checks."""
+
+    def test_round_robin_across_healthy_replicas(self, tmp_path):
+        replica_set = ReplicaSet([sqlite_url(tmp_path, "a.db"), sqlite_url(tmp_path, "b.db")], check_interval=60)
+
+        picked = [replica_set.choose().url for _ in range(4)]
+
+        assert [url.rsplit("/", 1)[-1] for url in picked] == ["a.db", "b.db", "a.db", "b.db"]
+
+    def test_down_replica_is_skipped_until_rechecked(self, tmp_path, monkeypatch):
+        down = "sqlite:////nonexistent/dir/down.db"
+        replica_set = ReplicaSet([down, sqlite_url(tmp_path, "up.db")], check_interval=60)
+
+        assert {replica_set.choose().url for _ in range(3)} == {sqlite_url(tmp_path, "up.db")}
+        assert replica_set.replicas[0].healthy is False
+
+        # After the interval the replica is pinged again
+        replica_set.replicas[0].checked_at -= 61
+        monkeypatch.setattr(replicas, "_ping", lambda engine: True)
+        assert {replica_set.choose().url for _ in range(2)} == {down, sqlite_url(tmp_path, "up.db")}
+
+    def test_no_replicas_means_no_choice(self):
+        replica_set = ReplicaSet([], check_interval=60)
+
+        assert not replica_set
+        assert replica_set.choose() is None
+
+
+class TestPrimaryPins:
+    """Tests for pinning writers to the primary."""
+
+    def test_committed_write_pins_the_subject(self, db_session, test_store, monkeypatch):
+        pins = PrimaryPins()
+        monkeypatch.setattr(replicas, "primary_pins", pins)
+        db_session.info[SUBJECT_KEY] = "writer@example.com"
+
+        test_store.store_name = "Renamed"
+        db_session.commit()
+
+        assert pins.is_pinned("writer@example.com")
+        assert not pins.is_pinned("someone@example.com")
+
+    def test_reads_and_rollbacks_do_not_pin(self, db_session, test_store, monkeypatch):
+        pins = PrimaryPins()
+        monkeypatch.setattr(replicas, "primary_pins", pins)
+        db_session.info[SUBJECT_KEY] = "reader@example.com"
+
+        db_session.execute(text("SELECT 1"))
+        db_session.commit()
+        test_store.store_name = "Discarded"
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert not pins.is_pinned("reader@example.com")
+
+    def test_pins_expire(self):
+        pins = PrimaryPins()
+
+        pins.pin("writer@example.com", seconds=0)
+
+        assert not pins.is_pinned("writer@example.com")
@@ -0,0 +1,89 @@
+"""
+Import-time budget for app.main: importing the app (what every worker and
+serverless cold start does) must not connect to the database, create the
+upload directory or hash passwords.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+IMPORT_BUDGET_SECONDS = 5.0
+
+IMPORT_SCRIPT = textwrap.dedent(
+    """
+    import json, sys, time
+
+    import bcrypt
+    import sqlalchemy.engine.base
+
+    touched = []
+
+    def _refuse(*args, **kwargs):
+        touched.append("connect")
+        raise RuntimeError("database connection at import time")
+
+    def _no_hash(*args, **kwargs):
+        touched.append("hashpw")
+        raise RuntimeError("password hashing at import time")
+
+    sqlalchemy.engine.base.Engine.connect = _refuse
+    sqlalchemy.engine.base.Engine.begin = _refuse
+    bcrypt.hashpw = _no_hash
+
+    started = time.perf_counter()
+    import app.main
+    print(json.dumps({"seconds": time.perf_counter() - started, "touched": touched}))
+    """
+)
+
+
+def _import_app(tmp_path):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}",
+        UPLOAD_DIR=str(tmp_path / "uploads"),
+        AUTO_CREATE_TABLES="false",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_no_database_or_disk_work(tmp_path):
+    report = _import_app(tmp_path)
+
+    assert report["touched"] == []
+    assert not (tmp_path / "startup.db").exists()
+    assert not (tmp_path / "uploads").exists()
+
+
+def test_import_fits_the_startup_budget(tmp_path):
+    report = _import_app(tmp_path)
+
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS, f"import app.main took {report['seconds']:.2f}s"
+
+
+def test_upload_dir_is_created_on_first_request(tmp_path):
+    from app.core.static_media import MediaFiles
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+
+    directory = tmp_path / "uploads"
+    app = Starlette(routes=[Mount("/uploads", MediaFiles(directory=directory, check_dir=False))])
+
+    assert not directory.exists()
+    assert TestClient(app).get("/uploads/missing.png").status_code == 404
+    assert directory.is_dir()
@@ -0,0 +1,100 @@
+"""
+Unit tests for /uploads static file serving.
+"""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import static_media
+from app.core.static_media import IMMUTABLE_CACHE_CONTROL, MediaFiles, write_gzip_sidecar
+from app.core.uploads import save_upload_sync
+from tests.unit.test_uploads import make_upload
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg">' + b"<rect/>" * 200 + b"</svg>"
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def media_client(upload_dir):
+    app = FastAPI()
+    app.mount("/uploads", MediaFiles(directory=upload_dir), name="uploads")
+    return TestClient(app)
+
+
+class TestMediaFiles:
+    """Tests for caching, range and precompression behaviour."""
+
+    def test_content_addressed_blobs_are_immutable(self, media_client, upload_dir):
+        stored = save_upload_sync(make_upload(b"jpeg bytes"))
+
+        response = media_client.get(stored.url)
+
+        assert response.status_code == 200
+        assert response.content == b"jpeg bytes"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["etag"] == f'"{stored.file_name}"'
+
+    def test_other_files_get_bounded_max_age(self, media_client, upload_dir, monkeypatch):
+        monkeypatch.setattr(static_media.settings, "MEDIA_CACHE_MAX_AGE", 60)
+        (upload_dir / "legacy.jpg").write_bytes(b"old upload")
+
+        response = media_client.get("/uploads/legacy.jpg")
+
+        assert response.headers["cache-control"] == "public, max-age=60"
+
+    def test_range_request_returns_partial_content(self, media_client, upload_dir):
+        stored = save_upload_sync(make_upload(b"0123456789", "clip.mp4", "video/mp4"))
+
+        response = media_client.get(stored.url, headers={"Range": "bytes=2-5"})
+
+        assert response.status_code == 206
+        assert response.content == b"2345"
+        assert response.headers["content-range"] == "bytes 2-5/10"
+
+    def test_if_range_with_stale_etag_returns_full_body(self, media_client, upload_dir):
+        stored = save_upload_sync(make_upload(b"0123456789", "clip.mp4", "video/mp4"))
+
+        fresh = media_client.get(stored.url, headers={"Range": "bytes=0-1", "If-Range": f'"{stored.file_name}"'})
+        stale = media_client.get(stored.url, headers={"Range": "bytes=0-1", "If-Range": '"something-else"'})
+
+        assert fresh.status_code == 206
+        assert stale.status_code == 200
+        assert stale.content == b"0123456789"
+
+    def test_matching_etag_is_not_modified(self, media_client, upload_dir):
+        stored = save_upload_sync(make_upload(b"jpeg bytes"))
+
+        response = media_client.get(stored.url, headers={"If-None-Match": f'"{stored.file_name}"'})
+
+        assert response.status_code == 304
+
+    def test_compressible_upload_is_served_from_gzip_sidecar(self, media_client, upload_dir):
+        stored = save_upload_sync(make_upload(SVG, "logo.svg", "image/svg+xml"), default_extension="svg")
+        sidecar = stored.path.with_name(stored.path.name + ".gz")
+        assert gzip.decompress(sidecar.read_bytes()) == SVG
+
+        response = media_client.get(stored.url, headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["content-type"].startswith("image/svg+xml")
+        assert response.headers["etag"] == f'"{stored.file_name}-gzip"'
+        assert response.content == SVG  # decoded by the client
+
+    def test_range_requests_bypass_precompression(self, media_client, upload_dir):
+        path = upload_dir / "notes.txt"
+        path.write_bytes(b"plain text " * 50)
+        write_gzip_sidecar(path)
+
+        response = media_client.get("/uploads/notes.txt", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-4"})
+
+        assert response.status_code == 206
+        assert "content-encoding" not in response.headers
+        assert response.content == b"plain"
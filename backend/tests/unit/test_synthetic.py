@@ -0,0 +1,89 @@
+"""
+Unit tests for the synthetic data generator.
+"""
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.core.security import verify_password
+from app.db.database import Base
+from app.db.synthetic import PRESETS, SYNTHETIC_PASSWORD, email, generate, product_price
+from app.models import models
+
+SCALE = replace(PRESETS["tiny"], orders=120)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def count(session, model):
+    return session.execute(select(func.count()).select_from(model)).scalar()
+
+
+class TestGenerate:
+    """generate() on an empty SQLite database."""
+
+    def test_volumes_match_the_scale(self, engine):
+        manifest = generate(engine, SCALE, batch_size=50)
+
+        with Session(engine) as session:
+            assert count(session, models.Store) == SCALE.stores
+            assert count(session, models.User) == SCALE.stores + SCALE.customers
+            assert count(session, models.Product) == SCALE.products
+            assert count(session, models.Order) == SCALE.orders
+            assert count(session, models.Message) == SCALE.conversations * SCALE.messages_per_conversation
+            assert count(session, models.ServiceProvider) == SCALE.service_stores * SCALE.providers_per_store
+        assert manifest["rows"]["ORDERS"] == SCALE.orders
+        assert manifest["products"] == [1, SCALE.products]
+
+    def test_orders_are_consistent(self, engine):
+        generate(engine, SCALE, batch_size=50)
+
+        with Session(engine) as session:
+            for order in session.query(models.Order).limit(20):
+                assert order.items
+                assert all(item.product.store_id == order.store_id for item in order.items)
+                assert all(float(item.price) == product_price(item.product_id) for item in order.items)
+                assert float(order.total_amount) == pytest.approx(sum(i.quantity * float(i.price) for i in order.items))
+            # Per-store order numbers grow with the order date, without gaps
+            numbers = session.execute(
+                select(models.Order.store_order_id).where(models.Order.store_id == 1).order_by(models.Order.order_date)
+            ).scalars().all()
+            assert numbers == list(range(1, len(numbers) + 1))
+
+    def test_accounts_log_in_with_the_shared_password(self, engine):
+        manifest = generate(engine, SCALE, batch_size=50)
+
+        with Session(engine) as session:
+            vendor = session.get(models.User, manifest["vendor_users"][0])
+            customer = session.get(models.User, manifest["customers"][0])
+            assert vendor.role == models.UserRole.VENDOR
+            assert vendor.vendor_profile.store_id == manifest["stores"][0]
+            assert customer.email == email(customer.id)
+            assert verify_password(SYNTHETIC_PASSWORD, customer.hashed_password)
+
+    def test_same_seed_same_data(self):
+        rows = []
+        for _ in range(2):
+            engine = create_engine("sqlite://")
+            Base.metadata.create_all(bind=engine)
+            generate(engine, SCALE, seed=7)
+            with Session(engine) as session:
+                rows.append(session.execute(select(models.Order.customer_id, models.Order.total_amount)).all())
+        assert rows[0] == rows[1]
+
+    def test_runs_again_on_top_of_existing_data(self, engine):
+        first = generate(engine, SCALE)
+        second = generate(engine, SCALE, seed=1)
+
+        assert second["stores"][0] == first["stores"][1] + 1
+        assert second["customers"][0] == first["customers"][1] + SCALE.stores + 1
+        with Session(engine) as session:
+            assert count(session, models.Order) == 2 * SCALE.orders
@@ -0,0 +1,147 @@
+"""
+Unit tests for the streaming upload pipeline.
+"""
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.core import uploads
+
+
+def make_upload(data: bytes, filename: str = "photo.jpg", content_type: str = "image/jpeg", size=None) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(data),
+        filename=filename,
+        size=size,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestSaveUpload:
+    """Tests for save_upload and save_upload_sync."""
+
+    def test_streams_file_and_hashes_content(self, upload_dir, monkeypatch):
+        """Content is written in chunks, hashed while streaming and stored under its hash."""
+        monkeypatch.setattr(uploads, "CHUNK_SIZE", 4)
+        data = b"0123456789" * 3
+        digest = hashlib.sha256(data).hexdigest()
+
+        stored = asyncio.run(uploads.save_upload(make_upload(data)))
+
+        assert stored.path.read_bytes() == data
+        assert stored.path == upload_dir / "media" / digest[:2] / digest[2:4] / f"{digest}.jpg"
+        assert stored.url == f"/uploads/media/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+        assert stored.size == len(data)
+        assert stored.sha256 == digest
+        assert stored.deduplicated is False
+
+    def test_identical_content_is_stored_once(self, upload_dir):
+        """A second upload of the same bytes reuses the existing blob."""
+        first = uploads.save_upload_sync(make_upload(b"same photo"), default_extension="jpg")
+        second = uploads.save_upload_sync(make_upload(b"same photo", filename="copy.jpg"), default_extension="jpg")
+
+        assert second.deduplicated is True
+        assert second.url == first.url
+        assert [p for p in (upload_dir / "media").rglob("*") if p.is_file()] == [first.path]
+
+    def test_declared_size_over_limit_is_rejected_before_reading(self, upload_dir, monkeypatch):
+        """A known size above the limit fails without touching the disk."""
+        monkeypatch.setattr(uploads.settings, "MAX_IMAGE_UPLOAD_MB", 1)
+
+        with pytest.raises(HTTPException) as exc:
+            uploads.save_upload_sync(make_upload(b"x", size=2 * 1024 * 1024))
+
+        assert exc.value.status_code == 413
+        assert not (upload_dir / "media").exists()
+
+    def test_stream_over_limit_leaves_no_partial_file(self, upload_dir, monkeypatch):
+        """An oversized stream is aborted and its temp file removed."""
+        monkeypatch.setattr(uploads.settings, "MAX_AUDIO_UPLOAD_MB", 1)
+        data = b"a" * (1024 * 1024 + 1)
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(uploads.save_upload(make_upload(data, "note.webm", "audio/webm")))
+
+        assert exc.value.status_code == 413
+        assert list((upload_dir / "media").iterdir()) == []
+
+    def test_unsafe_extension_falls_back_to_default(self, upload_dir):
+        """Path tricks in the client filename never reach the stored name."""
+        stored = uploads.save_upload_sync(make_upload(b"abc", filename="evil.php/../x"), default_extension="bin")
+
+        assert stored.file_name.endswith(".bin")
+
+    def test_kind_is_guessed_from_filename_for_generic_content_type(self):
+        assert uploads.upload_kind("application/octet-stream", "clip.mp4") == "video"
+        assert uploads.upload_kind("application/pdf", "invoice.pdf") == "file"
+
+
+class TestUploadLimitMiddleware:
+    """Oversized multipart bodies are refused before the form is parsed."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from fastapi import FastAPI, File
+        from fastapi.testclient import TestClient
+
+        for setting in ("MAX_IMAGE_UPLOAD_MB", "MAX_AUDIO_UPLOAD_MB", "MAX_VIDEO_UPLOAD_MB", "MAX_FILE_UPLOAD_MB"):
+            monkeypatch.setattr(uploads.settings, setting, 1)
+        parsed = []
+        app = FastAPI()
+        app.add_middleware(uploads.UploadLimitMiddleware)
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            parsed.append(file.filename)
+            return {"ok": True}
+
+        client = TestClient(app)
+        client.parsed = parsed
+        return client
+
+    def multipart(self, size: int):
+        boundary = "limit-test"
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.bin\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + b"x" * size + f"\r\n--{boundary}--\r\n".encode()
+        return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+    def test_declared_length_over_limit_is_rejected_unparsed(self, client):
+        body, headers = self.multipart(uploads.max_request_bytes())
+
+        response = client.post("/upload", content=body, headers=headers)
+
+        assert response.status_code == 413
+        assert client.parsed == []
+
+    def test_streamed_body_over_limit_is_cut_off(self, client):
+        body, headers = self.multipart(uploads.max_request_bytes())
+
+        def chunks():
+            for start in range(0, len(body), 64 * 1024):
+                yield body[start:start + 64 * 1024]
+
+        # A generator body is sent chunked, without Content-Length
+        response = client.post("/upload", content=chunks(), headers=headers)
+
+        assert response.status_code == 413
+        assert client.parsed == []
+
+    def test_body_within_limit_passes(self, client):
+        body, headers = self.multipart(1024)
+
+        response = client.post("/upload", content=body, headers=headers)
+
+        assert response.status_code == 200
+        assert client.parsed == ["a.bin"]
@@ -1,6 +0,0 @@
-from app.db.database import engine, Base
-from app.models import models
-
-print("Creating tables...")
-Base.metadata.create_all(bind=engine)
-print("Tables created successfully.")
@@ -146,9 +146,12 @@ describe('Complete User Flows', () => {
       expect(appointment.barber_name).toBe('John');
 
       // 4. View My Appointments
-      mockAPI.fetchMyAppointments.mockResolvedValue([appointment]);
+      mockAPI.fetchMyAppointments.mockResolvedValue({
+        items: [appointment], total: 1, limit: 100, offset: 0, has_more: false, next_offset: null
+      });
       const myAppointments = await mockAPI.fetchMyAppointments();
-      expect(myAppointments.length).toBe(1);
+      expect(myAppointments.items.length).toBe(1);
+      expect(myAppointments.has_more).toBe(false);
     });
   });
 
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
-import { fetchConversations, fetchChatHistory, sendMessage, markMessagesAsRead, uploadChatAttachment } from '../lib/api';
+import { fetchConversations, fetchChatHistory, sendMessage, markMessagesAsRead, uploadChatAttachment, websocketUrl } from '../lib/api';
 import { useAuth } from '../context/AuthContext';
 import { Send, User, MessageSquare, Check, CheckCheck, Paperclip, Mic, X, FileText, Play, Pause, Reply } from 'lucide-react';
 
@@ -56,9 +56,7 @@ const Chat = ({ preSelectedUser = null }) => {
         // If we already have a connection, don't reconnect just because selectedUser changed
         if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) return;
 
-        const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
-        // Adjust port: Frontend is 5173, Backend is 8000
-        const wsUrl = `ws://localhost:8000/api/messages/ws?token=${user.token}`;
+        const wsUrl = `${websocketUrl('/api/messages/ws')}?token=${user.token}`;
         
         const socket = new WebSocket(wsUrl);
         wsRef.current = socket;
@@ -101,12 +99,16 @@ const Chat = ({ preSelectedUser = null }) => {
              
              if (data.type === 'read_receipt') {
                  if (currentSelected && data.reader_id === currentSelected.id) {
+                     // up_to_id is the reader's high-water mark; older frames omit it
                      setMessages(prev => prev.map(msg => 
-                        msg.sender_id === user.userId ? { ...msg, is_read: true } : msg
+                        msg.sender_id === user.userId && (!data.up_to_id || msg.id <= data.up_to_id) ? { ...msg, is_read: true } : msg
                      ));
                  }
                  return;
              }
+
+             // Notification frames are handled by the dashboards' notification stream
+             if (data.type === 'notification') return;
              
              // Check if message belongs to current conversation
              if (currentSelected && (data.sender_id === currentSelected.id || data.receiver_id === currentSelected.id)) {
@@ -120,7 +122,7 @@ const Chat = ({ preSelectedUser = null }) => {
                  // ONLY if the window is currently focused/visible
                  if (data.sender_id === currentSelected.id) {
                      if (document.visibilityState === 'visible') {
-                         markMessagesAsRead(currentSelected.id);
+                         markMessagesAsRead(currentSelected.id, data.id);
                      }
                  }
              }
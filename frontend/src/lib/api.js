@@ -5,6 +5,14 @@ const API = axios.create({
     withCredentials: true,
 });
 
+// WebSocket URL for an API path: the same base axios uses, with http(s) switched to ws(s)
+export const websocketUrl = (path) => {
+  const base = new URL(API.defaults.baseURL, window.location.href);
+  base.protocol = base.protocol === 'https:' ? 'wss:' : 'ws:';
+  base.pathname = `${base.pathname.replace(/\/+$/, '')}${path}`;
+  return base.toString();
+};
+
 // Newsletter
 export const subscribeNewsletter = async (email) => {
   const response = await API.post('/api/newsletter/subscribe', { email });
@@ -159,13 +167,41 @@ export const createVariant = async (variantData) => {
   return response.data;
 };
 
+// appointmentData = { store_id, provider_id | barber_name, service_id | service_name, booking_date }
 export const createAppointment = async (appointmentData) => {
   const response = await API.post('/api/appointments/', appointmentData);
   return response.data;
 };
 
-export const fetchMyAppointments = async () => {
-  const response = await API.get('/api/appointments/my-appointments');
+// Free start times per provider: params = { store_id, date_from, date_to?, service_id? | service_name?, provider_id? }
+export const fetchAvailability = async (params) => {
+  const response = await API.get('/api/appointments/availability', { params });
+  return response.data;
+};
+
+export const fetchProviderSchedule = async (providerId) => {
+  const response = await API.get(`/api/appointments/providers/${providerId}/schedule`);
+  return response.data;
+};
+
+// schedule = { weekly: [{ weekday, start_time, end_time }], exceptions: [{ date, start_time?, end_time?, reason? }], horizon_days? }
+export const updateProviderSchedule = async (providerId, schedule) => {
+  const response = await API.put(`/api/appointments/providers/${providerId}/schedule`, schedule);
+  return response.data;
+};
+
+// params = { date_from?, date_to?, limit?, offset? }
+// Returns { items, total, limit, offset, has_more, next_offset }, upcoming appointments first
+export const fetchMyAppointments = async (params = {}) => {
+  const response = await API.get('/api/appointments/my-appointments', { params });
+  return response.data;
+};
+
+// Appointments grouped by store-local day: [{ date, appointments: [...] }]
+export const fetchMyAppointmentCalendar = async (dateFrom, dateTo) => {
+  const response = await API.get('/api/appointments/my-appointments/calendar', {
+    params: { date_from: dateFrom, date_to: dateTo },
+  });
   return response.data;
 };
 
@@ -235,8 +271,29 @@ export const deleteUser = async (userId) => {
   return response.data;
 };
 
-export const fetchStoreAppointments = async (storeId) => {
-  const response = await API.get(`/api/appointments/store/${storeId}`);
+// params = { date_from?, date_to?, limit?, offset? }
+// Returns { items, total, limit, offset, has_more, next_offset }, upcoming appointments first
+export const fetchStoreAppointments = async (storeId, params = {}) => {
+  const response = await API.get(`/api/appointments/store/${storeId}`, { params });
+  return response.data;
+};
+
+// Every appointment of a store within [date_from, date_to], following next_offset across pages
+export const fetchStoreAppointmentsInRange = async (storeId, dateFrom, dateTo) => {
+  const appointments = [];
+  let offset = 0;
+  while (offset !== null) {
+    const page = await fetchStoreAppointments(storeId, { date_from: dateFrom, date_to: dateTo, limit: 500, offset });
+    appointments.push(...page.items);
+    offset = page.next_offset;
+  }
+  return appointments;
+};
+
+export const fetchStoreAppointmentCalendar = async (storeId, dateFrom, dateTo) => {
+  const response = await API.get(`/api/appointments/store/${storeId}/calendar`, {
+    params: { date_from: dateFrom, date_to: dateTo },
+  });
   return response.data;
 };
 
@@ -263,8 +320,22 @@ export const fetchConversations = async () => {
 };
 
 // Notifications
-export const fetchNotifications = async () => {
-  const response = await API.get('/api/notifications/');
+// Newest first; returns { items, next_cursor } - pass next_cursor as `before` for older pages
+export const fetchNotifications = async (before = null) => {
+  const response = await API.get('/api/notifications/', { params: before ? { before } : {} });
+  return response.data;
+};
+
+export const fetchUnreadNotificationCount = async () => {
+  const response = await API.get('/api/notifications/unread-count');
+  return response.data.unread_count;
+};
+
+// Notifications created or changed after cursor = { since, sinceId } (the updated_at and id of the
+// last one seen), in change order; catch-up after reconnecting the push socket
+export const fetchNotificationsSince = async (cursor = null, limit = 100) => {
+  const params = cursor ? { since: cursor.since, since_id: cursor.sinceId, limit } : { limit };
+  const response = await API.get('/api/notifications/delta', { params });
   return response.data;
 };
 
@@ -293,8 +364,16 @@ export const sendMessage = async (messageData) => {
   return response.data;
 };
 
-export const markMessagesAsRead = async (senderId) => {
-  const response = await API.put(`/api/messages/read/${senderId}`);
+export const searchMessages = async (query, { partnerId, since, until, limit, offset } = {}) => {
+  const response = await API.get('/api/messages/search', {
+    params: { q: query, partner_id: partnerId, since, until, limit, offset },
+  });
+  return response.data;
+};
+
+export const markMessagesAsRead = async (senderId, upToId) => {
+  const params = upToId ? { up_to_id: upToId } : undefined;
+  const response = await API.put(`/api/messages/read/${senderId}`, null, { params });
   return response.data;
 };
 
@@ -0,0 +1,116 @@
+import { fetchNotifications, fetchNotificationsSince, fetchUnreadNotificationCount, websocketUrl } from './api';
+
+// Same socket endpoint the chat uses; notification frames look like
+// { type: 'notification', notification: {...} }
+const WS_URL = websocketUrl('/api/messages/ws');
+const MAX_RECONNECT_DELAY = 30000;
+// Bursts of pushed changes are recounted once
+const RECOUNT_DELAY = 300;
+
+const newestFirst = (a, b) => new Date(b.created_at) - new Date(a.created_at) || b.id - a.id;
+
+/**
+ * Keep a notification list in sync without polling.
+ *
+ * Loads the latest notifications once, then listens for pushed ones. After a
+ * dropped connection it reconnects with backoff and fetches everything created
+ * or changed after the newest (updated_at, id) it has seen, so nothing created
+ * or bumped while offline is missed.
+ *
+ * onChange receives an updater function (prev => next), suitable for setState.
+ * onUnreadCount receives the server's unread count (/api/notifications/unread-count):
+ * once on subscribe and again after every batch of pushed or caught-up changes,
+ * since the loaded list holds only the newest page.
+ * Returns an unsubscribe function.
+ */
+export const subscribeToNotifications = (token, onChange, onUnreadCount = () => {}) => {
+  let socket = null;
+  // Catch-up cursor: the (updated_at, id) of the most recently changed notification seen
+  let cursor = null;
+  let closed = false;
+  let retryDelay = 1000;
+  let retryTimer = null;
+  let recountTimer = null;
+
+  const recount = () => {
+    clearTimeout(recountTimer);
+    recountTimer = setTimeout(() => {
+      fetchUnreadNotificationCount()
+        .then(count => { if (!closed) onUnreadCount(count); })
+        .catch(error => console.error("Failed to load the unread count", error));
+    }, RECOUNT_DELAY);
+  };
+
+  const merge = (incoming) => {
+    if (!incoming.length) return;
+    advanceCursor(incoming);
+    // Chat notifications are updated in place (occurrences/timestamp), so replace by id
+    const incomingIds = new Set(incoming.map(n => n.id));
+    onChange(prev => [...incoming, ...prev.filter(n => !incomingIds.has(n.id))].sort(newestFirst));
+    recount();
+  };
+
+  const advanceCursor = (notifications) => {
+    for (const n of notifications) {
+      if (!n.updated_at) continue;
+      const changed = Date.parse(n.updated_at);
+      const current = cursor ? Date.parse(cursor.since) : -Infinity;
+      if (changed > current || (changed === current && n.id > cursor.sinceId)) {
+        cursor = { since: n.updated_at, sinceId: n.id };
+      }
+    }
+  };
+
+  const catchUp = async () => {
+    try {
+      let page;
+      do {
+        page = await fetchNotificationsSince(cursor);
+        merge(page);
+        // Pages come in (updated_at, id) order, so the last row is the exact next cursor
+        // (Date.parse in advanceCursor only resolves milliseconds)
+        const last = page[page.length - 1];
+        if (last && last.updated_at) cursor = { since: last.updated_at, sinceId: last.id };
+      } while (page.length === 100 && !closed);
+    } catch (error) {
+      console.error("Failed to catch up on notifications", error);
+    }
+  };
+
+  const connect = () => {
+    if (closed) return;
+    socket = new WebSocket(`${WS_URL}?token=${token}`);
+
+    socket.onopen = () => {
+      retryDelay = 1000;
+      catchUp();
+    };
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.type === 'notification') merge([data.notification]);
+    };
+    socket.onclose = () => {
+      socket = null;
+      if (closed) return;
+      retryTimer = setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, MAX_RECONNECT_DELAY);
+    };
+  };
+
+  fetchNotifications()
+    .then(({ items: initial }) => {
+      if (closed) return;
+      advanceCursor(initial);
+      onChange(() => initial);
+    })
+    .catch(error => console.error("Failed to load notifications", error))
+    .finally(connect);
+  recount();
+
+  return () => {
+    closed = true;
+    clearTimeout(retryTimer);
+    clearTimeout(recountTimer);
+    if (socket) socket.close();
+  };
+};
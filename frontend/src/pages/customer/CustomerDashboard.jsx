@@ -33,7 +33,8 @@ import {
 } from 'recharts';
 import { useAuth } from '../../context/AuthContext';
 import { useOrder } from '../../context/OrderContext';
-import { fetchMyAppointments, cancelAppointment, fetchCustomerDashboard, fetchNotifications, markNotificationAsRead, markAllNotificationsAsRead } from '../../lib/api';
+import { fetchMyAppointments, cancelAppointment, fetchCustomerDashboard, markNotificationAsRead, markAllNotificationsAsRead } from '../../lib/api';
+import { subscribeToNotifications } from '../../lib/notificationStream';
 import AppointmentConfirmation from '../../shops/Tailor/AppointmentConfirmation';
 import { useNavigate } from 'react-router-dom';
 import EditProfileModal from './EditProfileModal';
@@ -118,11 +119,14 @@ const CustomerDashboard = () => {
   const [isProfileMenuOpen, setIsProfileMenuOpen] = useState(false);
   const [isEditProfileOpen, setIsEditProfileOpen] = useState(false);
   const [appointments, setAppointments] = useState([]);
+  const [appointmentsNextOffset, setAppointmentsNextOffset] = useState(null);
   const [selectedAppointment, setSelectedAppointment] = useState(null);
   const [activeTimeframe, setActiveTimeframe] = useState('monthly');
 
   // Notification State
   const [notifications, setNotifications] = useState([]);
+  // From /api/notifications/unread-count; the list only holds the newest page
+  const [unreadCount, setUnreadCount] = useState(0);
   const [isNotificationsOpen, setIsNotificationsOpen] = useState(false);
   const notificationRef = useRef(null);
   
@@ -188,34 +192,11 @@ const CustomerDashboard = () => {
     return data;
   }, [orders, activeTimeframe]);
 
-  // Poll Notifications
+  // Notifications are pushed over the websocket (with catch-up after reconnects)
   useEffect(() => {
     if (!user) return;
 
-    const loadNotifications = async () => {
-      if (document.visibilityState === 'visible' && user) {
-        try {
-          const data = await fetchNotifications();
-          setNotifications(data);
-        } catch (error) {
-          console.error("Failed to load notifications", error);
-        }
-      }
-    };
-
-    // Initial load
-    loadNotifications();
-    
-    // Poll every 60 seconds
-    const interval = setInterval(loadNotifications, 60000); 
-    
-    // Also reload when window regains focus
-    const handleVisibilityChange = () => {
-        if (document.visibilityState === 'visible') {
-            loadNotifications();
-        }
-    };
-    document.addEventListener('visibilitychange', handleVisibilityChange);
+    const unsubscribe = subscribeToNotifications(user.token, setNotifications, setUnreadCount);
 
     // Close notifications on click outside
     const handleClickOutside = (event) => {
@@ -226,8 +207,7 @@ const CustomerDashboard = () => {
     document.addEventListener('mousedown', handleClickOutside);
     
     return () => {
-        clearInterval(interval);
-        document.removeEventListener('visibilitychange', handleVisibilityChange);
+        unsubscribe();
         document.removeEventListener('mousedown', handleClickOutside);
     };
   }, [user?.userId]); // Depend on ID, not full object reference
@@ -237,6 +217,7 @@ const CustomerDashboard = () => {
         if (!notif.is_read) {
             await markNotificationAsRead(notif.id);
             setNotifications(prev => prev.map(n => n.id === notif.id ? {...n, is_read: true} : n));
+            setUnreadCount(count => Math.max(0, count - 1));
         }
 
         if (notif.type === 'message') {
@@ -257,25 +238,32 @@ const CustomerDashboard = () => {
       try {
           await markAllNotificationsAsRead();
           setNotifications(prev => prev.map(n => ({...n, is_read: true})));
+          setUnreadCount(0);
       } catch (e) { console.error(e); }
   };
 
-  const unreadCount = notifications.filter(n => !n.is_read).length;
+
+  // Pages come upcoming-first; "Load more" appends the next page from next_offset
+  const loadAppointments = async (offset = 0) => {
+    const page = await fetchMyAppointments({ offset });
+    setAppointments(prev => (offset === 0 ? page.items : [...prev, ...page.items]));
+    setAppointmentsNextOffset(page.next_offset);
+  };
 
   useEffect(() => {
-    const loadAppointments = async () => {
-      try {
-        const data = await fetchMyAppointments();
-        setAppointments(data);
-      } catch (error) {
-        console.error("Failed to load appointments", error);
-      }
-    };
     if (user) {
-      loadAppointments();
+      loadAppointments().catch(error => console.error("Failed to load appointments", error));
     }
   }, [user]);
 
+  const handleLoadMoreAppointments = async () => {
+    try {
+      await loadAppointments(appointmentsNextOffset);
+    } catch (error) {
+      console.error("Failed to load appointments", error);
+    }
+  };
+
   const handleCancelAppointment = async (appointmentId, bookingDate) => {
     const now = new Date();
     const apptDate = new Date(bookingDate);
@@ -289,8 +277,7 @@ const CustomerDashboard = () => {
     if (window.confirm("Are you sure you want to cancel this appointment?")) {
       try {
         await cancelAppointment(appointmentId);
-        const data = await fetchMyAppointments();
-        setAppointments(data);
+        await loadAppointments();
         alert("Appointment cancelled successfully.");
       } catch (error) {
         console.error("Failed to cancel appointment", error);
@@ -935,6 +922,16 @@ const CustomerDashboard = () => {
                   </tbody>
                 </table>
               </div>
+              {appointmentsNextOffset !== null && (
+                <div className="p-4 border-t border-gray-200 text-center">
+                  <button
+                    onClick={handleLoadMoreAppointments}
+                    className="text-sm font-medium text-gray-600 hover:text-black hover:underline"
+                  >
+                    Load more
+                  </button>
+                </div>
+              )}
             </div>
           )}
           {activeTab === 'messages' && renderMessages()}
@@ -27,6 +27,16 @@ const haircutStyles = [
   { id: 7, image: style7, title: "Undercut", price: 17 },
 ];
 
+// Shown when the store has no services of its own; booked by name only
+const fallbackServices = haircutStyles.map(s => ({
+  service_id: s.id,
+  service_name: s.title,
+  service_price: s.price,
+  image_url: s.image,
+  service_desc: "Classic style",
+  is_fallback: true
+}));
+
 const barbers = [
   {
     id: 1,
@@ -247,33 +257,21 @@ const BarberShop = () => {
   const navigate = useNavigate();
   const location = useLocation();
 
+  // If storeId is provided via URL, use it. Otherwise default to 2 (Barber Shop default seed ID).
+  const targetStoreId = Number(storeId || 2);
+
   useEffect(() => {
-    // If storeId is provided via URL, use it. Otherwise default to 2 (Barber Shop default seed ID).
-    const targetStoreId = storeId || 2; 
-    
     fetchServices(targetStoreId).then(data => {
         if (data && data.length > 0) {
             setServices(data);
         } else {
             // Fallback to hardcoded if nothing found
-            setServices(haircutStyles.map(s => ({
-                service_id: s.id,
-                service_name: s.title,
-                service_price: s.price,
-                image_url: s.image,
-                service_desc: "Classic style"
-            })));
+            setServices(fallbackServices);
         }
     }).catch(err => {
         console.error("Failed to fetch services", err);
          // Fallback
-         setServices(haircutStyles.map(s => ({
-                service_id: s.id,
-                service_name: s.title,
-                service_price: s.price,
-                image_url: s.image,
-                service_desc: "Classic style"
-            })));
+         setServices(fallbackServices);
     });
   }, [storeId]);
 
@@ -318,9 +316,11 @@ const BarberShop = () => {
 
       const barberName = barber ? barber.name : (selectedBarber ? selectedBarber.name : "Any Professional");
 
+      // The store's own services are booked by id; fallback entries only have a name
+      const service = services.find(s => s.service_name === bookingDetails.service && !s.is_fallback);
       const appointmentData = {
-        store_id: 2, // Barber Shop ID
-        service_name: bookingDetails.service,
+        store_id: targetStoreId,
+        ...(service ? { service_id: service.service_id } : { service_name: bookingDetails.service }),
         barber_name: barberName,
         booking_date: bookingDate.toISOString()
       };